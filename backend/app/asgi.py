@@ -0,0 +1,19 @@
+"""
+ASGI entry point for async servers
+hypercorn --workers 4 app.asgi:app   (run from backend/; needs asgiref + hypercorn)
+
+WsgiToAsgi receives each request body on the event loop before handing the request
+to a worker thread, so slow multipart/base64 uploads no longer tie up a thread while
+they arrive. Views stay synchronous: heavy work already runs on the KYC executor.
+"""
+import os
+import sys
+
+from asgiref.wsgi import WsgiToAsgi
+
+# Ensure app directory is in path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from main import app as flask_app
+
+app = WsgiToAsgi(flask_app)
@@ -1,273 +1,107 @@
 """
 Document Requirements Configuration
 Defines all document categories, types, and validation rules
+
+The rule tables live in document_requirements.json and are loaded on first
+attribute access (PEP 562 module __getattr__), so importing this module is cheap:
+
+- DOCUMENT_CATEGORIES: category -> name, mandatory, min_documents, accepted_documents, validations
+- QR_CODE_RULES: QR code validation rules per document type
+- CORE_AUTHENTICITY_CHECKS: checks applied to ALL documents
+- AGE_BASED_REQUIREMENTS: minor (< 18), young_adult (18-25), adult (26-60), senior (60+)
+- MICRO_GESTURE_PROMPTS: prompts for video liveness
+- UPLOAD_LIMITS: document upload limits
+- OCR_THRESHOLDS / BLUR_THRESHOLDS / FACE_MATCH_THRESHOLDS: confidence thresholds
+  (BLUR_THRESHOLDS["min_laplacian_variance"]: below this = blurry)
+
+Derived on load: ACCEPTED_DOCS, DOC_TO_CATEGORIES, THRESHOLDS.
 """
+import json
+import os
+import threading
+from collections import namedtuple
+from types import MappingProxyType
 
-# Document Categories and Requirements
-DOCUMENT_CATEGORIES = {
-    "identity_proof": {
-        "name": "Identity Proof Documents",
-        "mandatory": True,
-        "min_documents": 3,
-        "accepted_documents": [
-            "aadhaar",
-            "passport",
-            "pan_card",
-            "driving_license",
-            "voter_id",
-            "nrega_job_card",
-            "govt_id_card"
-        ],
-        "validations": [
-            "blur_detection",
-            "edge_detection",
-            "reflectance_scan",
-            "ocr_extraction",
-            "qr_code_validation",
-            "mrz_reading",
-            "signature_extraction",
-            "dob_extraction",
-            "face_matching"
-        ]
-    },
-    "address_proof": {
-        "name": "Address Proof Documents",
-        "mandatory": True,
-        "min_documents": 3,
-        "accepted_documents": [
-            "aadhaar",
-            "passport",
-            "driving_license",
-            "voter_id",
-            "utility_bill_electricity",
-            "utility_bill_water",
-            "utility_bill_gas",
-            "telephone_bill",
-            "bank_statement",
-            "ration_card",
-            "rent_agreement",
-            "property_tax_receipt",
-            "employer_housing_certificate",
-            "govt_allotment_letter"
-        ],
-        "validations": [
-            "address_extraction",
-            "address_matching",
-            "date_validity",
-            "geo_consistency",
-            "qr_code_validation",
-            "forgery_detection",
-            "blur_detection"
-        ]
-    },
-    "age_proof": {
-        "name": "Age / Date of Birth Proof",
-        "mandatory": True,
-        "min_documents": 2,
-        "accepted_documents": [
-            "birth_certificate",
-            "ssc_certificate",
-            "passport",
-            "aadhaar",
-            "pan_card"
-        ],
-        "validations": [
-            "dob_extraction",
-            "age_verification",
-            "authenticity_check",
-            "minor_guardian_check"
-        ]
-    },
-    "photo_biometric": {
-        "name": "Photo / Biometric Capture",
-        "mandatory": True,
-        "min_captures": 2,
-        "types": [
-            "live_selfie",
-            "video_liveness"
-        ],
-        "validations": [
-            "face_matching",
-            "3d_liveness",
-            "anti_spoofing",
-            "micro_gesture_detection",
-            "expression_variance"
-        ]
-    },
-    "income_employment": {
-        "name": "Income / Employment Documents",
-        "mandatory": False,
-        "min_documents": 3,
-        "accepted_documents": [
-            "salary_slip",
-            "form_16",
-            "bank_statement",
-            "it_returns",
-            "employment_offer_letter",
-            "salary_certificate",
-            "gst_returns",
-            "business_registration"
-        ],
-        "validations": [
-            "ocr_numeric_extraction",
-            "employer_validation",
-            "income_calculation",
-            "pdf_tampering_detection",
-            "consistency_check"
-        ]
-    },
-    "educational": {
-        "name": "Educational Documents",
-        "mandatory": False,
-        "min_documents": 2,
-        "accepted_documents": [
-            "ssc_marksheet",
-            "hsc_marksheet",
-            "graduation_degree",
-            "postgraduation_degree",
-            "professional_certification"
-        ],
-        "validations": [
-            "name_matching",
-            "institution_recognition",
-            "year_consistency",
-            "tampering_detection",
-            "seal_stamp_detection"
-        ]
-    },
-    "financial_risk": {
-        "name": "Financial Risk Assessment",
-        "mandatory": False,
-        "min_documents": 2,
-        "accepted_documents": [
-            "source_of_funds",
-            "income_proof",
-            "investment_proof",
-            "business_ownership",
-            "bank_ownership"
-        ],
-        "validations": [
-            "cross_matching",
-            "value_consistency",
-            "suspicious_pattern_detection",
-            "aml_risk_flagging"
-        ]
-    },
-    "supporting": {
-        "name": "Other Supporting Documents",
-        "mandatory": False,
-        "min_documents": 0,
-        "accepted_documents": [
-            "marriage_certificate",
-            "name_change_gazette",
-            "affidavit",
-            "employer_id",
-            "disability_certificate",
-            "caste_certificate"
-        ],
-        "validations": [
-            "authenticity_check",
-            "tampering_detection"
-        ]
-    }
-}
+_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'document_requirements.json')
+_load_lock = threading.Lock()
 
-# QR Code Validation Rules
-QR_CODE_RULES = {
-    "aadhaar": {
-        "required": True,
-        "validation_type": "encoded_data_extraction",
-        "fields": ["name", "dob", "gender", "address", "photo"]
-    },
-    "driving_license": {
-        "required": True,
-        "validation_type": "issuance_data",
-        "fields": ["license_number", "validity", "vehicle_class"]
-    },
-    "passport": {
-        "required": False,
-        "validation_type": "mrz",
-        "fields": ["passport_number", "name", "dob", "expiry"]
-    },
-    "pan_card": {
-        "required": False,
-        "validation_type": "ocr_signature",
-        "fields": ["pan_number", "name", "dob", "signature"]
-    },
-    "voter_id": {
-        "required": False,
-        "validation_type": "optional_qr",
-        "fields": ["epic_number", "name", "dob"]
-    }
-}
+_JSON_TABLES = (
+    'DOCUMENT_CATEGORIES',
+    'QR_CODE_RULES',
+    'CORE_AUTHENTICITY_CHECKS',
+    'AGE_BASED_REQUIREMENTS',
+    'MICRO_GESTURE_PROMPTS',
+    'UPLOAD_LIMITS',
+    'OCR_THRESHOLDS',
+    'BLUR_THRESHOLDS',
+    'FACE_MATCH_THRESHOLDS',
+)
+_DERIVED = ('ACCEPTED_DOCS', 'DOC_TO_CATEGORIES', 'THRESHOLDS')
 
-# Core Authenticity Checks (Applied to ALL documents)
-CORE_AUTHENTICITY_CHECKS = [
-    "blur_sharpness_score",
-    "glare_shadow_detection",
-    "edge_integrity",
-    "color_consistency",
-    "text_distortion",
-    "metadata_extraction",
-    "reflectance_pattern",
-    "compression_artifacts"
-]
+# Flat, immutable view of the scalar thresholds for hot-path callers
+# (attribute access instead of string-keyed dict lookups)
+Thresholds = namedtuple('Thresholds', [
+    'ocr_field', 'ocr_critical',
+    'blur_min', 'blur_reject', 'blur_warn',
+    'face_match', 'face_high', 'face_reject',
+])
 
-# Age-Based Document Requirements
-AGE_BASED_REQUIREMENTS = {
-    "minor": {  # < 18 years
-        "special_flow": "guardian_kyc_required",
-        "documents": ["birth_certificate", "guardian_aadhaar", "guardian_pan"]
-    },
-    "young_adult": {  # 18-25 years
-        "additional_docs": ["educational_certificates"],
-        "verification_level": "enhanced"
-    },
-    "adult": {  # 26-60 years
-        "additional_docs": ["employment_proof"],
-        "verification_level": "standard"
-    },
-    "senior": {  # 60+ years
-        "additional_docs": ["pension_certificate"],
-        "verification_level": "enhanced"
+
+# Freeze the rule tables: read-only mappings with tuple leaves can be shared
+# by every caller without defensive copies, and accidental mutation raises
+def _freeze(obj):
+    if isinstance(obj, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return tuple(_freeze(v) for v in obj)
+    return obj
+
+
+def _load():
+    with open(_DATA_PATH, 'r', encoding='utf-8') as f:
+        tables = json.load(f)
+
+    # Precomputed lookups: accepted document set per category, and the reverse
+    # mapping of document type -> categories that accept it
+    accepted_docs = {
+        category: frozenset(spec.get("accepted_documents", []))
+        for category, spec in tables["DOCUMENT_CATEGORIES"].items()
     }
-}
+    doc_to_categories = {}
+    for category, docs in accepted_docs.items():
+        for doc in docs:
+            doc_to_categories.setdefault(doc, set()).add(category)
+
+    ocr, blur, face = tables["OCR_THRESHOLDS"], tables["BLUR_THRESHOLDS"], tables["FACE_MATCH_THRESHOLDS"]
+    tables["THRESHOLDS"] = Thresholds(
+        ocr_field=ocr["min_field_confidence"],
+        ocr_critical=ocr["critical_field_confidence"],
+        blur_min=blur["min_laplacian_variance"],
+        blur_reject=blur["reject_threshold"],
+        blur_warn=blur["warning_threshold"],
+        face_match=face["min_match_score"],
+        face_high=face["high_confidence_score"],
+        face_reject=face["reject_below"],
+    )
+    tables["ACCEPTED_DOCS"] = MappingProxyType(accepted_docs)
+    tables["DOC_TO_CATEGORIES"] = MappingProxyType(
+        {doc: frozenset(cats) for doc, cats in doc_to_categories.items()}
+    )
+    for name in ("DOCUMENT_CATEGORIES", "QR_CODE_RULES", "AGE_BASED_REQUIREMENTS"):
+        tables[name] = _freeze(tables[name])
 
-# Micro-Gesture Prompts for Video Liveness
-MICRO_GESTURE_PROMPTS = [
-    {"action": "look_left", "duration": 2, "description": "Look to your left"},
-    {"action": "look_right", "duration": 2, "description": "Look to your right"},
-    {"action": "blink", "duration": 1, "description": "Blink twice"},
-    {"action": "smile", "duration": 2, "description": "Smile naturally"},
-    {"action": "nod", "duration": 2, "description": "Nod your head up and down"}
-]
+    # Bind as real module globals so later lookups never reach __getattr__
+    globals().update(tables)
 
-# Document Upload Limits
-UPLOAD_LIMITS = {
-    "max_file_size_mb": 10,
-    "max_files_per_category": 5,
-    "supported_formats": ["jpg", "jpeg", "png", "pdf"],
-    "min_resolution": {"width": 800, "height": 600},
-    "max_resolution": {"width": 4096, "height": 4096}
-}
 
-# OCR Confidence Thresholds
-OCR_THRESHOLDS = {
-    "min_field_confidence": 0.80,
-    "critical_fields": ["name", "dob", "document_number"],
-    "critical_field_confidence": 0.90
-}
+def __getattr__(name):
+    if name in _JSON_TABLES or name in _DERIVED:
+        with _load_lock:
+            if name not in globals():
+                _load()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Blur Detection Thresholds
-BLUR_THRESHOLDS = {
-    "min_laplacian_variance": 100,  # Below this = blurry
-    "reject_threshold": 50,
-    "warning_threshold": 80
-}
 
-# Face Matching Thresholds
-FACE_MATCH_THRESHOLDS = {
-    "min_match_score": 0.75,
-    "high_confidence_score": 0.85,
-    "reject_below": 0.60
-}
+def __dir__():
+    return sorted(list(globals()) + [n for n in _JSON_TABLES + _DERIVED if n not in globals()])
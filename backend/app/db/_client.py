@@ -0,0 +1,32 @@
+"""
+Shared MongoDB client for the collection setup scripts
+One lazily created, pooled MongoClient per process instead of one per module
+"""
+import os
+from pymongo import MongoClient
+from dotenv import load_dotenv
+
+# Load .env from project root
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+dotenv_path = os.path.join(PROJECT_ROOT, '.env')
+load_dotenv(dotenv_path)
+
+DB_NAME = "Aegiskyc"
+
+_client = None
+
+def get_client():
+    """Return the process-wide MongoClient, creating it on first use"""
+    global _client
+    if _client is None:
+        _client = MongoClient(
+            os.getenv("MONGO_URL"),
+            maxPoolSize=int(os.getenv("MONGO_MAX_POOL_SIZE", "50")),
+            minPoolSize=int(os.getenv("MONGO_MIN_POOL_SIZE", "5")),
+            serverSelectionTimeoutMS=5000,
+            connect=False  # open sockets on first operation, not at import
+        )
+    return _client
+
+def get_db():
+    return get_client()[DB_NAME]
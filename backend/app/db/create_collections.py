@@ -1,21 +1,27 @@
 # setup_collections.py
 import os
-from pymongo import MongoClient, ASCENDING
+import sys
+from pymongo import IndexModel, ASCENDING
 from dotenv import load_dotenv
 
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db._client import get_db
+
 load_dotenv()
-MONGO_URI = os.getenv("MONGO_URL")
 
-client = MongoClient(MONGO_URI)
-db = client["Aegiskyc"]
+db = get_db()
 
 # -------- USERS COLLECTION (Main KYC User Data) --------
 users = db["Users"]
-users.create_index("personal_info.email", unique=True)
-users.create_index("personal_info.phone", unique=True)
-users.create_index("created_at")
-users.create_index("kyc_status.current_state")
-users.create_index("risk_engine.fraud_risk_level")
+users.create_indexes([
+    IndexModel("personal_info.email", unique=True),
+    IndexModel("personal_info.phone", unique=True),
+    IndexModel("created_at"),
+    IndexModel("kyc_status.current_state"),
+    IndexModel("risk_engine.fraud_risk_level"),
+])
 
 user_doc_template = {
     "_id": "",  # ObjectId
@@ -143,10 +149,12 @@ user_doc_template = {
 
 # -------- KYC REQUESTS (Separate tracking for KYC submission workflows) --------
 kyc_req = db["KYCRequests"]
-kyc_req.create_index("user_id")
-kyc_req.create_index("status")
-kyc_req.create_index("created_at")
-kyc_req.create_index("request_id", unique=True)
+kyc_req.create_indexes([
+    IndexModel("user_id"),
+    IndexModel("status"),
+    IndexModel("created_at"),
+    IndexModel("request_id", unique=True),
+])
 
 kyc_request_template = {
     "user_id": "",
@@ -161,10 +169,12 @@ kyc_request_template = {
 
 # -------- DOCUMENTS (Separate document storage and metadata) --------
 docs = db["Documents"]
-docs.create_index("user_id")
-docs.create_index("doc_type")
-docs.create_index("uploaded_at")
-docs.create_index("verified")
+docs.create_indexes([
+    IndexModel("user_id"),
+    IndexModel("doc_type"),
+    IndexModel("uploaded_at"),
+    IndexModel("verified"),
+])
 
 document_template = {
     "user_id": "",
@@ -187,8 +197,10 @@ document_template = {
 
 # -------- BIOMETRICS (Separate collection for biometric data) --------
 biometrics = db["Biometrics"]
-biometrics.create_index("user_id", unique=True)
-biometrics.create_index("last_face_verification")
+biometrics.create_indexes([
+    IndexModel("user_id", unique=True),
+    IndexModel("last_face_verification"),
+])
 
 biometrics_template = {
     "user_id": "",
@@ -202,9 +214,11 @@ biometrics_template = {
 
 # -------- RISK SCORES (Enhanced risk assessment) --------
 risk_scores = db["RiskScores"]
-risk_scores.create_index("user_id", unique=True)
-risk_scores.create_index("fraud_risk_level")
-risk_scores.create_index("updated_at")
+risk_scores.create_indexes([
+    IndexModel("user_id", unique=True),
+    IndexModel("fraud_risk_level"),
+    IndexModel("updated_at"),
+])
 
 risk_score_template = {
     "user_id": "",
@@ -221,8 +235,10 @@ risk_score_template = {
 
 # -------- BEHAVIORAL SIGNALS (Track user behavior patterns) --------
 behavioral_signals = db["BehavioralSignals"]
-behavioral_signals.create_index("user_id", unique=True)
-behavioral_signals.create_index("suspicious_pattern_detected")
+behavioral_signals.create_indexes([
+    IndexModel("user_id", unique=True),
+    IndexModel("suspicious_pattern_detected"),
+])
 
 behavioral_signals_template = {
     "user_id": "",
@@ -236,9 +252,11 @@ behavioral_signals_template = {
 
 # -------- DEVICE METADATA (Enhanced device fingerprinting) --------
 device_metadata = db["DeviceMetadata"]
-device_metadata.create_index("device_id", unique=True)
-device_metadata.create_index("user_id")
-device_metadata.create_index("is_vpn")
+device_metadata.create_indexes([
+    IndexModel("device_id", unique=True),
+    IndexModel("user_id"),
+    IndexModel("is_vpn"),
+])
 
 device_metadata_template = {
     "device_id": "",
@@ -258,9 +276,11 @@ device_metadata_template = {
 
 # -------- AUDIT LOGS (Enhanced audit trail) --------
 audit_logs = db["AuditLogs"]
-audit_logs.create_index("user_id")
-audit_logs.create_index("timestamp")
-audit_logs.create_index("event")
+audit_logs.create_indexes([
+    IndexModel("user_id"),
+    IndexModel("timestamp"),
+    IndexModel("event"),
+])
 
 audit_log_template = {
     "user_id": "",
@@ -274,9 +294,11 @@ audit_log_template = {
 
 # -------- SESSIONS --------
 sessions = db["Sessions"]
-sessions.create_index("user_id")
-sessions.create_index("created_at")
-sessions.create_index("session_token", unique=True)
+sessions.create_indexes([
+    IndexModel("user_id"),
+    IndexModel("created_at"),
+    IndexModel("session_token", unique=True),
+])
 
 session_template = {
     "user_id": "",
@@ -289,8 +311,10 @@ session_template = {
 
 # -------- CONSENT LEDGER (Enhanced consent tracking) --------
 consent = db["ConsentLedger"]
-consent.create_index("user_id")
-consent.create_index("timestamp")
+consent.create_indexes([
+    IndexModel("user_id"),
+    IndexModel("timestamp"),
+])
 
 consent_template = {
     "user_id": "",
@@ -305,9 +329,11 @@ consent_template = {
 
 # -------- SECURITY EVENTS (Track security-related events) --------
 security_events = db["SecurityEvents"]
-security_events.create_index("user_id")
-security_events.create_index("event_type")
-security_events.create_index("timestamp")
+security_events.create_indexes([
+    IndexModel("user_id"),
+    IndexModel("event_type"),
+    IndexModel("timestamp"),
+])
 
 security_events_template = {
     "user_id": "",
@@ -322,8 +348,10 @@ security_events_template = {
 
 # -------- ANALYTICS --------
 analytics = db["Analytics"]
-analytics.create_index("event_name")
-analytics.create_index("timestamp")
+analytics.create_indexes([
+    IndexModel("event_name"),
+    IndexModel("timestamp"),
+])
 
 analytics_template = {
     "event_name": "",
@@ -1,8 +1,17 @@
 #flask entry point
+import logging
 import os
 import flask
+from functools import lru_cache
 from flask import Flask
 from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+# Optional gzip/brotli for large JSON responses (admin dashboard)
+try:
+    from flask_compress import Compress
+except Exception:
+    Compress = None
 from flask import request, jsonify
 from flask import Blueprint
 from flask import render_template
@@ -13,15 +22,34 @@ from routes.kyc_routes import kyc_bp
 from routes.real_validation_routes import real_validation_bp
 from routes.admin_routes import admin_bp
 from routes.org_routes import org_bp
+from utils.json_response import ORJSON_AVAILABLE, ORJSONProvider
+from utils.upload_request import UploadRequest
 
 # Get the absolute path to the project root
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 TEMPLATE_DIR = os.path.join(BASE_DIR, 'frontend')
 STATIC_DIR = os.path.join(BASE_DIR, 'frontend')
 
+# Route debug logging is off unless LOG_LEVEL=DEBUG
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'WARNING').upper())
+logger = logging.getLogger(__name__)
+
 #access home page from frontend
 app = Flask(__name__, template_folder=TEMPLATE_DIR, static_folder=STATIC_DIR, static_url_path='')
+# orjson for jsonify()/get_json() when installed
+if ORJSON_AVAILABLE:
+    app.json = ORJSONProvider(app)
+# Large file uploads are spooled to named temp files (see utils/upload_request.py)
+app.request_class = UploadRequest
+# Behind reverse proxies, set PROXY_HOPS to their number so X-Forwarded-For/-Proto/-Host
+# are trusted and request.remote_addr is the client IP. Off by default: when clients
+# connect directly those headers are client-controlled and would spoof the IP
+PROXY_HOPS = int(os.getenv('PROXY_HOPS', 0))
+if PROXY_HOPS:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=PROXY_HOPS, x_proto=PROXY_HOPS, x_host=PROXY_HOPS)
 CORS(app)
+if Compress is not None:
+    Compress(app)
 
 # Register blueprints
 app.register_blueprint(auth_bp)
@@ -30,75 +58,60 @@ app.register_blueprint(real_validation_bp)
 app.register_blueprint(admin_bp)
 app.register_blueprint(org_bp)
 
-@app.route('/')
-def home():
-    return render_template('homepage.html')
-
-@app.route('/login')
-@app.route('/login.html')
-def login():
-    return render_template('login.html')
-
-@app.route('/signup')
-@app.route('/signup.html')
-def signup():
-    return render_template('signup.html')
-
-@app.route('/dashboard')
-@app.route('/dashboard.html')
-def dashboard():
-    return render_template('dashboard.html')
-
-@app.route('/kyc_complete')
-@app.route('/kyc_complete.html')
-def kyc_complete():
-    return render_template('kyc_complete.html')
-
-@app.route('/kyc_documents')
-@app.route('/kyc_documents.html')
-def kyc_documents():
-    return render_template('kyc_documents.html')
-
-@app.route('/kyc_capture')
-@app.route('/kyc_capture.html')
-def kyc_capture():
-    return render_template('kyc_capture.html')
-
-@app.route('/kyc_comprehensive')
-@app.route('/kyc_comprehensive.html')
-def kyc_comprehensive():
-    return render_template('kyc_comprehensive.html')
-
-@app.route('/document_analysis')
-@app.route('/document_analysis.html')
-def document_analysis():
-    return render_template('document_analysis.html')
-
-@app.route('/kyc-verification')
-@app.route('/kyc-verification.html')
-def kyc_verification():
-    return render_template('kyc_verification.html')
-
-@app.route('/admin')
-@app.route('/admin.html')
-def admin_dashboard():
-    return render_template('admin_dashboard.html')
-
-@app.route('/org-signup')
-@app.route('/org-signup.html')
-def org_signup():
-    return render_template('org_signup.html')
-
-@app.route('/org-login')
-@app.route('/org-login.html')
-def org_login():
-    return render_template('org_login.html')
-
-@app.route('/org-dashboard')
-@app.route('/org-dashboard.html')
-def org_dashboard():
-    return render_template('org_dashboard.html')
+# Static HTML pages: endpoint -> (template, URL rules)
+STATIC_PAGES = {
+    'home': ('homepage.html', ['/']),
+    'login': ('login.html', ['/login', '/login.html']),
+    'signup': ('signup.html', ['/signup', '/signup.html']),
+    'dashboard': ('dashboard.html', ['/dashboard', '/dashboard.html']),
+    'kyc_complete': ('kyc_complete.html', ['/kyc_complete', '/kyc_complete.html']),
+    'kyc_documents': ('kyc_documents.html', ['/kyc_documents', '/kyc_documents.html']),
+    'kyc_capture': ('kyc_capture.html', ['/kyc_capture', '/kyc_capture.html']),
+    'kyc_comprehensive': ('kyc_comprehensive.html', ['/kyc_comprehensive', '/kyc_comprehensive.html']),
+    'document_analysis': ('document_analysis.html', ['/document_analysis', '/document_analysis.html']),
+    'kyc_verification': ('kyc_verification.html', ['/kyc-verification', '/kyc-verification.html']),
+    'admin_dashboard': ('admin_dashboard.html', ['/admin', '/admin.html']),
+    'org_signup': ('org_signup.html', ['/org-signup', '/org-signup.html']),
+    'org_login': ('org_login.html', ['/org-login', '/org-login.html']),
+    'org_dashboard': ('org_dashboard.html', ['/org-dashboard', '/org-dashboard.html']),
+}
+
+# Browsers/CDNs may keep serving a page for a minute past max-age while they refetch it
+STATIC_PAGE_HEADERS = {'Cache-Control': 'public, max-age=300, stale-while-revalidate=60'}
+
+# The pages take no context, so the rendered HTML is identical on every request.
+# The cache is filled before gunicorn forks (preload_app), so a SIGHUP reload keeps
+# serving the old pages: restart the server after a template deploy
+@lru_cache(maxsize=32)
+def _render_cached(template):
+    return render_template(template)
+
+def _make_page_view(template):
+    def view():
+        if app.debug:
+            return render_template(template)
+        return _render_cached(template), 200, STATIC_PAGE_HEADERS
+    return view
+
+for endpoint, (template, rules) in STATIC_PAGES.items():
+    view = _make_page_view(template)
+    for rule in rules:
+        app.add_url_rule(rule, endpoint, view)
+
+def prime_page_cache():
+    """Render every static page once so the first visitors hit the cache"""
+    with app.app_context():
+        for template, _ in STATIC_PAGES.values():
+            try:
+                _render_cached(template)
+            except Exception as e:
+                logger.warning("Skipping page cache for %s: %s", template, e)
+
+if not app.debug:
+    prime_page_cache()
 
 if __name__ == '__main__':
-    app.run(debug=True)
+    # Development server only; production runs app.wsgi:app under gunicorn.
+    # Debug mode (reloader + debugger) is opt-in via FLASK_DEBUG=1.
+    app.run(debug=os.getenv('FLASK_DEBUG') == '1', threaded=True)
 
@@ -0,0 +1,34 @@
+"""
+Shared image preprocessing for the model wrappers.
+Provides: to_gray(img) -> (gray, is_color), limit_side(img, max_side) -> img, as_umat(img)
+"""
+import cv2
+
+# OpenCV's transparent API: filters on a UMat run through OpenCL (iGPU/optimized
+# kernels) when a device is present. Without one, plain ndarrays are kept.
+try:
+    cv2.ocl.setUseOpenCL(True)
+    OPENCL_AVAILABLE = bool(cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL())
+except Exception:
+    OPENCL_AVAILABLE = False
+
+
+def to_gray(img):
+    """Grayscale view of a BGR or already-single-channel image, plus whether it was colour"""
+    if img.ndim == 3:
+        return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY), True
+    return img, False
+
+
+def limit_side(img, max_side):
+    """Area-downscale so the longest side is at most max_side; smaller images are returned as-is"""
+    h, w = img.shape[:2]
+    if not max_side or max(h, w) <= max_side:
+        return img
+    scale = max_side / float(max(h, w))
+    return cv2.resize(img, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+
+
+def as_umat(img):
+    """Wrap img in a UMat when OpenCL is usable, otherwise return it unchanged"""
+    return cv2.UMat(img) if OPENCL_AVAILABLE else img
@@ -0,0 +1,111 @@
+"""
+Fused Laplacian-variance kernel for the sharpness heuristic.
+Provides: laplacian_variance(gray_u8) -> float
+          laplacian_variance_batch(grays) -> float64 array, one value per image
+
+cv2.Laplacian(gray, CV_64F).var() materializes a float64 image (8x the input)
+just to reduce it to one scalar. When numba is installed the 3x3 Laplacian and
+the variance are computed in one streaming pass; otherwise OpenCV computes the
+Laplacian at int16 depth (enough for uint8 input) and reduces it with meanStdDev.
+"""
+import os
+
+import cv2
+import numpy as np
+
+from models._img_utils import as_umat
+
+try:
+    import numba
+    from numba import njit, prange
+    # The kernels are launched from request and pool threads, so prefer the threadsafe
+    # layers, OpenMP first: TBB workers started from a non-main thread stall interpreter
+    # shutdown (slow worker restarts). Set on numba's config rather than os.environ so the
+    # process environment is left alone; an explicit NUMBA_THREADING_LAYER(_PRIORITY)
+    # in the deployment environment still wins.
+    if 'NUMBA_THREADING_LAYER_PRIORITY' not in os.environ:
+        numba.config.THREADING_LAYER_PRIORITY = ['omp', 'tbb', 'workqueue']
+    NUMBA_AVAILABLE = True
+except Exception:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(fastmath=True, cache=True)
+    def _lap_var_serial(gray):
+        h, w = gray.shape
+        s1 = 0.0
+        s2 = 0.0
+        for y in range(h):
+            yn = y - 1 if y > 0 else min(1, h - 1)
+            ys = y + 1 if y < h - 1 else max(h - 2, 0)
+            # Integer row sums are exact and vectorize without int->float converts
+            row_s1 = 0
+            row_s2 = 0
+            for x in range(w):
+                xw = x - 1 if x > 0 else min(1, w - 1)
+                xe = x + 1 if x < w - 1 else max(w - 2, 0)
+                lap = (np.int32(gray[yn, x]) + np.int32(gray[ys, x]) + np.int32(gray[y, xw])
+                       + np.int32(gray[y, xe]) - 4 * np.int32(gray[y, x]))
+                row_s1 += lap
+                row_s2 += lap * lap
+            s1 += row_s1
+            s2 += row_s2
+        n = h * w
+        mean = s1 / n
+        return s2 / n - mean * mean
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _lap_var_batch_kernel(stack):
+        # One image per thread: (N, H, W) frames of the same size in a single call
+        out = np.empty(stack.shape[0], dtype=np.float64)
+        for i in prange(stack.shape[0]):
+            out[i] = _lap_var_serial(stack[i])
+        return out
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _lap_var_kernel(gray):
+        h, w = gray.shape
+        s1 = 0.0
+        s2 = 0.0
+        for y in prange(h):
+            # BORDER_REFLECT_101, same as cv2.Laplacian's default
+            yn = y - 1 if y > 0 else min(1, h - 1)
+            ys = y + 1 if y < h - 1 else max(h - 2, 0)
+            row_s1 = 0
+            row_s2 = 0
+            for x in range(w):
+                xw = x - 1 if x > 0 else min(1, w - 1)
+                xe = x + 1 if x < w - 1 else max(w - 2, 0)
+                lap = (np.int32(gray[yn, x]) + np.int32(gray[ys, x]) + np.int32(gray[y, xw])
+                       + np.int32(gray[y, xe]) - 4 * np.int32(gray[y, x]))
+                row_s1 += lap
+                row_s2 += lap * lap
+            s1 += row_s1
+            s2 += row_s2
+        n = h * w
+        mean = s1 / n
+        return s2 / n - mean * mean
+
+
+def laplacian_variance(gray):
+    """Variance of the 3x3 Laplacian of a single-channel uint8 image"""
+    if gray.dtype == np.uint8 and gray.ndim == 2 and gray.size > 0:
+        if NUMBA_AVAILABLE:
+            return float(_lap_var_kernel(np.ascontiguousarray(gray)))
+        # |lap| <= 4*255 fits int16: a quarter of the bytes of CV_64F and wider SIMD lanes
+        _, std = cv2.meanStdDev(cv2.Laplacian(as_umat(gray), cv2.CV_16S))
+        if isinstance(std, cv2.UMat):
+            std = std.get()
+        return float(std[0, 0]) ** 2
+    return float(cv2.Laplacian(gray, cv2.CV_64F).var())
+
+
+def laplacian_variance_batch(grays):
+    """laplacian_variance for each single-channel image in grays (a list or an (N, H, W) array)"""
+    if NUMBA_AVAILABLE and len(grays) > 1:
+        first = grays[0]
+        if (first.dtype == np.uint8 and first.ndim == 2 and first.size > 0
+                and all(g.shape == first.shape and g.dtype == np.uint8 for g in grays)):
+            return _lap_var_batch_kernel(np.ascontiguousarray(np.stack(grays)))
+    return np.array([laplacian_variance(g) for g in grays], dtype=np.float64)
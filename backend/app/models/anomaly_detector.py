@@ -2,7 +2,11 @@
 Anomaly detector for session/behavioral signals (scaffolding)
 Provides: detect(features) -> {anomaly_score, is_anomaly, details}
 """
-import numpy as np
+from collections.abc import Mapping
+
+# Benign baseline for each signal, in the same order as _KEYS
+_KEYS = ('typing_speed', 'error_rate', 'mouse_smoothness', 'session_duration')
+_BASELINE = (40.0, 0.05, 0.8, 300.0)
 
 class AnomalyDetector:
     def __init__(self, model_path=None):
@@ -13,15 +17,19 @@ class AnomalyDetector:
         """
         features: dict of numerical signals (typing_speed, error_rate, mouse_smoothness, etc.)
         """
+        # Non-dict input gets the same fallback result as an unparsable value
+        if not isinstance(features, Mapping):
+            return {'anomaly_score': 0.5, 'is_anomaly': False,
+                    'details': {'error': f'expected a mapping of features, got {type(features).__name__}'}}
+        # No signals at all: defaulting every key to 0.0 would look like a far-off-baseline session
+        if not features or not any(k in features for k in _KEYS):
+            return {'anomaly_score': 0.0, 'is_anomaly': False, 'details': {'reason': 'no_features'}}
         try:
-            keys = ['typing_speed','error_rate','mouse_smoothness','session_duration']
-            vals = [float(features.get(k,0.0)) for k in keys]
-            # Simple z-score like heuristic against benign baseline
-            baseline = np.array([40.0, 0.05, 0.8, 300.0])
-            diffs = np.abs((np.array(vals) - baseline) / (baseline + 1e-6))
-            score = float(np.mean(diffs))
+            # Simple z-score like heuristic against benign baseline (4 values: plain Python beats NumPy dispatch)
+            diffs = [abs((float(features.get(k,0.0)) - b) / (b + 1e-6)) for k, b in zip(_KEYS, _BASELINE)]
+            score = sum(diffs) / len(diffs)
             anomaly_score = round(min(1.0, score/2.0),3)
             is_anomaly = anomaly_score > 0.4
-            return {'anomaly_score': anomaly_score, 'is_anomaly': is_anomaly, 'details': {'diffs': diffs.tolist()}}
-        except Exception as e:
+            return {'anomaly_score': anomaly_score, 'is_anomaly': is_anomaly, 'details': {'diffs': diffs}}
+        except (TypeError, ValueError) as e:
             return {'anomaly_score': 0.5, 'is_anomaly': False, 'details': {'error': str(e)}}
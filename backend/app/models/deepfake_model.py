@@ -1,10 +1,20 @@
 """
 Deepfake model wrapper (placeholder)
-Provides a stable API: load_model(), predict(image) -> {probability, details}
-This is a lightweight scaffolding: replace predict() with a real model inference.
+Provides a stable API: load_model(), predict(image) -> {probability, details},
+predict_batch(images) -> array of probabilities (one inference call for many frames)
+This is a lightweight scaffolding: replace predict()/predict_batch() with a real model inference.
 """
+import cv2
 import numpy as np
 
+from models._img_utils import to_gray, limit_side
+from models._laplacian_var import laplacian_variance, laplacian_variance_batch
+
+# Sharpness is a global statistic, so callers may pass max_side=SHARPNESS_MAX_SIDE to
+# measure it on a downscaled copy. Off by default: downscaling lowers the Laplacian
+# variance, and the probability curve was set on full-resolution frames.
+SHARPNESS_MAX_SIDE = 512
+
 class DeepfakeModel:
     def __init__(self, model_path=None):
         self.model_path = model_path
@@ -16,20 +26,35 @@ class DeepfakeModel:
         # Placeholder: in production replace with TensorFlow/PyTorch model load
         self._loaded = True
 
-    def predict(self, image_cv2):
+    @staticmethod
+    def _probability(sharpness):
+        # heuristic: extremely low sharpness could be result of synthetic artifacts
+        return max(0.01, min(0.99, (50.0 - min(sharpness,50.0)) / 100.0))
+
+    def predict_batch(self, images, max_side=None):
+        """
+        images: sequence of OpenCV BGR/grayscale images (e.g. sampled video frames)
+        Returns: float array of deepfake probabilities, one per image, from a single
+        batched call (same-size frames are scored together in one kernel launch)
+        """
+        grays = [limit_side(to_gray(img)[0], max_side) for img in images]
+        if not grays:
+            return np.empty(0, dtype=np.float64)
+        sharpness = laplacian_variance_batch(grays)
+        return np.array([round(self._probability(float(v)), 3) for v in sharpness], dtype=np.float64)
+
+    def predict(self, image_cv2, max_side=None):
         """
         image_cv2: OpenCV BGR image or base64-decoded numpy array
+        max_side: optionally downscale so the longest side is at most this many pixels
         Returns: { 'probability': 0.02, 'is_deepfake': False, 'details': {...} }
         """
         # Simple heuristic placeholder: use variance of laplacian (sharpness) and noise patterns
         try:
-            gray = image_cv2
-            import cv2
-            if len(image_cv2.shape) == 3:
-                gray = cv2.cvtColor(image_cv2, cv2.COLOR_BGR2GRAY)
-            sharpness = cv2.Laplacian(gray, cv2.CV_64F).var()
-            # heuristic: extremely low sharpness could be result of synthetic artifacts
-            prob = max(0.01, min(0.99, (50.0 - min(sharpness,50.0)) / 100.0))
+            gray, _ = to_gray(image_cv2)
+            gray = limit_side(gray, max_side)
+            sharpness = laplacian_variance(gray)
+            prob = self._probability(sharpness)
             result = {
                 'probability': round(prob, 3),
                 'is_deepfake': prob > 0.5,
@@ -2,9 +2,46 @@
 Document tamper detector (scaffolding)
 Provides: analyze(document_image_cv2) -> { tamper_score, tamper_likely, reasons }
 """
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import cv2
 import numpy as np
 
+from models._img_utils import to_gray, limit_side, as_umat, OPENCL_AVAILABLE
+
+# Edge density is a ratio, so callers may pass max_side=EDGE_MAX_SIDE to run Canny on
+# a downscaled copy. Off by default: downscaling lowers edge density, and the tamper
+# threshold was set on full-resolution images.
+EDGE_MAX_SIDE = 512
+
+# Per-thread scratch buffers reused across calls (edge map and channel histograms)
+_scratch = threading.local()
+
+
+def _scratch_buffers(n_pixels):
+    edges = getattr(_scratch, 'edges', None)
+    if edges is None or edges.size < n_pixels:
+        _scratch.edges = edges = np.empty(EDGE_MAX_SIDE * EDGE_MAX_SIDE, dtype=np.uint8)
+        _scratch.hist = np.empty((3, 256), dtype=np.float32)
+    return edges, _scratch.hist
+
+
+def _edge_density(gray):
+    """Fraction of Canny edge pixels (Canny output is 0/255, so count == sum/255)"""
+    h, w = gray.shape[:2]
+    if OPENCL_AVAILABLE:
+        edges = cv2.Canny(as_umat(gray), 50, 150)
+    elif h * w > EDGE_MAX_SIDE * EDGE_MAX_SIDE:
+        # Full-resolution scans: allocate per call rather than keep a large buffer per thread
+        edges = cv2.Canny(gray, 50, 150)
+    else:
+        buf, _ = _scratch_buffers(h * w)
+        # Contiguous prefix of the flat buffer, so Canny writes into it in place
+        edges = cv2.Canny(gray, 50, 150, edges=buf[:h * w].reshape(h, w))
+    return cv2.countNonZero(edges) / float(gray.size)
+
 class DocumentTamperDetector:
     def __init__(self, model_path=None):
         self.model_path = model_path
@@ -15,33 +52,50 @@ class DocumentTamperDetector:
         # Placeholder: load model if available
         self._loaded = True
 
-    def analyze(self, image_cv2):
+    def analyze(self, image_cv2, max_side=None):
         try:
-            gray = cv2.cvtColor(image_cv2, cv2.COLOR_BGR2GRAY) if len(image_cv2.shape)==3 else image_cv2
+            gray, is_color = to_gray(image_cv2)
+            gray = limit_side(gray, max_side)
             # Edge density heuristic: tampered images may show unusual edge patterns around edits
-            edges = cv2.Canny(gray, 50, 150)
-            edge_density = float(edges.sum()) / (edges.size * 255.0)
+            edge_density = _edge_density(gray)
 
             # Color histogram anomalies
-            if len(image_cv2.shape) == 3:
-                hist_b = cv2.calcHist([image_cv2], [0], None, [256], [0,256])
-                hist_g = cv2.calcHist([image_cv2], [1], None, [256], [0,256])
-                hist_r = cv2.calcHist([image_cv2], [2], None, [256], [0,256])
-                hist_std = float(np.std(np.concatenate([hist_b, hist_g, hist_r])))
-            else:
-                hist_std = 0.0
-
-            # Heuristic tamper score
-            tamper_score = min(1.0, edge_density * 5.0 + (hist_std / 1000.0))
-            tamper_likely = tamper_score > 0.4
-
-            return {
-                'tamper_score': round(tamper_score,3),
-                'tamper_likely': tamper_likely,
-                'details': {
-                    'edge_density': edge_density,
-                    'hist_std': hist_std
-                }
-            }
+            hist_std = self._hist_std(image_cv2) if is_color else 0.0
+            return self._result(edge_density, hist_std)
         except Exception as e:
             return {'tamper_score': 0.5, 'tamper_likely': False, 'details': {'error': str(e)}}
+
+    def analyze_batch(self, images, max_side=None):
+        """
+        Analyze several documents in one call: each result is analyze(image, max_side),
+        computed in a thread pool (OpenCV releases the GIL in Canny and calcHist).
+        """
+        if not images:
+            return []
+        with ThreadPoolExecutor(max_workers=min(len(images), os.cpu_count() or 1)) as pool:
+            return list(pool.map(lambda img: self.analyze(img, max_side), images))
+
+    @staticmethod
+    def _hist_std(image_cv2):
+        if image_cv2.ndim != 3:
+            return 0.0
+        # B, G, R histograms written straight into this thread's (3, 256) scratch array
+        _, hist = _scratch_buffers(0)
+        for i in range(3):
+            cv2.calcHist([image_cv2], [i], None, [256], [0,256], hist=hist[i].reshape(256, 1))
+        return float(hist.std())
+
+    @staticmethod
+    def _result(edge_density, hist_std):
+        # Heuristic tamper score
+        tamper_score = min(1.0, edge_density * 5.0 + (hist_std / 1000.0))
+        tamper_likely = tamper_score > 0.4
+
+        return {
+            'tamper_score': round(tamper_score,3),
+            'tamper_likely': tamper_likely,
+            'details': {
+                'edge_density': edge_density,
+                'hist_std': hist_std
+            }
+        }
@@ -1,40 +1,109 @@
 """
 OCR wrapper: integrates with pytesseract or paddleocr when available.
 Provides: extract_text(cv2_image) -> { raw_text, fields, confidence }
+
+OCR runs in a small process pool shared by all OCRModel instances. PaddleOCR's
+memory grows with every call and Tesseract blocks the calling thread, so workers
+are recycled after OCR_MAX_TASKS_PER_CHILD tasks and the request thread only waits
+on a future (up to OCR_TIMEOUT seconds).
 """
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
 import cv2
 import numpy as np
 
-class OCRModel:
-    def __init__(self):
-        self.use_paddle = False
+OCR_WORKERS = int(os.getenv('OCR_WORKERS', 2))
+OCR_MAX_TASKS_PER_CHILD = int(os.getenv('OCR_MAX_TASKS_PER_CHILD', 50))
+OCR_TIMEOUT = float(os.getenv('OCR_TIMEOUT', 30))
+
+# Tesseract runtime grows faster than pixel count; ID-card text stays legible at this long side
+OCR_MAX_SIDE = 1600
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# Engine loaded once per worker process by _init_worker
+_engine = None
+_use_paddle = False
+
+
+def _load_engine():
+    try:
+        from paddleocr import PaddleOCR
+        return PaddleOCR(use_angle_cls=True, lang='en'), True
+    except Exception:
         try:
-            from paddleocr import PaddleOCR
-            self.ocr = PaddleOCR(use_angle_cls=True, lang='en')
-            self.use_paddle = True
+            import pytesseract
+            return pytesseract, False
         except Exception:
+            return None, False
+
+
+def _init_worker():
+    global _engine, _use_paddle
+    _engine, _use_paddle = _load_engine()
+
+
+def _ocr_worker(image_cv2):
+    """Runs inside a pool worker"""
+    try:
+        if _use_paddle:
+            result = _engine.ocr(image_cv2, cls=True)
+            lines = [line[1][0] for line in result[0]] if result and len(result)>0 else []
+            raw = "\n".join(lines)
+            return {'raw_text': raw, 'lines': lines, 'confidence': None}
+        else:
+            # Use pytesseract if available
             try:
                 import pytesseract
-                self.ocr = pytesseract
-                self.use_paddle = False
-            except Exception:
-                self.ocr = None
+                gray = cv2.cvtColor(image_cv2, cv2.COLOR_BGR2GRAY) if len(image_cv2.shape)==3 else image_cv2
+                h, w = gray.shape[:2]
+                scale = min(1.0, OCR_MAX_SIDE / max(h, w))
+                if scale < 1.0:
+                    gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+                # Binarize so the LSTM engine sees clean glyphs under uneven phone-camera lighting
+                gray = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 10)
+                text = pytesseract.image_to_string(gray, config='--psm 6 --oem 1')
+                return {'raw_text': text, 'lines': text.splitlines(), 'confidence': None}
+            except Exception as e:
+                return {'raw_text': '', 'lines': [], 'confidence': None, 'error': str(e)}
+    except Exception as e:
+        return {'raw_text': '', 'lines': [], 'confidence': None, 'error': str(e)}
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            try:
+                _pool = ProcessPoolExecutor(max_workers=OCR_WORKERS, initializer=_init_worker,
+                                            max_tasks_per_child=OCR_MAX_TASKS_PER_CHILD)
+            except TypeError:
+                # Python < 3.11: no worker recycling
+                _pool = ProcessPoolExecutor(max_workers=OCR_WORKERS, initializer=_init_worker)
+        return _pool
+
 
+def _reset_pool(broken):
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+class OCRModel:
     def extract_text(self, image_cv2):
+        pool = _get_pool()
         try:
-            if self.use_paddle:
-                result = self.ocr.ocr(image_cv2, cls=True)
-                lines = [line[1][0] for line in result[0]] if result and len(result)>0 else []
-                raw = "\n".join(lines)
-                return {'raw_text': raw, 'lines': lines, 'confidence': None}
-            else:
-                # Use pytesseract if available
-                try:
-                    import pytesseract
-                    gray = cv2.cvtColor(image_cv2, cv2.COLOR_BGR2GRAY) if len(image_cv2.shape)==3 else image_cv2
-                    text = pytesseract.image_to_string(gray, config='--psm 6')
-                    return {'raw_text': text, 'lines': text.splitlines(), 'confidence': None}
-                except Exception as e:
-                    return {'raw_text': '', 'lines': [], 'confidence': None, 'error': str(e)}
-        except Exception as e:
+            future = pool.submit(_ocr_worker, np.ascontiguousarray(image_cv2))
+            return future.result(timeout=OCR_TIMEOUT)
+        except BrokenProcessPool as e:
+            # A worker died (e.g. OOM); the next call starts a fresh pool
+            _reset_pool(pool)
             return {'raw_text': '', 'lines': [], 'confidence': None, 'error': str(e)}
+        except Exception as e:
+            return {'raw_text': '', 'lines': [], 'confidence': None, 'error': str(e) or type(e).__name__}
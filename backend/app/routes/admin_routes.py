@@ -2,18 +2,34 @@
 Admin API Routes
 Handles admin dashboard data and user management
 """
-from flask import Blueprint, request, jsonify
-from pymongo import MongoClient
+from flask import Blueprint, request, jsonify, abort
+from pymongo import MongoClient, IndexModel, ASCENDING, DESCENDING
+from pymongo.errors import OperationFailure
 from bson.objectid import ObjectId
+from bson.errors import InvalidId
 from datetime import datetime, timedelta
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import bson
+import copy
+import atexit
+import hashlib
+import logging
 import os
+import queue
+import threading
+import time
 from dotenv import load_dotenv
 import sys
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from utils.background import ensure_thread
+from utils.json_response import json_response
+
 admin_bp = Blueprint('admin', __name__, url_prefix='/api/admin')
+logger = logging.getLogger(__name__)
 
 # Load .env
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -24,66 +40,286 @@ MONGO_URI = os.getenv("MONGO_URL") or os.getenv("MONGODB_URI")
 client = MongoClient(MONGO_URI)
 db = client["aegis_kyc"]
 
+# Fields the admin dashboard actually renders; everything else (document images,
+# device metadata, password material) stays in MongoDB
+USER_DASHBOARD_FIELDS = {
+    'personal_info': 1, 'kyc_status': 1, 'created_at': 1, 'credential_id': 1,
+    'security.account_locked': 1, 'security.banned': 1
+}
+VERIFICATION_DASHBOARD_FIELDS = {
+    'user_id': 1, 'status': 1, 'progress_percentage': 1, 'risk_score': 1, 'created_at': 1,
+    'approval_decision': 1, 'approval_timestamp': 1
+}
+CREDENTIAL_DASHBOARD_FIELDS = {'credential_id': 1, 'user_id': 1, 'status': 1, 'issued_at': 1, 'expiry_date': 1}
+LOG_DASHBOARD_FIELDS = {'event': 1, 'notes': 1, 'user_id': 1, 'credential_id': 1, 'ip': 1, 'timestamp': 1}
+
+# Dashboard list paging
+DASHBOARD_PAGE_SIZE = 200
+DASHBOARD_MAX_PAGE_SIZE = 1000
+
+
+def _fetch_page(cursor, page, limit):
+    """Materialize one page of cursor; reads one extra document to tell whether more remain"""
+    docs = list(cursor.skip(page * limit).limit(limit + 1))
+    return docs[:limit], len(docs) > limit
+
+
+# Worker threads for independent dashboard queries (PyMongo releases the GIL on I/O):
+# three stats queries plus four list fetches per dashboard load
+_QUERY_POOL = ThreadPoolExecutor(max_workers=8)
+
+
+def ensure_admin_indexes():
+    """Create the indexes behind admin lookups, status filters and the audit log sort"""
+    indexes = {
+        db.AuditLogs: [IndexModel([('timestamp', DESCENDING)])],
+        db.KYCCredentials: [
+            # Legacy credentials may lack credential_id; all of those would index as null
+            # and collide, so uniqueness only covers the ones that have one
+            IndexModel([('credential_id', ASCENDING)], unique=True,
+                       partialFilterExpression={'credential_id': {'$type': 'string'}}),
+            IndexModel([('user_id', ASCENDING)]),
+            IndexModel([('status', ASCENDING)])
+        ],
+        db.Users: [
+            IndexModel([('kyc_status.current_state', ASCENDING)]),
+            IndexModel([('created_at', ASCENDING)])
+        ],
+        db.KYCVerificationRequests: [IndexModel([('user_id', ASCENDING), ('status', ASCENDING)])]
+    }
+    for collection, models in indexes.items():
+        # One at a time, so an index that cannot be built (duplicate keys, a conflicting
+        # index from db/enhanced_collections.py) does not take the others down with it
+        for model in models:
+            try:
+                collection.create_indexes([model])
+            except Exception as e:
+                # Existing conflicting index or unreachable DB: queries still work, just unindexed
+                logger.warning("Could not create index %s on %s: %s", model.document['name'], collection.name, e)
+
+
+# Build indexes in the background so an unreachable DB does not stall app startup.
+# A plain thread, not _QUERY_POOL: a pool used before gunicorn's fork believes its
+# idle thread still exists in the workers and leaves their first task unrun
+threading.Thread(target=ensure_admin_indexes, daemon=True).start()
+
+# Worker threads for per-user PII decryption on the dashboard
+_DECRYPT_POOL = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 4))
+
+
+# Decrypted personal_info kept for DECRYPT_CACHE_TTL seconds, so repeat dashboard
+# loads skip AES-GCM without holding plaintext PII for the life of the worker
+DECRYPT_CACHE_TTL = 300
+DECRYPT_CACHE_SIZE = 4096
+
+# (user_id, ciphertext fingerprint) -> (expires_at, personal_info)
+_DECRYPT_CACHE = OrderedDict()
+_DECRYPT_CACHE_LOCK = threading.Lock()
+
+
+def _decrypt_cached(user_id, ciphertext_fingerprint, encrypted_blob_bytes):
+    """
+    Decrypted personal_info for one user, memoized on the ciphertext fingerprint.
+    Any re-encryption (new nonce) changes the fingerprint, so stale entries are never hit;
+    failures raise and are not cached.
+    """
+    key = (user_id, ciphertext_fingerprint)
+    now = time.monotonic()
+    with _DECRYPT_CACHE_LOCK:
+        entry = _DECRYPT_CACHE.get(key)
+        if entry is not None and entry[0] > now:
+            _DECRYPT_CACHE.move_to_end(key)
+            return entry[1]
+    from utils.encryption import EncryptionService
+    personal_info = bson.decode(encrypted_blob_bytes)
+    personal_info = EncryptionService.decrypt_pii_data({'personal_info': personal_info})['personal_info']
+    with _DECRYPT_CACHE_LOCK:
+        _DECRYPT_CACHE[key] = (now + DECRYPT_CACHE_TTL, personal_info)
+        _DECRYPT_CACHE.move_to_end(key)
+        # Expired entries are refreshed in place on their next hit; the size bound
+        # drops the least recently used ones
+        while len(_DECRYPT_CACHE) > DECRYPT_CACHE_SIZE:
+            _DECRYPT_CACHE.popitem(last=False)
+    return personal_info
+
+
+def _safe_decrypt(user):
+    """Decrypt one user's PII; fall back to a minimal record if decryption fails"""
+    try:
+        decrypted = dict(user)
+        decrypted['_id'] = str(user['_id'])
+        if 'personal_info' in user:
+            blob = bson.encode(user['personal_info'])
+            fingerprint = hashlib.blake2b(blob, digest_size=16).hexdigest()
+            # Copy so the cached entry is never shared with the response
+            decrypted['personal_info'] = copy.deepcopy(_decrypt_cached(decrypted['_id'], fingerprint, blob))
+        return decrypted
+    except Exception as e:
+        logger.warning("Error decrypting user %s: %s", user['_id'], e)
+        # Add user with minimal info
+        return {
+            '_id': str(user['_id']),
+            'personal_info': {'full_name': 'Encrypted', 'email': 'Encrypted'},
+            'kyc_status': user.get('kyc_status', {}),
+            'created_at': user.get('created_at'),
+            'credential_id': user.get('credential_id')
+        }
+
+
+# Diagnostic models and services shared by /perf-test and /feature-proof.
+# PaddleOCR and RSA key generation take far longer than the inference being timed.
+_MODELS = {}
+_MODELS_LOCK = threading.Lock()
+
+
+def _get_model(name, factory):
+    """Return the cached instance for name, building it with factory() on first use"""
+    model = _MODELS.get(name)
+    if model is None:
+        with _MODELS_LOCK:
+            model = _MODELS.get(name)
+            if model is None:
+                model = _MODELS[name] = factory()
+    return model
+
+
+# Audit entries are written by a background thread in batches, so admin
+# responses do not wait on the AuditLogs insert. Each process starts its own
+# writer on first use (see utils/background.py)
+_AUDIT_Q = queue.Queue(maxsize=10000)
+_AUDIT_BATCH_SIZE = 200
+
+
+def _drain_audit_queue(first=None):
+    batch = [] if first is None else [first]
+    while len(batch) < _AUDIT_BATCH_SIZE:
+        try:
+            batch.append(_AUDIT_Q.get_nowait())
+        except queue.Empty:
+            break
+    return batch
+
+
+def _write_audit_batch(batch):
+    try:
+        db.AuditLogs.insert_many(batch, ordered=False)
+    except Exception as e:
+        logger.exception("Error writing %d audit log entries: %s", len(batch), e)
+
+
+def _audit_writer():
+    while True:
+        _write_audit_batch(_drain_audit_queue(_AUDIT_Q.get()))
+
+
+def _flush_audit_queue():
+    """Write whatever is still queued at interpreter shutdown"""
+    batch = _drain_audit_queue()
+    while batch:
+        _write_audit_batch(batch)
+        batch = _drain_audit_queue()
+
+
+def log_admin_action(entry):
+    """Queue an AuditLogs entry; writes synchronously if the queue is backed up"""
+    ensure_thread('admin-audit-writer', _audit_writer)
+    try:
+        _AUDIT_Q.put_nowait(entry)
+    except queue.Full:
+        db.AuditLogs.insert_one(entry)
+
+
+atexit.register(_flush_audit_queue)
+
+# None until the first admin write finds out whether the deployment supports transactions
+_TRANSACTIONS_SUPPORTED = None
+
+
+def _write_atomically(*writes):
+    """
+    Run the write callables (each takes a session argument) in one transaction,
+    so a user update and its dependent updates commit together.
+    Standalone servers have no transactions: the writes then run in order without a session.
+    """
+    global _TRANSACTIONS_SUPPORTED
+    if _TRANSACTIONS_SUPPORTED is not False:
+        try:
+            with client.start_session() as session:
+                session.with_transaction(lambda s: [write(s) for write in writes])
+            _TRANSACTIONS_SUPPORTED = True
+            return
+        except OperationFailure as e:
+            # IllegalOperation: "Transaction numbers are only allowed on a replica set member or mongos"
+            if _TRANSACTIONS_SUPPORTED or e.code != 20:
+                raise
+            _TRANSACTIONS_SUPPORTED = False
+    for write in writes:
+        write(None)
+
 
 @admin_bp.route('/dashboard-data', methods=['GET'])
 def get_dashboard_data():
     """
     Get comprehensive admin dashboard data
+    Query params: page (0-based, default 0), limit (default 200, max 1000) page the
+    users, verifications and credentials lists (newest first) and the audit log
+    (at most 100 entries per page). Stats and analytics always cover the whole DB.
     """
-    from utils.encryption import EncryptionService
     try:
-        # Fetch all users
-        users = list(db.Users.find())
-        
-        # Decrypt user personal info
-        decrypted_users = []
-        for user in users:
-            try:
-                decrypted = EncryptionService.decrypt_pii_data(user)
-                decrypted['_id'] = str(user['_id'])
-                decrypted_users.append(decrypted)
-            except Exception as e:
-                print(f"Error decrypting user {user['_id']}: {e}")
-                # Add user with minimal info
-                decrypted_users.append({
-                    '_id': str(user['_id']),
-                    'personal_info': {'full_name': 'Encrypted', 'email': 'Encrypted'},
-                    'kyc_status': user.get('kyc_status', {}),
-                    'created_at': user.get('created_at'),
-                    'credential_id': user.get('credential_id')
-                })
+        page = max(int(request.args.get('page', 0)), 0)
+        limit = min(max(int(request.args.get('limit', DASHBOARD_PAGE_SIZE)), 1), DASHBOARD_MAX_PAGE_SIZE)
+    except ValueError:
+        return jsonify({"success": False, "message": "page and limit must be integers"}), 400
+    log_limit = min(limit, 100)
+
+    try:
+        # Statistics are aggregated server-side, concurrently with the list fetches below
+        stats_futures = (
+            _QUERY_POOL.submit(aggregate_user_stats),
+            _QUERY_POOL.submit(db.KYCVerificationRequests.count_documents, {'status': {'$in': ['initiated', 'in_progress']}}),
+            _QUERY_POOL.submit(db.KYCCredentials.count_documents, {'status': 'active'})
+        )
         
-        # Fetch verifications
-        verifications = list(db.KYCVerificationRequests.find())
-        for ver in verifications:
-            ver['_id'] = str(ver['_id'])
+        # The four list queries are independent: fetch one page of each concurrently
+        # (ObjectIds are stringified by json_response)
+        users_future = _QUERY_POOL.submit(
+            _fetch_page, db.Users.find({}, USER_DASHBOARD_FIELDS).sort('_id', -1), page, limit)
+        verifications_future = _QUERY_POOL.submit(
+            _fetch_page, db.KYCVerificationRequests.find({}, VERIFICATION_DASHBOARD_FIELDS).sort('_id', -1), page, limit)
+        credentials_future = _QUERY_POOL.submit(
+            _fetch_page, db.KYCCredentials.find({}, CREDENTIAL_DASHBOARD_FIELDS).sort('_id', -1), page, limit)
+        # Audit logs latest first
+        logs_future = _QUERY_POOL.submit(
+            _fetch_page, db.AuditLogs.find({}, LOG_DASHBOARD_FIELDS).sort('timestamp', -1), page, log_limit)
         
-        # Fetch credentials
-        credentials = list(db.KYCCredentials.find())
-        for cred in credentials:
-            cred['_id'] = str(cred['_id'])
+        # Decrypt user personal info (AES-GCM in cryptography releases the GIL)
+        users, more_users = users_future.result()
+        decrypted_users = list(_DECRYPT_POOL.map(_safe_decrypt, users))
         
-        # Fetch audit logs (last 100)
-        logs = list(db.AuditLogs.find().sort('timestamp', -1).limit(100))
-        for log in logs:
-            log['_id'] = str(log['_id'])
+        verifications, more_verifications = verifications_future.result()
+        credentials, more_credentials = credentials_future.result()
+        logs, more_logs = logs_future.result()
         
-        # Calculate statistics
-        total_users = len(users)
-        verified_users = len([u for u in users if u.get('kyc_status', {}).get('current_state') == 'approved'])
-        pending_verifications = len([v for v in verifications if v.get('status') in ['initiated', 'in_progress']])
-        credentials_issued = len([c for c in credentials if c.get('status') == 'active'])
+        # Collect statistics
+        (state_counts, month_counts), pending_verifications, credentials_issued = (f.result() for f in stats_futures)
+        total_users = sum(state_counts.values())
+        verified_users = state_counts['approved']
         
         # Calculate analytics
-        registration_trend = calculate_registration_trend(users)
-        kyc_distribution = calculate_kyc_distribution(users)
+        registration_trend = calculate_registration_trend(month_counts)
+        kyc_distribution = calculate_kyc_distribution(state_counts)
         
-        return jsonify({
+        return json_response({
             "success": True,
             "users": decrypted_users,
             "verifications": verifications,
             "credentials": credentials,
             "logs": logs,
+            "meta": {
+                "page": page,
+                "limit": limit,
+                "has_more": more_users or more_verifications or more_credentials or more_logs
+            },
             "stats": {
                 "totalUsers": total_users,
                 "verifiedUsers": verified_users,
@@ -94,7 +330,7 @@ def get_dashboard_data():
                 "registrationTrend": registration_trend,
                 "kycDistribution": kyc_distribution
             }
-        }), 200
+        })
         
     except Exception as e:
         return jsonify({
@@ -103,53 +339,100 @@ def get_dashboard_data():
         }), 500
 
 
-def calculate_registration_trend(users):
-    """Calculate monthly registration trend"""
-    monthly_counts = {}
-    
-    for user in users:
-        created_at = user.get('created_at')
-        if created_at:
-            month_key = created_at.strftime('%b %Y')
-            monthly_counts[month_key] = monthly_counts.get(month_key, 0) + 1
+# Months shown in the registration trend chart
+TREND_MONTHS = 6
+
+
+def aggregate_user_stats():
+    """Count KYC states and registrations per month with one $facet aggregation"""
+    result = next(db.Users.aggregate([
+        {'$facet': {
+            'states': [
+                {'$group': {'_id': '$kyc_status.current_state', 'n': {'$sum': 1}}}
+            ],
+            'trend': [
+                {'$match': {'created_at': {'$type': 'date'}}},
+                {'$group': {'_id': {'$dateToString': {'format': '%Y-%m', 'date': '$created_at'}}, 'n': {'$sum': 1}}},
+                # Only the latest TREND_MONTHS buckets are charted
+                {'$sort': {'_id': -1}},
+                {'$limit': TREND_MONTHS}
+            ]
+        }}
+    ]), {'states': [], 'trend': []})
     
+    state_counts = Counter({row['_id']: row['n'] for row in result['states']})
+    # Chronological order; labels keep the 'Jan 2024' format the dashboard expects
+    month_counts = {
+        datetime.strptime(row['_id'], '%Y-%m').strftime('%b %Y'): row['n']
+        for row in reversed(result['trend'])
+    }
+    return state_counts, month_counts
+
+
+def calculate_registration_trend(monthly_counts):
+    """Calculate monthly registration trend"""
     # Get last 6 months
-    labels = list(monthly_counts.keys())[-6:]
+    labels = list(monthly_counts.keys())[-TREND_MONTHS:]
     data = [monthly_counts.get(label, 0) for label in labels]
     
     return {"labels": labels, "data": data}
 
 
-def calculate_kyc_distribution(users):
+def calculate_kyc_distribution(state_counts):
     """Calculate KYC status distribution"""
-    approved = len([u for u in users if u.get('kyc_status', {}).get('current_state') == 'approved'])
-    pending = len([u for u in users if u.get('kyc_status', {}).get('current_state') == 'not_started'])
-    rejected = len([u for u in users if u.get('kyc_status', {}).get('current_state') == 'rejected'])
-    in_progress = len([u for u in users if u.get('kyc_status', {}).get('current_state') == 'in_progress'])
-    
-    return [approved, pending, rejected, in_progress]
+    return [
+        state_counts['approved'],
+        state_counts['not_started'],
+        state_counts['rejected'],
+        state_counts['in_progress']
+    ]
+
+
+def _oid(user_id):
+    """Parse a user id from the URL, rejecting malformed ids with 400 before any DB work"""
+    try:
+        return ObjectId(user_id)
+    except (InvalidId, TypeError):
+        abort(400, description=f"Invalid user id: {user_id}")
+
+
+@admin_bp.errorhandler(400)
+def _bad_request(e):
+    """Answer 400s (malformed ids, unparsable bodies) in the same JSON shape as the views"""
+    return jsonify({"success": False, "message": e.description}), 400
+
+
+# Constant parts of the ban updates; per-request timestamps are merged in
+_BAN_SET = {
+    'security.account_locked': True,
+    'security.banned': True,
+    'security.ban_reason': 'Admin action - security violation'
+}
+_BAN_REVOKE_SET = {'status': 'revoked', 'revoke_reason': 'User banned by admin'}
 
 
 @admin_bp.route('/suspend-user/<user_id>', methods=['POST'])
 def suspend_user(user_id):
     """Suspend a user account"""
+    oid = _oid(user_id)
+    now = datetime.utcnow()
     try:
-        result = db.Users.update_one(
-            {'_id': ObjectId(user_id)},
+        db.Users.update_one(
+            {'_id': oid},
             {
                 '$set': {
                     'security.account_locked': True,
                     'security.suspension_reason': 'Admin action',
-                    'security.suspended_at': datetime.utcnow()
+                    'security.suspended_at': now
                 }
             }
         )
         
         # Log the action
-        db.AuditLogs.insert_one({
+        log_admin_action({
             'user_id': user_id,
             'event': 'account_suspended',
-            'timestamp': datetime.utcnow(),
+            'timestamp': now,
             'ip': request.remote_addr,
             'notes': 'Account suspended by admin'
         })
@@ -169,36 +452,28 @@ def suspend_user(user_id):
 @admin_bp.route('/ban-user/<user_id>', methods=['POST'])
 def ban_user(user_id):
     """Permanently ban a user account"""
+    oid = _oid(user_id)
+    now = datetime.utcnow()
     try:
-        result = db.Users.update_one(
-            {'_id': ObjectId(user_id)},
-            {
-                '$set': {
-                    'security.account_locked': True,
-                    'security.banned': True,
-                    'security.ban_reason': 'Admin action - security violation',
-                    'security.banned_at': datetime.utcnow()
-                }
-            }
-        )
-        
-        # Revoke any active credentials
-        db.KYCCredentials.update_many(
-            {'user_id': user_id},
-            {
-                '$set': {
-                    'status': 'revoked',
-                    'revoked_at': datetime.utcnow(),
-                    'revoke_reason': 'User banned by admin'
-                }
-            }
+        _write_atomically(
+            lambda s: db.Users.update_one(
+                {'_id': oid},
+                {'$set': {**_BAN_SET, 'security.banned_at': now}},
+                session=s
+            ),
+            # Revoke any active credentials
+            lambda s: db.KYCCredentials.update_many(
+                {'user_id': user_id},
+                {'$set': {**_BAN_REVOKE_SET, 'revoked_at': now}},
+                session=s
+            )
         )
         
         # Log the action
-        db.AuditLogs.insert_one({
+        log_admin_action({
             'user_id': user_id,
             'event': 'account_banned',
-            'timestamp': datetime.utcnow(),
+            'timestamp': now,
             'ip': request.remote_addr,
             'notes': 'Account permanently banned by admin'
         })
@@ -218,36 +493,41 @@ def ban_user(user_id):
 @admin_bp.route('/approve-kyc/<user_id>', methods=['POST'])
 def approve_kyc(user_id):
     """Manually approve a user's KYC"""
+    oid = _oid(user_id)
+    now = datetime.utcnow()
     try:
-        # Update user KYC status
-        db.Users.update_one(
-            {'_id': ObjectId(user_id)},
-            {
-                '$set': {
-                    'kyc_status.current_state': 'approved',
-                    'kyc_status.completion_percent': 100,
-                    'kyc_status.last_updated': datetime.utcnow()
-                }
-            }
-        )
-        
-        # Update verification request if exists
-        db.KYCVerificationRequests.update_many(
-            {'user_id': user_id},
-            {
-                '$set': {
-                    'approval_decision': 'manual_approved',
-                    'approval_timestamp': datetime.utcnow(),
-                    'status': 'approved'
-                }
-            }
+        _write_atomically(
+            # Update user KYC status
+            lambda s: db.Users.update_one(
+                {'_id': oid},
+                {
+                    '$set': {
+                        'kyc_status.current_state': 'approved',
+                        'kyc_status.completion_percent': 100,
+                        'kyc_status.last_updated': now
+                    }
+                },
+                session=s
+            ),
+            # Update verification request if exists
+            lambda s: db.KYCVerificationRequests.update_many(
+                {'user_id': user_id},
+                {
+                    '$set': {
+                        'approval_decision': 'manual_approved',
+                        'approval_timestamp': now,
+                        'status': 'approved'
+                    }
+                },
+                session=s
+            )
         )
         
         # Log the action
-        db.AuditLogs.insert_one({
+        log_admin_action({
             'user_id': user_id,
             'event': 'kyc_manually_approved',
-            'timestamp': datetime.utcnow(),
+            'timestamp': now,
             'ip': request.remote_addr,
             'notes': 'KYC manually approved by admin'
         })
@@ -267,39 +547,44 @@ def approve_kyc(user_id):
 @admin_bp.route('/reject-kyc/<user_id>', methods=['POST'])
 def reject_kyc(user_id):
     """Manually reject a user's KYC"""
+    oid = _oid(user_id)
+    now = datetime.utcnow()
     try:
         data = request.get_json()
         reason = data.get('reason', 'Admin rejection')
         
-        # Update user KYC status
-        db.Users.update_one(
-            {'_id': ObjectId(user_id)},
-            {
-                '$set': {
-                    'kyc_status.current_state': 'rejected',
-                    'kyc_status.reason_if_rejected': reason,
-                    'kyc_status.last_updated': datetime.utcnow()
-                }
-            }
-        )
-        
-        # Update verification request
-        db.KYCVerificationRequests.update_many(
-            {'user_id': user_id},
-            {
-                '$set': {
-                    'approval_decision': 'rejected',
-                    'status': 'rejected',
-                    'rejection_reason': reason
-                }
-            }
+        _write_atomically(
+            # Update user KYC status
+            lambda s: db.Users.update_one(
+                {'_id': oid},
+                {
+                    '$set': {
+                        'kyc_status.current_state': 'rejected',
+                        'kyc_status.reason_if_rejected': reason,
+                        'kyc_status.last_updated': now
+                    }
+                },
+                session=s
+            ),
+            # Update verification request
+            lambda s: db.KYCVerificationRequests.update_many(
+                {'user_id': user_id},
+                {
+                    '$set': {
+                        'approval_decision': 'rejected',
+                        'status': 'rejected',
+                        'rejection_reason': reason
+                    }
+                },
+                session=s
+            )
         )
         
         # Log the action
-        db.AuditLogs.insert_one({
+        log_admin_action({
             'user_id': user_id,
             'event': 'kyc_rejected',
-            'timestamp': datetime.utcnow(),
+            'timestamp': now,
             'ip': request.remote_addr,
             'notes': f'KYC rejected by admin: {reason}'
         })
@@ -319,26 +604,27 @@ def reject_kyc(user_id):
 @admin_bp.route('/revoke-credential/<credential_id>', methods=['POST'])
 def revoke_credential(credential_id):
     """Revoke a KYC credential"""
+    now = datetime.utcnow()
     try:
         data = request.get_json()
         reason = data.get('reason', 'Admin revocation')
         
-        result = db.KYCCredentials.update_one(
+        db.KYCCredentials.update_one(
             {'credential_id': credential_id},
             {
                 '$set': {
                     'status': 'revoked',
-                    'revoked_at': datetime.utcnow(),
+                    'revoked_at': now,
                     'revoke_reason': reason
                 }
             }
         )
         
         # Log the action
-        db.AuditLogs.insert_one({
+        log_admin_action({
             'event': 'credential_revoked',
             'credential_id': credential_id,
-            'timestamp': datetime.utcnow(),
+            'timestamp': now,
             'ip': request.remote_addr,
             'notes': f'Credential revoked by admin: {reason}'
         })
@@ -369,81 +655,94 @@ def health_check():
 def perf_test():
     """Run quick performance and latency checks for core subsystems.
     Returns timings for DB ping, sample query, and optional model inferences.
+    The probes are independent, so they run concurrently and the endpoint
+    takes about as long as the slowest one.
     """
     import time
-    results = {}
+    import numpy as np
+
+    # Create a simple test image for model tests
+    test_img = np.ones((10, 10, 3), dtype=np.uint8) * 255
 
     # 1) MongoDB ping
-    try:
-        t0 = time.perf_counter()
-        pong = client.admin.command('ping')
-        t1 = time.perf_counter()
-        results['mongodb_ping_ms'] = round((t1 - t0) * 1000, 2)
-        results['mongodb_pong'] = pong
-    except Exception as e:
-        results['mongodb_ping_error'] = str(e)
+    def probe_ping():
+        try:
+            t0 = time.perf_counter()
+            pong = client.admin.command('ping')
+            t1 = time.perf_counter()
+            return {'mongodb_ping_ms': round((t1 - t0) * 1000, 2), 'mongodb_pong': pong}
+        except Exception as e:
+            return {'mongodb_ping_error': str(e)}
 
     # 2) Sample DB query - find one user
-    try:
-        t0 = time.perf_counter()
-        sample = db.Users.find_one()
-        t1 = time.perf_counter()
-        results['db_find_one_ms'] = round((t1 - t0) * 1000, 2)
-        results['db_sample_user_exists'] = sample is not None
-    except Exception as e:
-        results['db_find_one_error'] = str(e)
-
-    # Create a simple test image for model tests
-    import numpy as np, cv2
-    test_img = np.ones((10, 10, 3), dtype=np.uint8) * 255
+    def probe_find_one():
+        try:
+            t0 = time.perf_counter()
+            sample = db.Users.find_one()
+            t1 = time.perf_counter()
+            return {'db_find_one_ms': round((t1 - t0) * 1000, 2), 'db_sample_user_exists': sample is not None}
+        except Exception as e:
+            return {'db_find_one_error': str(e)}
 
     # 3) OCR model timing (if available)
-    try:
-        from models.ocr_model import OCRModel
-        ocr = OCRModel()
-        t0 = time.perf_counter()
-        o = ocr.extract_text(test_img)
-        t1 = time.perf_counter()
-        results['ocr_ms'] = round((t1 - t0) * 1000, 2)
-        results['ocr_sample'] = {'lines_count': len(o.get('lines', [])) if isinstance(o.get('lines'), (list,tuple)) else 0}
-    except Exception as e:
-        results['ocr_error'] = str(e)
+    def probe_ocr():
+        try:
+            from models.ocr_model import OCRModel
+            ocr = _get_model('ocr', OCRModel)
+            t0 = time.perf_counter()
+            o = ocr.extract_text(test_img)
+            t1 = time.perf_counter()
+            return {
+                'ocr_ms': round((t1 - t0) * 1000, 2),
+                'ocr_sample': {'lines_count': len(o.get('lines', [])) if isinstance(o.get('lines'), (list,tuple)) else 0}
+            }
+        except Exception as e:
+            return {'ocr_error': str(e)}
 
     # 4) Deepfake model timing (if available)
-    try:
-        from models.deepfake_model import DeepfakeModel
-        dm = DeepfakeModel()
-        t0 = time.perf_counter()
-        out = dm.predict(test_img)
-        t1 = time.perf_counter()
-        results['deepfake_ms'] = round((t1 - t0) * 1000, 2)
-        results['deepfake_output'] = {'probability': out.get('probability') if isinstance(out, dict) else out}
-    except Exception as e:
-        results['deepfake_not_available'] = str(e)
+    def probe_deepfake():
+        try:
+            from models.deepfake_model import DeepfakeModel
+            dm = _get_model('deepfake', DeepfakeModel)
+            t0 = time.perf_counter()
+            out = dm.predict(test_img)
+            t1 = time.perf_counter()
+            return {
+                'deepfake_ms': round((t1 - t0) * 1000, 2),
+                'deepfake_output': {'probability': out.get('probability') if isinstance(out, dict) else out}
+            }
+        except Exception as e:
+            return {'deepfake_not_available': str(e)}
 
     # 5) Face matcher timing
-    try:
-        from models.face_matcher import FaceMatcher
-        fm = FaceMatcher()
-        t0 = time.perf_counter()
-        cmp = fm.compare(test_img, test_img)
-        t1 = time.perf_counter()
-        results['face_match_ms'] = round((t1 - t0) * 1000, 2)
-        results['face_match_score'] = cmp.get('match_score')
-    except Exception as e:
-        results['face_match_error'] = str(e)
+    def probe_face_match():
+        try:
+            from models.face_matcher import FaceMatcher
+            fm = _get_model('face_matcher', FaceMatcher)
+            t0 = time.perf_counter()
+            cmp = fm.compare(test_img, test_img)
+            t1 = time.perf_counter()
+            return {'face_match_ms': round((t1 - t0) * 1000, 2), 'face_match_score': cmp.get('match_score')}
+        except Exception as e:
+            return {'face_match_error': str(e)}
 
     # 6) Tamper detector timing
-    try:
-        from models.document_tamper_detector import DocumentTamperDetector
-        td = DocumentTamperDetector()
-        t0 = time.perf_counter()
-        tam = td.analyze(test_img)
-        t1 = time.perf_counter()
-        results['tamper_ms'] = round((t1 - t0) * 1000, 2)
-        results['tamper_score'] = tam.get('tamper_score')
-    except Exception as e:
-        results['tamper_error'] = str(e)
+    def probe_tamper():
+        try:
+            from models.document_tamper_detector import DocumentTamperDetector
+            td = _get_model('tamper', DocumentTamperDetector)
+            t0 = time.perf_counter()
+            tam = td.analyze(test_img)
+            t1 = time.perf_counter()
+            return {'tamper_ms': round((t1 - t0) * 1000, 2), 'tamper_score': tam.get('tamper_score')}
+        except Exception as e:
+            return {'tamper_error': str(e)}
+
+    probes = (probe_ping, probe_find_one, probe_ocr, probe_deepfake, probe_face_match, probe_tamper)
+    results = {}
+    with ThreadPoolExecutor(max_workers=len(probes)) as pool:
+        for future in as_completed([pool.submit(p) for p in probes]):
+            results.update(future.result())
 
     results['timestamp'] = datetime.utcnow().isoformat()
 
@@ -493,7 +792,7 @@ def feature_proof():
         try:
             if not CryptographicCredentialService:
                 raise ImportError("CryptographicCredentialService not available")
-            cs = CryptographicCredentialService()
+            cs = _get_model('credentials', CryptographicCredentialService)
             kyc_data = {'credential_id': f'KYC-{int(time.time())}', 'identity_integrity_score': 95, 'kyc_status': 'approved'}
             signed = cs.issue_signed_credential('000000000000000000000000', 'verif-sample', kyc_data)
             verify = cs.verify_credential_signature(signed['signed_credential'])
@@ -524,7 +823,7 @@ def feature_proof():
             
             try:
                 from models.deepfake_model import DeepfakeModel
-                dm = DeepfakeModel()
+                dm = _get_model('deepfake', DeepfakeModel)
                 df_out = dm.predict(test_img)
             except Exception as e:
                 # fallback to RealFaceAnalyzer if available
@@ -533,7 +832,7 @@ def feature_proof():
                     _, buffer = cv2.imencode('.png', test_img)
                     img_b64 = 'data:image/png;base64,' + base64.b64encode(buffer).decode()
                     from utils.real_face_analyzer import RealFaceAnalyzer
-                    ra = RealFaceAnalyzer()
+                    ra = _get_model('face_analyzer', RealFaceAnalyzer)
                     df_out = ra.analyze_selfie(img_b64)
                 except Exception as e2:
                     df_out = {'error': str(e) + ' | ' + str(e2)}
@@ -546,7 +845,7 @@ def feature_proof():
         try:
             from models.ocr_model import OCRModel
             import base64, cv2, numpy as np
-            ocr = OCRModel()
+            ocr = _get_model('ocr', OCRModel)
             # Create a small test image
             test_img = np.ones((10, 10, 3), dtype=np.uint8) * 255
             o = ocr.extract_text(test_img)
@@ -557,7 +856,7 @@ def feature_proof():
         # 6) Behavioral trust / anomaly detector
         try:
             from models.anomaly_detector import AnomalyDetector
-            ad = AnomalyDetector()
+            ad = _get_model('anomaly', AnomalyDetector)
             sample_features = {'typing_speed': 30.0, 'error_rate': 0.02, 'mouse_smoothness': 0.9, 'session_duration': 120}
             ad_out = ad.detect(sample_features)
             proof['behavioral_analyzer'] = ad_out
@@ -2,24 +2,210 @@
 Authentication Routes
 Handles signup and login endpoints
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, current_app, g, stream_with_context
+import importlib.util
+import itertools
+import json
+import logging
+import secrets
 import sys
 import os
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
 from bson import ObjectId
-from pymongo import MongoClient
+from werkzeug.exceptions import HTTPException
+from pymongo import MongoClient, IndexModel, ReturnDocument, UpdateOne
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from services.auth_service import AuthService
+from utils.json_response import json_dumps, json_response
+from utils.redis_cache import (
+    cache_get, cache_setex, cache_delete, allow_request, publish, subscribe, iter_messages,
+    consent_requests_key, consent_events_channel, session_key, sessions_enabled,
+    CONSENT_REQUESTS_TTL, SESSION_TTL
+)
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
-# MongoDB connection for consent requests
+logger = logging.getLogger(__name__)
+
+
+def _wire_compressors():
+    """zstd/snappy when their libraries are installed; zlib (stdlib) always"""
+    names = [name for name, module in (('zstd', 'zstandard'), ('snappy', 'snappy'))
+             if importlib.util.find_spec(module)]
+    return ','.join(names + ['zlib'])
+
+
+# MongoDB connection for consent requests: explicit pool bounds so bursts fail fast
+# on a saturated pool instead of queueing indefinitely
 MONGO_URI = os.getenv("MONGO_URL") or os.getenv("MONGODB_URI") or "mongodb://localhost:27017"
-mongo_client = MongoClient(MONGO_URI)
+mongo_client = MongoClient(
+    MONGO_URI,
+    maxPoolSize=int(os.getenv("MONGO_MAX_POOL_SIZE", "200")),
+    minPoolSize=int(os.getenv("MONGO_MIN_POOL_SIZE", "20")),
+    compressors=_wire_compressors(),
+    retryWrites=True,
+    retryReads=True,
+    serverSelectionTimeoutMS=2000,
+    waitQueueTimeoutMS=500
+)
 mongo_db = mongo_client["aegis_kyc"]
 
+# Login attempts allowed per client IP per window (seconds), checked before password hashing
+LOGIN_RATE_LIMIT = 5
+LOGIN_RATE_WINDOW = 60
+# Signups allowed per client IP per window (seconds), checked before the DB lookup and hashing
+SIGNUP_RATE_LIMIT = 10
+SIGNUP_RATE_WINDOW = 3600
+
+# A consent event stream ends after this many seconds (plus up to one keep-alive
+# interval) and the browser reconnects, so no stream holds a worker thread for long
+CONSENT_STREAM_LIFETIME = 60
+# Open event streams allowed per worker process, leaving its other threads for requests
+CONSENT_STREAM_MAX = int(os.getenv("CONSENT_STREAM_MAX", "4"))
+_STREAM_SLOTS = threading.BoundedSemaphore(CONSENT_STREAM_MAX)
+
+# Cookie carrying the session token (EventSource cannot send an Authorization header)
+SESSION_COOKIE = 'aegis_session'
+
+# Largest serialized consent list kept in the Redis cache
+CONSENT_CACHE_MAX_BYTES = 256 * 1024
+# Consent requests fetched and serialized per batch
+CONSENT_BATCH_SIZE = 200
+
+# Fields the user dashboard renders for each consent request
+CONSENT_REQUEST_FIELDS = {
+    'organization_id': 1, 'organization_name': 1, 'user_id': 1, 'user_name': 1, 'user_email': 1,
+    'credential_id': 1, 'purpose': 1, 'consent_status': 1, 'request_id': 1,
+    'created_at': 1, 'updated_at': 1
+}
+
+
+def ensure_consent_indexes():
+    """Index the per-user consent request lookup and the request_id lookup in consent_response"""
+    try:
+        mongo_db['ConsentRequests'].create_indexes([
+            IndexModel([('user_id', 1), ('created_at', -1)]),
+            # Older documents may lack request_id, so uniqueness only covers those that have one
+            IndexModel([('request_id', 1)], unique=True,
+                       partialFilterExpression={'request_id': {'$type': 'string'}})
+        ])
+    except Exception as e:
+        logger.warning("Could not create ConsentRequests index: %s", e)
+
+
+# In the background so an unreachable DB does not stall app startup
+threading.Thread(target=ensure_consent_indexes, daemon=True).start()
+
+
+# ObjectIds are immutable, so hot ids (users polling their consent list) can share one instance
+@lru_cache(maxsize=4096)
+def _oid(value):
+    return ObjectId(value)
+
+
+def _try_oid(value):
+    """ObjectId for a 24-hex string, otherwise the value unchanged (ids may be stored either way)"""
+    try:
+        return _oid(value)
+    except Exception:
+        return value
+
+
+def _device_info(environ):
+    # Read headers straight from the WSGI environ (HTTP_* keys) instead of the
+    # case-insensitive request.headers wrapper
+    user_agent = environ.get('HTTP_USER_AGENT', '')
+    return {
+        "device_type": "web",
+        "device_id": environ.get('HTTP_X_DEVICE_ID', ''),
+        "os_version": user_agent,
+        "browser": user_agent,
+        "screen_resolution": environ.get('HTTP_X_SCREEN_RESOLUTION', '')
+    }
+
+
+def _client_ip(environ):
+    # ProxyFix (main.py) has already resolved X-Forwarded-For into REMOTE_ADDR
+    return environ.get('REMOTE_ADDR')
+
+
+def _session_token():
+    auth = request.headers.get('Authorization', '')
+    if auth.startswith('Bearer '):
+        return auth[7:]
+    return request.cookies.get(SESSION_COOKIE)
+
+
+@auth_bp.before_request
+def load_session():
+    """
+    Resolve the session token ('Authorization: Bearer <token>' or the session cookie)
+    from Redis into g.session_user ({user_id, kyc_status}) without touching MongoDB;
+    None when absent or expired
+    """
+    g.session_user = None
+    token = _session_token()
+    if token:
+        cached = cache_get(session_key(token))
+        if cached is not None:
+            g.session_user = json.loads(cached)
+
+
+def _require_user(user_id):
+    """
+    None when the session may act for user_id, otherwise a 401/403 response.
+    Without Redis no sessions can be issued, so the user routes stay open.
+    """
+    if not sessions_enabled():
+        return None
+    if g.session_user is None:
+        return json_response({
+            "success": False,
+            "message": "Authentication required"
+        }, 401)
+    if str(g.session_user.get('user_id')) != str(user_id):
+        return json_response({
+            "success": False,
+            "message": "Forbidden"
+        }, 403)
+    return None
+
+
+def _owned_by_session(match):
+    """
+    Restrict a ConsentRequests filter to the session user's requests
+    (user_id is stored as ObjectId or string); unchanged without sessions
+    """
+    if not sessions_enabled():
+        return match
+    user_id = str(g.session_user['user_id'])
+    return {'$and': [match, {'user_id': {'$in': [_try_oid(user_id), user_id]}}]}
+
+
+@auth_bp.errorhandler(Exception)
+def _server_error(e):
+    """Single 500 handler for the auth views; HTTP errors (400, 404, ...) keep their status"""
+    if isinstance(e, HTTPException):
+        return e
+    logger.exception("auth error")
+    return json_response({
+        "success": False,
+        "message": f"Server error: {str(e)}"
+    }, 500)
+
+
+def _too_many_requests(message, window):
+    """429 for a rate-limited client; the fixed window resets within `window` seconds"""
+    response = json_response({"success": False, "message": message}, 429)
+    response.headers['Retry-After'] = str(window)
+    return response
+
 
 @auth_bp.route('/signup', methods=['POST'])
 def signup():
@@ -44,45 +230,35 @@ def signup():
         "password": "string"
     }
     """
-    try:
-        # Get JSON data
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({
-                "success": False,
-                "message": "No data provided"
-            }), 400
-        
-        # Get device info from headers
-        device_info = {
-            "device_type": "web",
-            "device_id": request.headers.get('X-Device-ID', ''),
-            "os_version": request.headers.get('User-Agent', ''),
-            "browser": request.headers.get('User-Agent', ''),
-            "screen_resolution": request.headers.get('X-Screen-Resolution', '')
-        }
-        
-        # Get IP address
-        ip_address = request.headers.get('X-Forwarded-For', request.remote_addr)
-        
-        # Register user
-        result = AuthService.register_user(
-            signup_data=data,
-            device_info=device_info,
-            ip_address=ip_address
-        )
-        
-        if result["success"]:
-            return jsonify(result), 201
-        else:
-            return jsonify(result), 400
-            
-    except Exception as e:
-        return jsonify({
+    # Get JSON data
+    data = request.get_json()
+    
+    if not data or not isinstance(data, dict):
+        return json_response({
             "success": False,
-            "message": f"Server error: {str(e)}"
-        }), 500
+            "message": "No data provided"
+        }, 400)
+    
+    # Get device info and IP address from headers
+    env = request.environ
+    device_info = _device_info(env)
+    ip_address = _client_ip(env)
+    
+    if not allow_request(f"signup:{ip_address}", SIGNUP_RATE_LIMIT, SIGNUP_RATE_WINDOW):
+        return _too_many_requests("Too many signup attempts. Please try again later.", SIGNUP_RATE_WINDOW)
+    
+    # Register user (every field is validated before any database lookup or password
+    # hashing, so malformed payloads are rejected without doing crypto work)
+    result = AuthService.register_user(
+        signup_data=data,
+        device_info=device_info,
+        ip_address=ip_address
+    )
+    
+    if result["success"]:
+        return json_response(result, 201)
+    else:
+        return json_response(result, 400)
 
 
 @auth_bp.route('/login', methods=['POST'])
@@ -96,44 +272,54 @@ def login():
         "password": "string"
     }
     """
-    try:
-        data = request.get_json()
-        
-        if not data or not data.get('email') or not data.get('password'):
-            return jsonify({
-                "success": False,
-                "message": "Email and password are required"
-            }), 400
-        
-        # Get device info from headers
-        device_info = {
-            "device_type": "web",
-            "device_id": request.headers.get('X-Device-ID', ''),
-            "os_version": request.headers.get('User-Agent', ''),
-            "browser": request.headers.get('User-Agent', '')
-        }
-        
-        # Get IP address
-        ip_address = request.headers.get('X-Forwarded-For', request.remote_addr)
-        
-        # Authenticate user
-        result = AuthService.login_user(
-            email=data['email'],
-            password=data['password'],
-            device_info=device_info,
-            ip_address=ip_address
-        )
-        
-        if result["success"]:
-            return jsonify(result), 200
-        else:
-            return jsonify(result), 401
-            
-    except Exception as e:
-        return jsonify({
+    data = request.get_json()
+    
+    if not data or not data.get('email') or not data.get('password'):
+        return json_response({
             "success": False,
-            "message": f"Server error: {str(e)}"
-        }), 500
+            "message": "Email and password are required"
+        }, 400)
+    
+    # Get device info and IP address from headers
+    env = request.environ
+    device_info = _device_info(env)
+    ip_address = _client_ip(env)
+    
+    if not allow_request(f"login:{ip_address}", LOGIN_RATE_LIMIT, LOGIN_RATE_WINDOW):
+        return _too_many_requests("Too many login attempts. Please try again later.", LOGIN_RATE_WINDOW)
+    
+    # Authenticate user
+    result = AuthService.login_user(
+        email=data['email'],
+        password=data['password'],
+        device_info=device_info,
+        ip_address=ip_address
+    )
+    
+    if result["success"]:
+        # Opaque session token for later requests (only issued when Redis is available)
+        token = secrets.token_urlsafe(32)
+        session = {"user_id": result["user_id"], "kyc_status": result.get("kyc_status")}
+        if cache_setex(session_key(token), SESSION_TTL, json.dumps(session)):
+            result["session_token"] = token
+            response = json_response(result, 200)
+            response.set_cookie(SESSION_COOKIE, token, max_age=SESSION_TTL, httponly=True,
+                                secure=request.is_secure, samesite='Strict')
+            return response
+        return json_response(result, 200)
+    else:
+        return json_response(result, 401)
+
+
+@auth_bp.route('/logout', methods=['POST'])
+def logout():
+    """End the session: revoke its token and clear the session cookie"""
+    token = _session_token()
+    if token:
+        cache_delete(session_key(token))
+    response = json_response({"success": True, "message": "Logged out"}, 200)
+    response.delete_cookie(SESSION_COOKIE)
+    return response
 
 
 @auth_bp.route('/user/<user_id>', methods=['GET'])
@@ -142,162 +328,284 @@ def get_user(user_id):
     Get User Details Endpoint
     Returns decrypted user information
     """
-    try:
-        from bson import ObjectId
-        from services.auth_service import AuthService
-        
-        # Fetch user from database
-        result = AuthService.get_user_by_id(user_id)
-        
-        if result["success"]:
-            return jsonify(result), 200
-        else:
-            return jsonify(result), 404
-            
-    except Exception as e:
-        return jsonify({
-            "success": False,
-            "message": f"Server error: {str(e)}"
-        }), 500
+    denied = _require_user(user_id)
+    if denied:
+        return denied
+    
+    # Fetch user from database
+    result = AuthService.get_user_by_id(user_id)
+    
+    if result["success"]:
+        return json_response(result, 200)
+    else:
+        return json_response(result, 404)
+
+
+def _consent_requests_response(payload):
+    """Wrap an already-serialized consent request list without re-encoding it"""
+    if isinstance(payload, str):
+        payload = payload.encode()
+    body = b'{"success":true,"requests":' + payload + b'}'
+    return current_app.response_class(body, mimetype='application/json'), 200
+
+
+def _stream_consent_requests(first, docs, cache_key):
+    """
+    Yield the consent list response one cursor batch at a time. Each batch is
+    serialized by a single json_dumps call (ObjectIds and datetimes handled by the
+    encoder). The serialized batches are kept for the cache only while the list
+    stays under CONSENT_CACHE_MAX_BYTES, so peak memory stays bounded for large lists.
+    """
+    yield b'{"success":true,"requests":['
+    parts, size = [], 0
+    if first is not None:
+        docs = itertools.chain((first,), docs)
+        for i, batch in enumerate(iter(lambda: list(itertools.islice(docs, CONSENT_BATCH_SIZE)), [])):
+            chunk = json_dumps(batch)
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            # Drop the list brackets so batches concatenate into one array
+            chunk = chunk[1:-1]
+            if parts is not None:
+                size += len(chunk)
+                if size <= CONSENT_CACHE_MAX_BYTES:
+                    parts.append(chunk)
+                else:
+                    parts = None
+            yield b',' + chunk if i else chunk
+    yield b']}'
+    if parts is not None:
+        cache_setex(cache_key, CONSENT_REQUESTS_TTL, b'[' + b','.join(parts) + b']')
 
 
 @auth_bp.route('/user/consent-requests/<user_id>', methods=['GET'])
 def get_consent_requests(user_id):
     """Get all consent requests for a user"""
-    try:
-        print(f"\n=== USER CONSENT REQUESTS REQUEST ===")
-        print(f"User ID from URL: {user_id}")
-        
-        consent_requests_collection = mongo_db['ConsentRequests']
-        
-        # Try to convert to ObjectId, fallback to string
-        try:
-            query_user_id = ObjectId(user_id)
-            print(f"Converted to ObjectId: {query_user_id}")
-        except:
-            query_user_id = user_id
-            print(f"Using as string: {query_user_id}")
-        
-        print(f"Searching consent requests for user_id: {query_user_id}, type: {type(query_user_id)}")
-        
-        # Check total documents in collection
-        total_docs = consent_requests_collection.count_documents({})
-        print(f"Total documents in ConsentRequests collection: {total_docs}")
-        
-        # Find all consent requests for this user
-        requests = list(consent_requests_collection.find({'user_id': query_user_id}))
-        print(f"Found {len(requests)} consent requests for this user")
-        
-        # If none found, show all user_ids in collection for debugging
-        if len(requests) == 0 and total_docs > 0:
-            print("WARNING: No requests found. All user_ids in collection:")
-            all_user_ids = consent_requests_collection.distinct('user_id')
-            for uid in all_user_ids:
-                print(f"  - {uid} (type: {type(uid)})")
-        
-        # Convert ObjectId to string for JSON serialization
-        for req in requests:
-            req['_id'] = str(req['_id'])
-            if isinstance(req.get('user_id'), ObjectId):
-                req['user_id'] = str(req['user_id'])
-            if isinstance(req.get('organization_id'), ObjectId):
-                req['organization_id'] = str(req['organization_id'])
-            # Convert datetime to string
-            if 'created_at' in req:
-                req['created_at'] = req['created_at'].isoformat()
-            if 'updated_at' in req:
-                req['updated_at'] = req['updated_at'].isoformat()
-        
-        return jsonify({
-            "success": True,
-            "requests": requests
-        }), 200
-        
-    except Exception as e:
-        return jsonify({
-            "success": False,
-            "message": f"Error fetching consent requests: {str(e)}"
-        }), 500
+    denied = _require_user(user_id)
+    if denied:
+        return denied
+    
+    logger.debug("User consent requests for user_id from URL: %s", user_id)
+    
+    # Cache-aside: serve the serialized list from Redis when present
+    cache_key = consent_requests_key(user_id)
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return _consent_requests_response(cached)
+    
+    # Read from the primary: the dashboard reloads right after a consent decision, and a
+    # lagging secondary would put the pre-decision list into the cache
+    consent_requests_collection = mongo_db['ConsentRequests']
+    
+    # Try to convert to ObjectId, fallback to string
+    query_user_id = _try_oid(user_id)
+    
+    logger.debug("Searching consent requests for user_id: %s, type: %s", query_user_id, type(query_user_id))
+    
+    # Find all consent requests for this user. Pulling the first document here runs
+    # the first batch before streaming starts, so DB errors still reach _server_error
+    docs = iter(consent_requests_collection.find({'user_id': query_user_id}, CONSENT_REQUEST_FIELDS).batch_size(CONSENT_BATCH_SIZE))
+    first = next(docs, None)
+    
+    # If none found, show all user_ids in collection for debugging (full scan: debug only)
+    if current_app.debug and first is None:
+        logger.debug("No requests found. All user_ids in collection: %s",
+                     [(uid, type(uid).__name__) for uid in consent_requests_collection.distinct('user_id')])
+    
+    # Stream the list (ObjectIds -> str, datetimes -> ISO 8601) instead of materializing it
+    return current_app.response_class(
+        stream_with_context(_stream_consent_requests(first, docs, cache_key)),
+        mimetype='application/json'
+    ), 200
 
 
 @auth_bp.route('/user/consent-response', methods=['POST'])
 def consent_response():
-    """Handle user's consent approval or rejection"""
-    try:
-        from datetime import datetime
-        
-        data = request.json
-        request_id = data.get('request_id')
-        status = data.get('status')  # 'approved' or 'rejected'
+    """
+    Handle user's consent approval or rejection
+    
+    Single decision: {"request_id": "...", "status": "approved" | "rejected"}
+    Several at once: {"items": [{"request_id": "...", "status": "..."}, ...]}
+    or the bare array [{"request_id": "...", "status": "..."}, ...]
+    """
+    if sessions_enabled() and g.session_user is None:
+        return json_response({
+            "success": False,
+            "message": "Authentication required"
+        }, 401)
+    
+    data = request.get_json(silent=True)
+    if isinstance(data, list):
+        return _bulk_consent_response(data)
+    if not isinstance(data, dict):
+        return json_response({
+            "success": False,
+            "message": "A JSON object or array body is required"
+        }, 400)
+    if 'items' in data:
+        return _bulk_consent_response(data['items'])
+    request_id = data.get('request_id')
+    status = data.get('status')  # 'approved' or 'rejected'
+    
+    if not request_id or not status:
+        return json_response({
+            "success": False,
+            "message": "Request ID and status are required"
+        }, 400)
         
-        if not request_id or not status:
-            return jsonify({
+    if status not in ['approved', 'rejected']:
+        return json_response({
+            "success": False,
+            "message": "Status must be 'approved' or 'rejected'"
+        }, 400)
+    
+    consent_requests_collection = mongo_db['ConsentRequests']
+    
+    # Match by _id (ObjectId or string) or by request_id, and update in the same round trip;
+    # another user's request is reported as not found
+    updated = consent_requests_collection.find_one_and_update(
+        _owned_by_session(_consent_match(request_id)),
+        {
+            '$set': {
+                'consent_status': status,
+                'updated_at': datetime.utcnow()
+            }
+        },
+        projection={'user_id': 1},
+        return_document=ReturnDocument.AFTER
+    )
+    
+    if not updated:
+        return json_response({
+            "success": False,
+            "message": "Consent request not found"
+        }, 404)
+    
+    cache_delete(consent_requests_key(updated.get('user_id')))
+    publish(consent_events_channel(updated.get('user_id')),
+            json.dumps({'request_id': request_id, 'status': status}))
+    return json_response({
+        "success": True,
+        "message": f"Consent request {status}",
+        "status": status
+    }, 200)
+
+
+@auth_bp.route('/user/consent-events/<user_id>', methods=['GET'])
+def consent_events(user_id):
+    """
+    Server-Sent Events stream of changes to a user's consent requests
+    Each event is {"request_id": "...", "status": "pending" | "approved" | "rejected"};
+    clients reload the list on an event instead of polling consent-requests.
+    Needs the user's session. The stream closes after CONSENT_STREAM_LIFETIME and the
+    browser reconnects. 503 when Redis is not configured or this worker already serves
+    CONSENT_STREAM_MAX streams.
+    """
+    if not sessions_enabled():
+        return json_response({
+            "success": False,
+            "message": "Consent events are unavailable"
+        }, 503)
+    denied = _require_user(user_id)
+    if denied:
+        return denied
+    
+    if not _STREAM_SLOTS.acquire(blocking=False):
+        response = json_response({
+            "success": False,
+            "message": "Too many open event streams"
+        }, 503)
+        response.headers['Retry-After'] = '30'
+        return response
+    
+    pubsub = subscribe(consent_events_channel(user_id))
+    if pubsub is None:
+        _STREAM_SLOTS.release()
+        return json_response({
+            "success": False,
+            "message": "Consent events are unavailable"
+        }, 503)
+    
+    def stream():
+        deadline = time.monotonic() + CONSENT_STREAM_LIFETIME
+        # Reconnect delay (ms) the browser uses once the stream ends
+        yield "retry: 1000\n\n: connected\n\n"
+        for data in iter_messages(pubsub):
+            yield f"data: {data}\n\n" if data is not None else ": keep-alive\n\n"
+            if time.monotonic() >= deadline:
+                break
+    
+    response = current_app.response_class(
+        stream(),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+    # Runs when the server closes the response, even if the stream never started
+    response.call_on_close(pubsub.close)
+    response.call_on_close(_STREAM_SLOTS.release)
+    return response
+
+
+def _consent_match(request_id):
+    """Match a consent request by request_id or by _id (ObjectId or string)"""
+    return {'$or': [{'request_id': request_id}, {'_id': _try_oid(request_id)}]}
+
+
+def _bulk_consent_response(items):
+    """Apply many consent decisions in one unordered bulk_write round trip"""
+    if not isinstance(items, list) or not items:
+        return json_response({
+            "success": False,
+            "message": "items must be a non-empty list"
+        }, 400)
+    
+    for item in items:
+        if not isinstance(item, dict) or not item.get('request_id') or not item.get('status'):
+            return json_response({
                 "success": False,
                 "message": "Request ID and status are required"
-            }), 400
-            
-        if status not in ['approved', 'rejected']:
-            return jsonify({
+            }, 400)
+        if item['status'] not in ['approved', 'rejected']:
+            return json_response({
                 "success": False,
                 "message": "Status must be 'approved' or 'rejected'"
-            }), 400
-        
-        consent_requests_collection = mongo_db['ConsentRequests']
-        
-        # Try to find by ObjectId first, then by string
-        consent_request = None
-        try:
-            consent_request = consent_requests_collection.find_one({'_id': ObjectId(request_id)})
-        except:
-            consent_request = consent_requests_collection.find_one({'_id': request_id})
-        
-        if not consent_request:
-            # Try finding by request_id field
-            consent_request = consent_requests_collection.find_one({'request_id': request_id})
-            
-        if not consent_request:
-            return jsonify({
-                "success": False,
-                "message": "Consent request not found"
-            }), 404
-        
-        # Update consent status
-        update_result = consent_requests_collection.update_one(
-            {'_id': consent_request['_id']},
-            {
-                '$set': {
-                    'consent_status': status,
-                    'updated_at': datetime.utcnow()
-                }
-            }
-        )
-        
-        if update_result.modified_count > 0:
-            return jsonify({
-                "success": True,
-                "message": f"Consent request {status}",
-                "status": status
-            }), 200
-        else:
-            return jsonify({
-                "success": False,
-                "message": "Failed to update consent request"
-            }), 500
-            
-    except Exception as e:
-        return jsonify({
-            "success": False,
-            "message": f"Error processing consent: {str(e)}"
-        }), 500
+            }, 400)
+    
+    consent_requests_collection = mongo_db['ConsentRequests']
+    now = datetime.utcnow()
+    
+    ops = [
+        UpdateOne(_owned_by_session(_consent_match(item['request_id'])),
+                  {'$set': {'consent_status': item['status'], 'updated_at': now}})
+        for item in items
+    ]
+    result = consent_requests_collection.bulk_write(ops, ordered=False)
+    
+    # bulk_write does not report which documents it touched; look them up to drop
+    # the owners' cached request lists and notify their event streams
+    matched = list(consent_requests_collection.find(
+        _owned_by_session({'$or': [cond for item in items for cond in _consent_match(item['request_id'])['$or']]}),
+        {'user_id': 1, 'request_id': 1, 'consent_status': 1}
+    ))
+    cache_delete(*{consent_requests_key(doc.get('user_id')) for doc in matched})
+    for doc in matched:
+        publish(consent_events_channel(doc.get('user_id')),
+                json.dumps({'request_id': doc.get('request_id') or str(doc['_id']),
+                            'status': doc.get('consent_status')}))
+    
+    return json_response({
+        "success": True,
+        "matched": result.matched_count,
+        "modified": result.modified_count
+    }, 200)
 
 
 @auth_bp.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
+    return json_response({
         "status": "healthy",
         "service": "auth",
         "encryption": "AES-256-GCM",
         "compliance": ["GDPR", "CCPA", "SOC2"]
-    }), 200
-
+    }, 200)
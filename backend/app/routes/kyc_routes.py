@@ -2,557 +2,821 @@
 KYC Verification API Routes
 Handles all KYC verification endpoints
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, make_response, current_app
 from datetime import datetime
 import sys
 import os
-
-# Add parent directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import shutil
+import tempfile
+import re
+import time
+import logging
+from collections import OrderedDict
+from functools import wraps
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+import cv2
+import numpy as np
+import threading
+from pymongo import MongoClient, IndexModel, WriteConcern
+from bson.objectid import ObjectId
+from dotenv import load_dotenv
+from werkzeug.exceptions import HTTPException
+
+# Add parent directory to path (once, even if this module is imported under two names)
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if APP_DIR not in sys.path:
+    sys.path.append(APP_DIR)
 
 from services.kyc_verification_service import KYCVerificationService
+from utils.video_store import put_video, put_data_uri
+from utils.image_codec import decode_b64_image
 
 kyc_bp = Blueprint('kyc', __name__, url_prefix='/api/kyc')
+logger = logging.getLogger(__name__)
+
+# Load .env from project root (once, at import)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(APP_DIR))
+load_dotenv(os.path.join(PROJECT_ROOT, '.env'))
+
+# One client (and connection pool) shared by every request; connect=False defers
+# server discovery to the first query so importing the blueprint never blocks
+MONGO_URI = os.getenv("MONGO_URL") or os.getenv("MONGODB_URI") or os.getenv("MONGO_URI", "mongodb://localhost:27017/")
+_MONGO = MongoClient(MONGO_URI, maxPoolSize=50, connect=False)
+_DB = _MONGO["aegis_kyc"]
+# Video check records are written in the background, unacknowledged (w=0): the
+# response never depends on the insert
+_VIDEO_RESULTS = _DB.get_collection("VideoVerification", write_concern=WriteConcern(w=0))
+
+
+def _ensure_indexes():
+    """Indexes behind the status/credential lookups (latest-first per user, documents per session)"""
+    try:
+        _DB["KYCVerificationRequests"].create_indexes([IndexModel([("user_id", 1), ("created_at", -1)])])
+        _DB["VerificationTimeline"].create_indexes([IndexModel([("user_id", 1), ("timestamp", -1)])])
+        _DB["KYCCredentials"].create_indexes([IndexModel([("user_id", 1), ("issued_at", -1)])])
+        _MONGO["AegisKYC"]["UploadedDocuments"].create_indexes([IndexModel([("verification_id", 1)])])
+    except Exception as e:
+        logger.warning("Could not create KYC indexes: %s", e)
+
+
+# In the background so an unreachable DB does not stall app startup
+threading.Thread(target=_ensure_indexes, daemon=True).start()
+
+# Model inference, OpenCV decoding and OCR run on a shared pool so a stuck call is
+# bounded by KYC_TASK_TIMEOUT instead of holding the request thread indefinitely
+KYC_TASK_TIMEOUT = float(os.getenv('KYC_TASK_TIMEOUT', 30))
+_EXEC = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) + 4), thread_name_prefix="kyc")
+
+# Frames scored per video for deepfake detection
+VIDEO_SAMPLE_FRAMES = 5
+
+
+# Malformed ids (scanners, typos) are rejected with a regex instead of an InvalidId
+# exception and a wasted Mongo round trip
+_OBJECT_ID_RE = re.compile(r'[0-9a-fA-F]{24}\Z')
+
+
+def _to_oid(value):
+    """ObjectId for a 24-hex-digit string, None for anything else"""
+    if isinstance(value, str) and _OBJECT_ID_RE.match(value):
+        return ObjectId(value)
+    return None
+
+
+def _invalid_id(field):
+    return jsonify({"success": False, "message": f"Invalid {field}"}), 400
+
+
+# Model wrappers are built once per process and shared by all requests
+_MODELS = {}
+_MODELS_LOCK = threading.Lock()
+# mediapipe graphs are not safe for concurrent use, so face analysis is serialized
+_FACE_ANALYZER_LOCK = threading.Lock()
+
+
+def _get_model(name, factory):
+    """Return the cached instance for name, building it with factory() on first use"""
+    model = _MODELS.get(name)
+    if model is None:
+        with _MODELS_LOCK:
+            model = _MODELS.get(name)
+            if model is None:
+                model = _MODELS[name] = factory()
+    return model
+
+
+def _new_deep_model():
+    from models.deepfake_model import DeepfakeModel
+    return DeepfakeModel()
+
+
+def _new_face_analyzer():
+    from utils.real_face_analyzer import RealFaceAnalyzer
+    return RealFaceAnalyzer()
+
+
+def _new_ocr_validator():
+    from utils.real_ocr_validator import RealOCRValidator
+    return RealOCRValidator()
+
+
+# document_type -> RealOCRValidator method for /extract-document-text (others get generic OCR).
+# Matched per '_'-separated token, so the suffixed ids used elsewhere (pan_card,
+# aadhaar_front, indian_passport, ...) reach the same extractor as the bare names
+_OCR_EXTRACTORS = {
+    'pan': 'extract_pan_details',
+    'aadhaar': 'extract_aadhaar_details',
+    'aadhar': 'extract_aadhaar_details',
+    'passport': 'extract_passport_details',
+}
+
+
+def _ocr_extractor(doc_type):
+    """RealOCRValidator method name for a document type, or None for generic OCR"""
+    return next((_OCR_EXTRACTORS[t] for t in doc_type.split('_') if t in _OCR_EXTRACTORS), None)
+
+
+def _face_analysis(method, *args):
+    """Call a RealFaceAnalyzer method on the shared instance, one caller at a time"""
+    analyzer = _get_model('face_analyzer', _new_face_analyzer)
+    with _FACE_ANALYZER_LOCK:
+        return getattr(analyzer, method)(*args)
+
+
+def _offload(fn, *args):
+    """Run blocking verification work on the shared pool and wait for its result"""
+    return _EXEC.submit(fn, *args).result(timeout=KYC_TASK_TIMEOUT)
+
+
+def _insert_in_background(collection, document):
+    """Queue an insert on the shared pool; failures are logged, never raised"""
+    def insert():
+        try:
+            collection.insert_one(document)
+        except Exception:
+            logger.exception("Background insert into %s failed", collection.name)
+    _EXEC.submit(insert)
+
+
+def _timeout_response():
+    return jsonify({"success": False, "message": "Verification timed out, please retry"}), 504
+
+
+# Polled GET endpoints (status, user-status, credential) serve their last 200 body
+# for STATUS_CACHE_TTL seconds; the step endpoints drop the affected entries.
+# The cache is per process: a step handled by one gunicorn worker only clears that
+# worker's entries, so a poll landing on another worker can see the previous status
+# for up to STATUS_CACHE_TTL seconds. That lag is accepted for polling; the step
+# responses themselves are always fresh. (A Redis round trip would cost about as
+# much as the indexed find_one the cache saves.)
+STATUS_CACHE_TTL = 5
+STATUS_CACHE_SIZE = 10000
+
+# (endpoint, id) -> (expires_at, JSON body); ('owner', verification_id) -> user_id
+# links a verification to the user-level entries built from it
+_STATUS_CACHE = OrderedDict()
+_STATUS_CACHE_LOCK = threading.Lock()
+
+
+def _status_cache_get(key):
+    now = time.monotonic()
+    with _STATUS_CACHE_LOCK:
+        entry = _STATUS_CACHE.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= now:
+            del _STATUS_CACHE[key]
+            return None
+        _STATUS_CACHE.move_to_end(key)
+        return entry[1]
+
+
+def _status_cache_put(*items):
+    expires = time.monotonic() + STATUS_CACHE_TTL
+    with _STATUS_CACHE_LOCK:
+        for key, value in items:
+            _STATUS_CACHE[key] = (expires, value)
+            _STATUS_CACHE.move_to_end(key)
+        while len(_STATUS_CACHE) > STATUS_CACHE_SIZE:
+            _STATUS_CACHE.popitem(last=False)
+
+
+def _invalidate_status(verification_id=None, user_id=None):
+    """Drop cached status bodies for a verification and/or user"""
+    with _STATUS_CACHE_LOCK:
+        if verification_id:
+            _STATUS_CACHE.pop(('status', verification_id), None)
+            _STATUS_CACHE.pop(('verification-status', verification_id), None)
+            owner = _STATUS_CACHE.pop(('owner', verification_id), None)
+            if owner is not None:
+                _STATUS_CACHE.pop(('user-status', owner[1]), None)
+                _STATUS_CACHE.pop(('credential', owner[1]), None)
+        if user_id:
+            _STATUS_CACHE.pop(('user-status', user_id), None)
+            _STATUS_CACHE.pop(('credential', user_id), None)
+
+
+def _cached_status(endpoint, per_user=False):
+    """
+    Serve a GET view from the status cache. Only 200 responses are stored; for
+    per_user views the verification_id in the body is recorded so that step
+    endpoints for that verification also invalidate the user's entry.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(**view_args):
+            key_id = next(iter(view_args.values()))
+            body = _status_cache_get((endpoint, key_id))
+            if body is not None:
+                return current_app.response_class(body, mimetype='application/json')
+            response = make_response(view(**view_args))
+            if response.status_code == 200:
+                items = [((endpoint, key_id), response.get_data())]
+                if per_user:
+                    verification_id = (response.get_json(silent=True) or {}).get('verification_id')
+                    if verification_id:
+                        items.append((('owner', verification_id), key_id))
+                _status_cache_put(*items)
+            return response
+        return wrapper
+    return decorator
+
+
+_FORM_MIMETYPES = ('multipart/form-data', 'application/x-www-form-urlencoded')
+
+
+def _request_data():
+    """The request body: the form for form posts (with or without file parts), JSON otherwise"""
+    if request.mimetype in _FORM_MIMETYPES:
+        return request.form
+    return request.get_json(silent=True)
+
+
+def _invalidates_status(view):
+    """Clear the cached status of the request's verification_id / user_id after the view runs"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            return view(*args, **kwargs)
+        finally:
+            data = _request_data()
+            if hasattr(data, 'get'):
+                _invalidate_status(data.get('verification_id'), data.get('user_id'))
+    return wrapper
+
+
+def _json_endpoint(*required):
+    """
+    Parse the request body once (the form for form posts, JSON otherwise),
+    answer 400 if it is not an object or a required field is empty, and pass it to
+    the view as `data`. Exceptions are left to the blueprint's error handlers.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            data = _request_data()
+            if not isinstance(data, dict):
+                return jsonify({"success": False, "message": "A JSON object body is required"}), 400
+            for field in required:
+                if not data.get(field):
+                    return jsonify({"success": False, "message": f"{field} is required"}), 400
+            return view(data, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@kyc_bp.errorhandler(FuturesTimeoutError)
+def _task_timeout(e):
+    return _timeout_response()
+
+
+@kyc_bp.errorhandler(Exception)
+def _server_error(e):
+    """Single 500 handler for the KYC views; HTTP errors (400, 404, ...) keep their status"""
+    if isinstance(e, HTTPException):
+        return e
+    logger.exception("kyc error")
+    return jsonify({"success": False, "message": f"Error: {str(e)}"}), 500
+
+
+def _frame_probability(deep_model, frame_b64):
+    """Decode one base64 frame and return the deepfake probability (None if undecodable)"""
+    img = KYCVerificationService._b64_to_cv2(frame_b64)
+    if img is None:
+        return None
+    return float(deep_model.predict(img).get('probability', 0.0))
+
+
+def _sample_video_frames(path, count):
+    """Decode up to `count` evenly spaced frames of the video file at path"""
+    cap = cv2.VideoCapture(path)
+    try:
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        frames = []
+        if total <= 0:
+            return frames
+        for i in np.linspace(0, total - 1, num=min(count, total), dtype=int):
+            cap.set(cv2.CAP_PROP_POS_FRAMES, int(i))
+            ok, frame = cap.read()
+            if ok:
+                frames.append(frame)
+        return frames
+    finally:
+        cap.release()
+
+
+def _store_uploaded_video(db, upload, sample=True):
+    """
+    Store a multipart video upload in GridFS and decode the sample frames from it
+    (none when sample is False). Returns (file_id, frames).
+    """
+    mimetype = upload.mimetype or 'video/mp4'
+    path = getattr(upload.stream, 'name', None)
+    if not sample:
+        return put_video(db, upload.stream, mimetype, upload.filename), []
+    if isinstance(path, str) and os.path.isfile(path):
+        # UploadRequest already spooled the part to a named temp file
+        upload.stream.flush()
+        frames = _sample_video_frames(path, VIDEO_SAMPLE_FRAMES)
+        upload.stream.seek(0)
+        return put_video(db, upload.stream, mimetype, upload.filename), frames
+    # Small (in-memory) uploads: write out in 1MB chunks for OpenCV
+    suffix = os.path.splitext(upload.filename or '')[1] or '.mp4'
+    with tempfile.NamedTemporaryFile(suffix=suffix) as tmp:
+        shutil.copyfileobj(upload.stream, tmp, length=1 << 20)
+        tmp.flush()
+        frames = _sample_video_frames(tmp.name, VIDEO_SAMPLE_FRAMES)
+        tmp.seek(0)
+        file_id = put_video(db, tmp, mimetype, upload.filename)
+    return file_id, frames
+
+
+def _frame_probabilities(deep_model, frames_b64):
+    """
+    Deepfake probabilities for the decodable frames: frames are decoded in parallel,
+    then scored with one predict_batch call (per-frame predict when a model lacks it)
+    """
+    if not hasattr(deep_model, 'predict_batch'):
+        futures = [_EXEC.submit(_frame_probability, deep_model, f) for f in frames_b64]
+        probs = [future.result() for future in as_completed(futures, timeout=KYC_TASK_TIMEOUT)]
+        return [p for p in probs if p is not None]
+    futures = [_EXEC.submit(KYCVerificationService._b64_to_cv2, f) for f in frames_b64]
+    imgs = [img for img in (future.result() for future in as_completed(futures, timeout=KYC_TASK_TIMEOUT))
+            if img is not None]
+    if not imgs:
+        return []
+    return _offload(deep_model.predict_batch, imgs).tolist()
 
 
 @kyc_bp.route('/initiate', methods=['POST'])
-def initiate_verification():
+@_invalidates_status
+@_json_endpoint('user_id')
+def initiate_verification(data):
     """
     Initiate KYC verification process
     Expected: { user_id, is_rekyc (optional) }
     """
-    try:
-        data = request.get_json()
-        user_id = data.get('user_id')
-        is_rekyc = data.get('is_rekyc', False)
-        
-        if not user_id:
-            return jsonify({"success": False, "message": "user_id is required"}), 400
-        
-        # Get device info
-        device_info = {
-            "device_type": "web",
-            "device_id": request.headers.get('X-Device-ID', ''),
-            "os_version": request.headers.get('User-Agent', ''),
-            "browser": request.headers.get('User-Agent', ''),
-            "is_rooted": data.get('device_info', {}).get('is_rooted', False),
-            "is_emulator": data.get('device_info', {}).get('is_emulator', False),
-            "browser_integrity": True
-        }
-        
-        ip_address = request.headers.get('X-Forwarded-For', request.remote_addr)
-        
-        result = KYCVerificationService.initiate_verification(user_id, device_info, ip_address, is_rekyc)
-        
-        if result["success"]:
-            return jsonify(result), 201
-        else:
-            return jsonify(result), 400
-            
-    except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {str(e)}"}), 500
+    user_id = data.get('user_id')
+    is_rekyc = data.get('is_rekyc', False)
+
+    # Get device info
+    device_info = {
+        "device_type": "web",
+        "device_id": request.headers.get('X-Device-ID', ''),
+        "os_version": request.headers.get('User-Agent', ''),
+        "browser": request.headers.get('User-Agent', ''),
+        "is_rooted": data.get('device_info', {}).get('is_rooted', False),
+        "is_emulator": data.get('device_info', {}).get('is_emulator', False),
+        "browser_integrity": True
+    }
+
+    ip_address = request.remote_addr
+
+    result = KYCVerificationService.initiate_verification(user_id, device_info, ip_address, is_rekyc)
+
+    if result["success"]:
+        return jsonify(result), 201
+    else:
+        return jsonify(result), 400
 
 
 @kyc_bp.route('/pre-check', methods=['POST'])
-def pre_verification_check():
+@_invalidates_status
+@_json_endpoint('verification_id')
+def pre_verification_check(data):
     """
     STEP 0: Perform pre-verification checks
     Expected: { verification_id, behavioral_data }
     """
-    try:
-        data = request.get_json()
-        verification_id = data.get('verification_id')
-        behavioral_data = data.get('behavioral_data', {})
-        
-        if not verification_id:
-            return jsonify({"success": False, "message": "verification_id is required"}), 400
-        
-        device_info = {
-            "device_type": "web",
-            "device_id": request.headers.get('X-Device-ID', ''),
-            "os_version": request.headers.get('User-Agent', ''),
-            "browser": request.headers.get('User-Agent', ''),
-            "is_rooted": behavioral_data.get('is_rooted', False),
-            "is_emulator": behavioral_data.get('is_emulator', False),
-            "vpn_detected": behavioral_data.get('vpn_detected', False)
-        }
-        
-        ip_address = request.headers.get('X-Forwarded-For', request.remote_addr)
-        
-        result = KYCVerificationService.perform_pre_verification_checks(
-            verification_id, device_info, ip_address, behavioral_data
-        )
-        
-        return jsonify(result), 200 if result["success"] else 400
-        
-    except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {str(e)}"}), 500
+    verification_id = data.get('verification_id')
+    behavioral_data = data.get('behavioral_data', {})
+
+    device_info = {
+        "device_type": "web",
+        "device_id": request.headers.get('X-Device-ID', ''),
+        "os_version": request.headers.get('User-Agent', ''),
+        "browser": request.headers.get('User-Agent', ''),
+        "is_rooted": behavioral_data.get('is_rooted', False),
+        "is_emulator": behavioral_data.get('is_emulator', False),
+        "vpn_detected": behavioral_data.get('vpn_detected', False)
+    }
+
+    ip_address = request.remote_addr
+
+    result = KYCVerificationService.perform_pre_verification_checks(
+        verification_id, device_info, ip_address, behavioral_data
+    )
+
+    return jsonify(result), 200 if result["success"] else 400
 
 
 @kyc_bp.route('/upload-document', methods=['POST'])
-def upload_document():
+@_invalidates_status
+@_json_endpoint('verification_id')
+def upload_document(data):
     """
     STEP 1: Upload identity document
     Expected: { verification_id, document_type, front_image, back_image, ... }
     """
-    try:
-        data = request.get_json()
-        verification_id = data.get('verification_id')
-        
-        if not verification_id:
-            return jsonify({"success": False, "message": "verification_id is required"}), 400
-        
-        document_data = {
-            "document_type": data.get('document_type'),
-            "upload_method": data.get('upload_method', 'file_upload'),
-            "front_image": data.get('front_image', ''),
-            "back_image": data.get('back_image', ''),
-            "file_size": data.get('file_size', 0),
-            "format": data.get('format', 'jpeg'),
-            "resolution": data.get('resolution', ''),
-            "digilocker_data": data.get('digilocker_data', None)
-        }
-        
-        result = KYCVerificationService.upload_document(verification_id, document_data)
-        
-        if result["success"]:
-            return jsonify(result), 201
-        else:
-            return jsonify(result), 400
-            
-    except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {str(e)}"}), 500
+    verification_id = data.get('verification_id')
+
+    document_data = {
+        "document_type": data.get('document_type'),
+        "upload_method": data.get('upload_method', 'file_upload'),
+        "front_image": data.get('front_image', ''),
+        "back_image": data.get('back_image', ''),
+        "file_size": data.get('file_size', 0),
+        "format": data.get('format', 'jpeg'),
+        "resolution": data.get('resolution', ''),
+        "digilocker_data": data.get('digilocker_data', None)
+    }
+
+    result = KYCVerificationService.upload_document(verification_id, document_data)
+
+    if result["success"]:
+        return jsonify(result), 201
+    else:
+        return jsonify(result), 400
 
 
 @kyc_bp.route('/analyze-document', methods=['POST'])
-def analyze_document():
+@_json_endpoint('document_id')
+def analyze_document(data):
     """
     STEP 2: Analyze document authenticity
     Expected: { document_id }
     """
-    try:
-        data = request.get_json()
-        document_id = data.get('document_id')
-        
-        if not document_id:
-            return jsonify({"success": False, "message": "document_id is required"}), 400
-        
-        result = KYCVerificationService.analyze_document(document_id)
-        
-        return jsonify(result), 200 if result["success"] else 400
-        
-    except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {str(e)}"}), 500
+    document_id = data.get('document_id')
+
+    result = _offload(KYCVerificationService.analyze_document, document_id)
+
+    return jsonify(result), 200 if result["success"] else 400
 
 
 @kyc_bp.route('/verify-video', methods=['POST'])
-def verify_video():
+@_invalidates_status
+@_json_endpoint('verification_id')
+def verify_video(data):
     """
     STEP 5: Video verification
-    Expected: { verification_id, video_data }
-    """
-    try:
-        data = request.get_json()
-        verification_id = data.get('verification_id')
-        
-        print(f"\n=== VERIFY VIDEO REQUEST ===")
-        print(f"  - verification_id: {verification_id}")
-        print(f"  - video_data length: {len(data.get('video_data', ''))}")
-        
-        if not verification_id:
-            return jsonify({"success": False, "message": "verification_id is required"}), 400
-        
-        # Get verification request to find user_id
-        from pymongo import MongoClient
-        from bson.objectid import ObjectId
-        import os
-        from dotenv import load_dotenv
-        
-        load_dotenv()
-        MONGO_URI = os.getenv("MONGO_URL") or os.getenv("MONGODB_URI")
-        mongo_client = MongoClient(MONGO_URI)
-        db = mongo_client["aegis_kyc"]
-        
-        verification = db["KYCVerificationRequests"].find_one({"_id": ObjectId(verification_id)})
-        if not verification:
-            return jsonify({"success": False, "message": "Verification not found"}), 404
-        
-        # Video verification: try using model-backed deepfake detection when available
-        # Accept either `video_frames` (list of base64 frames) or `video_data` (base64 video blob)
-        video_frames = data.get('video_frames', [])
-        video_data = data.get('video_data', '')
-
-        lipsync_score = 92.5
-        quality_score = 88.3
-        overall_score = 92.5
-        deepfake_score = 0.0
+    Expected: multipart/form-data with verification_id and a `video` file,
+    or JSON { verification_id, video_frames } / { verification_id, video_data } (base64)
+    """
+    upload = request.files.get('video')
+    verification_id = data.get('verification_id')
+    # Accept either `video_frames` (list of base64 frames) or `video_data` (base64 video blob)
+    video_frames = data.get('video_frames') or []
+    video_data = data.get('video_data') or ''
+    frames_count = len(video_frames) if isinstance(video_frames, (list, tuple)) else 0
+
+    if logger.isEnabledFor(logging.DEBUG):
+        if upload is not None:
+            logger.debug("verify_video id=%s upload=%s (%s)", verification_id, upload.filename, upload.mimetype)
+        else:
+            logger.debug("verify_video id=%s frames=%d video_data_len=%d", verification_id, frames_count,
+                         len(video_data) if isinstance(video_data, str) else 0)
+
+    verification_oid = _to_oid(verification_id)
+    if verification_oid is None:
+        return _invalid_id('verification_id')
+
+    # Get verification request to find user_id
+    db = _DB
+
+    verification = db["KYCVerificationRequests"].find_one({"_id": verification_oid})
+    if not verification:
+        return jsonify({"success": False, "message": "Verification not found"}), 404
+
+    # Video verification: try using model-backed deepfake detection when available
+    # Uploaded video goes to GridFS; a legacy base64 payload is moved there too so
+    # the verification record only keeps a file id
+    video_file_id, video_content_type, upload_frames = None, None, []
+    if upload is not None:
+        # The capture page uploads its single still frame as `video`; like the
+        # legacy `video_data` payload it is stored but not frame-scored
+        still_image = (upload.mimetype or '').startswith('image/')
+        video_file_id, upload_frames = _offload(_store_uploaded_video, db, upload, not still_image)
+        video_content_type = upload.mimetype or 'video/mp4'
+    elif isinstance(video_data, str) and video_data:
+        video_file_id, video_content_type = put_data_uri(db, video_data)
+
+    lipsync_score = 92.5
+    quality_score = 88.3
+    overall_score = 92.5
+    deepfake_score = 0.0
 
-        try:
-            # Try loading model wrappers if available
-            from models.deepfake_model import DeepfakeModel
-            from models.face_matcher import FaceMatcher
-            model_available = True
-            deep_model = DeepfakeModel()
-            fm = FaceMatcher()
-        except Exception:
-            model_available = False
-            deep_model = None
-            fm = None
+    try:
+        # Model wrapper, if available
+        deep_model = _get_model('deepfake', _new_deep_model)
+        model_available = True
+    except Exception:
+        model_available = False
+        deep_model = None
 
-        try:
-            probs = []
-            # If frames are provided, run model on sampled frames
-            if isinstance(video_frames, (list, tuple)) and len(video_frames) > 0 and model_available:
-                for i, f in enumerate(video_frames):
-                    if i % max(1, int(len(video_frames)/5)) != 0 and i > 4:
-                        # sample up to ~5 frames
-                        continue
-                    img = KYCVerificationService._b64_to_cv2(f)
-                    if img is None:
-                        continue
-                    out = deep_model.predict(img)
-                    prob = float(out.get('probability', 0.0))
-                    probs.append(prob)
-            elif video_data and model_available:
-                # If a single video blob is provided, attempt to decode frames with OpenCV
-                try:
-                    import cv2, numpy as np, base64
-                    b64data = video_data.split(',')[-1] if ',' in video_data else video_data
-                    decoded = base64.b64decode(b64data)
-                    arr = np.frombuffer(decoded, np.uint8)
-                    cap = cv2.imdecode(arr, cv2.IMREAD_COLOR)
-                    # If we cannot decode video blob to frames easily, skip to naive path
-                except Exception:
-                    pass
-
-            if len(probs) > 0:
-                avg = sum(probs) / len(probs)
-                deepfake_score = round(avg * 100.0, 2)
-            else:
-                # Fallback heuristic when no model or frames: use RealFaceAnalyzer-based proxy
-                try:
-                    from ..utils.real_face_analyzer import RealFaceAnalyzer
-                    analyzer = RealFaceAnalyzer()
-                    selfie = None
-                    if isinstance(video_frames, (list,tuple)) and len(video_frames)>0:
-                        selfie = video_frames[0]
-                    elif isinstance(video_data, str) and video_data:
-                        selfie = ''
-                    if selfie:
-                        analysis = analyzer.analyze_selfie(selfie)
-                        overall = analysis.get('overall_score', 0) if analysis.get('overall_score') is not None else 0
-                        deepfake_score = round(max(0.0, min(100.0, (100 - overall))), 2)
-                    else:
-                        deepfake_score = 0.0
-                except Exception:
+    try:
+        probs = []
+        # If frames are provided, run model on sampled frames
+        if upload_frames and model_available:
+            probs = _offload(deep_model.predict_batch, upload_frames).tolist()
+        elif isinstance(video_frames, (list, tuple)) and len(video_frames) > 0 and model_available:
+            # Sample up to VIDEO_SAMPLE_FRAMES frames spread evenly across the clip
+            idxs = np.linspace(0, len(video_frames) - 1, num=min(VIDEO_SAMPLE_FRAMES, len(video_frames)), dtype=int)
+            probs = _frame_probabilities(deep_model, [video_frames[int(i)] for i in idxs])
+
+        if len(probs) > 0:
+            avg = sum(probs) / len(probs)
+            deepfake_score = round(avg * 100.0, 2)
+        else:
+            # Fallback heuristic when no model or frames: use RealFaceAnalyzer-based proxy
+            try:
+                selfie = None
+                if isinstance(video_frames, (list,tuple)) and len(video_frames)>0:
+                    selfie = video_frames[0]
+                elif isinstance(video_data, str) and video_data:
+                    selfie = ''
+                if selfie:
+                    analysis = _offload(_face_analysis, 'analyze_selfie', selfie)
+                    overall = analysis.get('overall_score', 0) if analysis.get('overall_score') is not None else 0
+                    deepfake_score = round(max(0.0, min(100.0, (100 - overall))), 2)
+                else:
                     deepfake_score = 0.0
+            except FuturesTimeoutError:
+                raise
+            except Exception:
+                deepfake_score = 0.0
 
-        except Exception:
-            deepfake_score = 0.0
-
-        # Store video verification result with video data (or frames)
-        video_verification_record = {
-            "user_id": verification["user_id"],
-            "verification_id": verification_id,
-            "timestamp": datetime.utcnow(),
-            "video_data": video_data or None,
-            "video_frames_count": len(video_frames) if isinstance(video_frames, (list,tuple)) else 0,
-            "lipsync_score": lipsync_score,
-            "deepfake_score": deepfake_score,
-            "quality_score": quality_score,
-            "overall_score": overall_score,
-            "verification_passed": deepfake_score < 50.0
-        }
+    except FuturesTimeoutError:
+        # Never record a timed-out check as a pass
+        raise
+    except Exception:
+        deepfake_score = 0.0
 
-        try:
-            result = db["VideoVerification"].insert_one(video_verification_record)
-        except Exception:
-            pass
+    # Store video verification result with video data (or frames)
+    video_verification_record = {
+        "user_id": verification["user_id"],
+        "verification_id": verification_id,
+        "timestamp": datetime.utcnow(),
+        "video_file_id": video_file_id,
+        "video_content_type": video_content_type,
+        "video_frames_count": frames_count,
+        "lipsync_score": lipsync_score,
+        "deepfake_score": deepfake_score,
+        "quality_score": quality_score,
+        "overall_score": overall_score,
+        "verification_passed": deepfake_score < 50.0
+    }
 
-        verification_result = {
-            "success": True,
-            "lipsync_score": lipsync_score,
-            "deepfake_score": deepfake_score,
-            "quality_score": quality_score,
-            "overall_score": overall_score,
-            "verification_passed": deepfake_score < 50.0,
-            "message": "Video verification completed"
-        }
+    _insert_in_background(_VIDEO_RESULTS, video_verification_record)
 
-        return jsonify(verification_result), 200
-        
-    except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {str(e)}"}), 500
+    verification_result = {
+        "success": True,
+        "lipsync_score": lipsync_score,
+        "deepfake_score": deepfake_score,
+        "quality_score": quality_score,
+        "overall_score": overall_score,
+        "verification_passed": deepfake_score < 50.0,
+        "message": "Video verification completed"
+    }
+
+    return jsonify(verification_result), 200
 
 
 @kyc_bp.route('/verify-face', methods=['POST'])
-def verify_face():
+@_invalidates_status
+@_json_endpoint('verification_id')
+def verify_face(data):
     """
     STEP 3: Face verification
     Expected: { verification_id, face_image, video_frames }
     """
-    try:
-        data = request.get_json()
-        verification_id = data.get('verification_id')
-        
-        print(f"\n=== VERIFY FACE REQUEST ===")
-        print(f"  - verification_id: {verification_id}")
-        print(f"  - face_image length: {len(data.get('face_image', ''))}")
-        print(f"  - video_frames count: {len(data.get('video_frames', []))}")
-        
-        if not verification_id:
-            return jsonify({"success": False, "message": "verification_id is required"}), 400
-        
-        face_data = {
-            "face_image": data.get('face_image', ''),
-            "video_frames": data.get('video_frames', []),
-            "depth_data": data.get('depth_data', {}),
-            "micro_gestures": data.get('micro_gestures', {})
-        }
-        
-        result = KYCVerificationService.verify_face(verification_id, face_data)
-        print(f"  - Result: {result.get('success', False)}")
-        
-        return jsonify(result), 200 if result["success"] else 400
-        
-    except Exception as e:
-        print(f"  - ERROR: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({"success": False, "message": f"Error: {str(e)}"}), 500
+    verification_id = data.get('verification_id')
+
+    face_data = {
+        "face_image": data.get('face_image', ''),
+        "video_frames": data.get('video_frames', []),
+        "depth_data": data.get('depth_data', {}),
+        "micro_gestures": data.get('micro_gestures', {})
+    }
+
+    result = _offload(KYCVerificationService.verify_face, verification_id, face_data)
+
+    return jsonify(result), 200 if result["success"] else 400
 
 
 @kyc_bp.route('/aml-screening', methods=['POST'])
-def aml_screening():
+@_invalidates_status
+@_json_endpoint('verification_id')
+def aml_screening(data):
     """
     STEP 6: AML and fraud screening
     Expected: { verification_id }
     """
-    try:
-        data = request.get_json()
-        verification_id = data.get('verification_id')
-        
-        if not verification_id:
-            return jsonify({"success": False, "message": "verification_id is required"}), 400
-        
-        result = KYCVerificationService.perform_aml_screening(verification_id)
-        
-        return jsonify(result), 200 if result["success"] else 400
-        
-    except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {str(e)}"}), 500
+    verification_id = data.get('verification_id')
+
+    result = KYCVerificationService.perform_aml_screening(verification_id)
+
+    return jsonify(result), 200 if result["success"] else 400
 
 
 @kyc_bp.route('/risk-score', methods=['POST'])
-def calculate_risk_score():
+@_invalidates_status
+@_json_endpoint('verification_id')
+def calculate_risk_score(data):
     """
     STEP 7: Calculate final risk score
     Expected: { verification_id }
     """
-    try:
-        data = request.get_json()
-        verification_id = data.get('verification_id')
-        
-        if not verification_id:
-            return jsonify({"success": False, "message": "verification_id is required"}), 400
-        
-        result = KYCVerificationService.calculate_final_risk_score(verification_id)
-        
-        return jsonify(result), 200 if result["success"] else 400
-        
-    except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {str(e)}"}), 500
+    verification_id = data.get('verification_id')
+
+    result = KYCVerificationService.calculate_final_risk_score(verification_id)
+
+    return jsonify(result), 200 if result["success"] else 400
 
 
 @kyc_bp.route('/issue-credential', methods=['POST'])
-def issue_credential():
+@_invalidates_status
+@_json_endpoint('verification_id')
+def issue_credential(data):
     """
     STEP 9: Issue KYC credential
     Expected: { verification_id }
     """
-    try:
-        data = request.get_json()
-        verification_id = data.get('verification_id')
-        
-        if not verification_id:
-            return jsonify({"success": False, "message": "verification_id is required"}), 400
-        
-        result = KYCVerificationService.issue_kyc_credential(verification_id)
-        
-        return jsonify(result), 200 if result["success"] else 400
-        
-    except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {str(e)}"}), 500
+    verification_id = data.get('verification_id')
+
+    result = KYCVerificationService.issue_kyc_credential(verification_id)
+
+    return jsonify(result), 200 if result["success"] else 400
 
 
 @kyc_bp.route('/status/<verification_id>', methods=['GET'])
+@_cached_status('status')
 def get_status(verification_id):
     """
     Get verification status
     """
-    try:
-        result = KYCVerificationService.get_verification_status(verification_id)
-        
-        return jsonify(result), 200 if result["success"] else 404
-        
-    except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {str(e)}"}), 500
+    if _to_oid(verification_id) is None:
+        return _invalid_id('verification_id')
+
+    result = KYCVerificationService.get_verification_status(verification_id)
+
+    return jsonify(result), 200 if result["success"] else 404
 
 
 @kyc_bp.route('/verification-status/<verification_id>', methods=['GET'])
+@_cached_status('verification-status')
 def get_verification_status_detailed(verification_id):
     """
     Get detailed verification status with uploaded documents
     """
-    try:
-        from pymongo import MongoClient
-        from bson.objectid import ObjectId
-        import os
-        from dotenv import load_dotenv
-        
-        # Load .env
-        PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-        dotenv_path = os.path.join(PROJECT_ROOT, '.env')
-        load_dotenv(dotenv_path)
-        
-        # MongoDB connection
-        client = MongoClient(os.getenv('MONGO_URI', 'mongodb://localhost:27017/'))
-        db = client['AegisKYC']
-        
-        # Get verification session
-        verification = db.VerificationSessions.find_one({"_id": ObjectId(verification_id)})
-        
-        if not verification:
-            return jsonify({"success": False, "message": "Verification session not found"}), 404
-        
-        # Get uploaded documents
-        documents = list(db.UploadedDocuments.find({"verification_id": verification_id}))
-        
-        uploaded_docs = []
-        for doc in documents:
-            uploaded_docs.append({
-                "id": str(doc["_id"]),
-                "document_type": doc.get("document_type"),
-                "category": doc.get("category", "unknown"),
-                "upload_timestamp": doc.get("upload_timestamp"),
-                "status": doc.get("status", "pending")
-            })
-        
-        return jsonify({
-            "success": True,
-            "verification_id": verification_id,
-            "status": verification.get("status"),
-            "uploaded_documents": uploaded_docs,
-            "documents_count": len(uploaded_docs)
-        }), 200
-        
-    except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {str(e)}"}), 500
+    verification_oid = _to_oid(verification_id)
+    if verification_oid is None:
+        return _invalid_id('verification_id')
+
+    db = _MONGO['AegisKYC']
+
+    # Get verification session
+    verification = db.VerificationSessions.find_one({"_id": verification_oid}, {"status": 1})
+
+    if not verification:
+        return jsonify({"success": False, "message": "Verification session not found"}), 404
+
+    # Get uploaded documents
+    documents = list(db.UploadedDocuments.find(
+        {"verification_id": verification_id},
+        {"document_type": 1, "category": 1, "upload_timestamp": 1, "status": 1}
+    ))
+
+    uploaded_docs = []
+    for doc in documents:
+        uploaded_docs.append({
+            "id": str(doc["_id"]),
+            "document_type": doc.get("document_type"),
+            "category": doc.get("category", "unknown"),
+            "upload_timestamp": doc.get("upload_timestamp"),
+            "status": doc.get("status", "pending")
+        })
+
+    return jsonify({
+        "success": True,
+        "verification_id": verification_id,
+        "status": verification.get("status"),
+        "uploaded_documents": uploaded_docs,
+        "documents_count": len(uploaded_docs)
+    }), 200
 
 
 @kyc_bp.route('/user-status/<user_id>', methods=['GET'])
+@_cached_status('user-status', per_user=True)
 def get_user_kyc_status(user_id):
     """
     Get user's KYC verification status
     """
-    try:
-        from pymongo import MongoClient
-        from bson.objectid import ObjectId
-        import os
-        from dotenv import load_dotenv
-        
-        # Load .env
-        PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-        dotenv_path = os.path.join(PROJECT_ROOT, '.env')
-        load_dotenv(dotenv_path)
-        
-        MONGO_URI = os.getenv("MONGO_URL") or os.getenv("MONGODB_URI")
-        client = MongoClient(MONGO_URI)
-        db = client["aegis_kyc"]
-        
-        # Get user
-        user = db["Users"].find_one({"_id": ObjectId(user_id)})
-        if not user:
-            return jsonify({"success": False, "message": "User not found"}), 404
-        
-        # Get latest verification request
-        verification = db["KYCVerificationRequests"].find_one(
-            {"user_id": user_id},
-            sort=[("created_at", -1)]
-        )
-        
-        # Get timeline
-        timeline = list(db["VerificationTimeline"].find(
-            {"user_id": user_id},
-            sort=[("timestamp", -1)],
-            limit=10
-        ))
-        
-        return jsonify({
-            "success": True,
-            "kyc_status": user["kyc_status"]["current_state"],
-            "completion_percent": user["kyc_status"]["completion_percent"],
-            "verification_id": str(verification["_id"]) if verification else None,
-            "current_step": verification.get("current_step", 0) if verification else 0,
-            "steps_status": verification.get("steps_status", {}) if verification else {},
-            "timeline": [
-                {
-                    "step": t.get("step"),
-                    "action": t.get("action"),
-                    "details": t.get("details"),
-                    "timestamp": t.get("timestamp").isoformat() if t.get("timestamp") else None
-                } for t in timeline
-            ]
-        }), 200
-        
-    except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {str(e)}"}), 500
+    user_oid = _to_oid(user_id)
+    if user_oid is None:
+        return _invalid_id('user_id')
+
+    # User, latest verification request and last 10 timeline entries in one round
+    # trip. The sub-pipelines match on the literal user_id string, so they use the
+    # (user_id, created_at) / (user_id, timestamp) indexes for the sort as well
+    user = next(_DB["Users"].aggregate([
+        {"$match": {"_id": user_oid}},
+        {"$project": {"kyc_status": 1}},
+        {"$lookup": {
+            "from": "KYCVerificationRequests",
+            "pipeline": [
+                {"$match": {"user_id": user_id}},
+                {"$sort": {"created_at": -1}},
+                {"$limit": 1},
+                {"$project": {"_id": 1, "current_step": 1, "steps_status": 1}}
+            ],
+            "as": "verification"
+        }},
+        {"$lookup": {
+            "from": "VerificationTimeline",
+            "pipeline": [
+                {"$match": {"user_id": user_id}},
+                {"$sort": {"timestamp": -1}},
+                {"$limit": 10},
+                {"$project": {"step": 1, "action": 1, "details": 1, "timestamp": 1}}
+            ],
+            "as": "timeline"
+        }}
+    ]), None)
+    if not user:
+        return jsonify({"success": False, "message": "User not found"}), 404
+
+    verification = user["verification"][0] if user["verification"] else None
+    timeline = user["timeline"]
+
+    return jsonify({
+        "success": True,
+        "kyc_status": user["kyc_status"]["current_state"],
+        "completion_percent": user["kyc_status"]["completion_percent"],
+        "verification_id": str(verification["_id"]) if verification else None,
+        "current_step": verification.get("current_step", 0) if verification else 0,
+        "steps_status": verification.get("steps_status", {}) if verification else {},
+        "timeline": [
+            {
+                "step": t.get("step"),
+                "action": t.get("action"),
+                "details": t.get("details"),
+                "timestamp": t.get("timestamp").isoformat() if t.get("timestamp") else None
+            } for t in timeline
+        ]
+    }), 200
 
 
 @kyc_bp.route('/credential/<user_id>', methods=['GET'])
+@_cached_status('credential', per_user=True)
 def get_user_credential(user_id):
     """
     Get user's KYC credential with verification summary
     """
-    try:
-        from pymongo import MongoClient
-        import os
-        from dotenv import load_dotenv
-        
-        # Load .env
-        PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-        dotenv_path = os.path.join(PROJECT_ROOT, '.env')
-        load_dotenv(dotenv_path)
-        
-        MONGO_URI = os.getenv("MONGO_URL") or os.getenv("MONGODB_URI")
-        client = MongoClient(MONGO_URI)
-        db = client["aegis_kyc"]
-        
-        # Get latest credential
-        credential = db["KYCCredentials"].find_one(
-            {"user_id": user_id},
-            sort=[("issued_at", -1)]
-        )
-        
-        if not credential:
-            return jsonify({"success": False, "message": "No credential found"}), 404
-        
-        return jsonify({
-            "success": True,
-            "credential_id": credential.get("credential_id"),
-            "status": credential.get("status"),
-            "issued_at": credential.get("issued_at").isoformat() if credential.get("issued_at") else None,
-            "expiry_date": credential.get("expiry_date").isoformat() if credential.get("expiry_date") else None,
-            "verification_summary": credential.get("verification_summary", {}),
-            "verification_id": credential.get("verification_id")
-        }), 200
-        
-    except Exception as e:
-        return jsonify({"success": False, "message": f"Error: {str(e)}"}), 500
+    db = _DB
+
+    # Get latest credential
+    credential = db["KYCCredentials"].find_one(
+        {"user_id": user_id},
+        sort=[("issued_at", -1)]
+    )
+
+    if not credential:
+        return jsonify({"success": False, "message": "No credential found"}), 404
+
+    return jsonify({
+        "success": True,
+        "credential_id": credential.get("credential_id"),
+        "status": credential.get("status"),
+        "issued_at": credential.get("issued_at").isoformat() if credential.get("issued_at") else None,
+        "expiry_date": credential.get("expiry_date").isoformat() if credential.get("expiry_date") else None,
+        "verification_summary": credential.get("verification_summary", {}),
+        "verification_id": credential.get("verification_id")
+    }), 200
 
 
 @kyc_bp.route('/verify-geolocation', methods=['POST'])
-def verify_geolocation():
+@_json_endpoint()
+def verify_geolocation(data):
     """
     Verify user's geolocation consistency
     Expected: {
@@ -560,39 +824,29 @@ def verify_geolocation():
         declared_address: {city, state, country, pincode}
     }
     """
-    try:
-        from services.geolocation_service import GeolocationService
-        
-        data = request.get_json()
-        ip_address = request.headers.get('X-Forwarded-For', request.remote_addr).split(',')[0].strip()
-        
-        gps_coords = data.get('gps_coords')
-        declared_address = data.get('declared_address')
-        
-        geo_service = GeolocationService()
-        result = geo_service.verify_location_consistency(
-            ip_address=ip_address,
-            gps_coords=gps_coords,
-            declared_address=declared_address
-        )
-        
-        return jsonify({
-            "success": True,
-            "geolocation_verification": result
-        }), 200
-        
-    except Exception as e:
-        print(f"Geolocation verification error: {e}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({
-            "success": False,
-            "message": f"Error: {str(e)}"
-        }), 500
+    from services.geolocation_service import GeolocationService
+
+    ip_address = request.remote_addr
+
+    gps_coords = data.get('gps_coords')
+    declared_address = data.get('declared_address')
+
+    geo_service = GeolocationService()
+    result = geo_service.verify_location_consistency(
+        ip_address=ip_address,
+        gps_coords=gps_coords,
+        declared_address=declared_address
+    )
+
+    return jsonify({
+        "success": True,
+        "geolocation_verification": result
+    }), 200
 
 
 @kyc_bp.route('/generate-device-fingerprint', methods=['POST'])
-def generate_device_fingerprint():
+@_json_endpoint()
+def generate_device_fingerprint(data):
     """
     Generate and analyze device fingerprint
     Expected: {
@@ -601,187 +855,130 @@ def generate_device_fingerprint():
         fonts, plugins, do_not_track, touch_support
     }
     """
-    try:
-        from services.device_fingerprint_service import DeviceFingerprintService
-        
-        data = request.get_json()
-        user_id = data.get('user_id')
-        ip_address = request.headers.get('X-Forwarded-For', request.remote_addr).split(',')[0].strip()
-        
-        device_service = DeviceFingerprintService()
-        
-        # Generate fingerprint
-        fingerprint = device_service.generate_fingerprint(data)
-        
-        # Analyze device trust
-        trust_analysis = device_service.analyze_device_trust(
-            fingerprint=fingerprint,
-            user_id=user_id,
-            ip_address=ip_address
-        )
-        
-        # Check for bot farm
-        bot_check = device_service.detect_bot_farm(fingerprint)
-        
-        return jsonify({
-            "success": True,
-            "fingerprint": fingerprint,
-            "trust_analysis": trust_analysis,
-            "bot_farm_check": bot_check
-        }), 200
-        
-    except Exception as e:
-        print(f"Device fingerprinting error: {e}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({
-            "success": False,
-            "message": f"Error: {str(e)}"
-        }), 500
+    from services.device_fingerprint_service import DeviceFingerprintService
+
+    user_id = data.get('user_id')
+    ip_address = request.remote_addr
+
+    device_service = DeviceFingerprintService()
+
+    # Generate fingerprint
+    fingerprint = device_service.generate_fingerprint(data)
+
+    # Analyze device trust
+    trust_analysis = device_service.analyze_device_trust(
+        fingerprint=fingerprint,
+        user_id=user_id,
+        ip_address=ip_address
+    )
+
+    # Check for bot farm
+    bot_check = device_service.detect_bot_farm(fingerprint)
+
+    return jsonify({
+        "success": True,
+        "fingerprint": fingerprint,
+        "trust_analysis": trust_analysis,
+        "bot_farm_check": bot_check
+    }), 200
 
 
 @kyc_bp.route('/extract-document-text', methods=['POST'])
-def extract_document_text():
+@_json_endpoint('image_base64')
+def extract_document_text(data):
     """
     Extract text and structured fields from an uploaded document image (base64)
     Expected JSON: { "image_base64": "data:image/jpeg;base64,...", "document_type": "passport|pan|aadhaar|auto" }
     """
-    try:
-        data = request.get_json() or {}
-        image_b64 = data.get('image_base64')
-        doc_type = (data.get('document_type') or 'auto').lower()
-
-        if not image_b64:
-            return jsonify({"success": False, "message": "image_base64 is required"}), 400
+    image_b64 = data.get('image_base64')
+    doc_type = (data.get('document_type') or 'auto').strip().lower()
 
-        # Import the OCR helper
-        from ..utils.real_ocr_validator import RealOCRValidator
+    ocr = _get_model('ocr_validator', _new_ocr_validator)
 
-        ocr = RealOCRValidator()
-
-        if 'pan' in doc_type:
-            result = ocr.extract_pan_details(image_b64)
-        elif 'aadhaar' in doc_type or 'aadhar' in doc_type:
-            result = ocr.extract_aadhaar_details(image_b64)
-        elif 'passport' in doc_type:
-            result = ocr.extract_passport_details(image_b64)
-        else:
-            # Generic extraction
-            img = ocr.base64_to_cv2(image_b64)
-            text_lines = ocr.extract_text_regions(img)
-            result = {
-                "success": True,
-                "raw_extracted_lines": text_lines,
-                "message": "Generic text extraction returned"
-            }
+    extractor = _ocr_extractor(doc_type)
+    if extractor:
+        result = _offload(getattr(ocr, extractor), image_b64)
+    else:
+        # Generic extraction
+        img = _offload(ocr.base64_to_cv2, image_b64)
+        text_lines = _offload(ocr.extract_text_regions, img)
+        result = {
+            "success": True,
+            "raw_extracted_lines": text_lines,
+            "message": "Generic text extraction returned"
+        }
 
-        return jsonify(result), 200 if result.get('success', False) else 400
-
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        return jsonify({"success": False, "message": f"Error: {str(e)}"}), 500
+    return jsonify(result), 200 if result.get('success', False) else 400
 
 
 @kyc_bp.route('/detect-deepfake', methods=['POST'])
-def detect_deepfake():
+@_json_endpoint()
+def detect_deepfake(data):
     """
     Lightweight deepfake detection endpoint.
     Expected JSON: { "image_base64": "..." } or { "frame_base64": "..." }
     Returns a probability/confidence and diagnostic scores.
     """
-    try:
-        data = request.get_json() or {}
-        image_b64 = data.get('image_base64') or data.get('frame_base64')
+    image_b64 = data.get('image_base64') or data.get('frame_base64')
 
-        if not image_b64:
-            return jsonify({"success": False, "message": "image_base64 or frame_base64 is required"}), 400
+    if not image_b64:
+        return jsonify({"success": False, "message": "image_base64 or frame_base64 is required"}), 400
 
-        # Try to decode image early to avoid passing empty images into OpenCV routines
+    # Try to decode image early to avoid passing empty images into OpenCV routines
+    try:
+        img_cv2 = decode_b64_image(image_b64)
+    except Exception:
         img_cv2 = None
-        try:
-            # KYCVerificationService helper may be available; import safely
-            try:
-                from services.kyc_verification_service import KYCVerificationService as _KYC
-                img_cv2 = _KYC._b64_to_cv2(image_b64)
-            except Exception:
-                # fallback decode here
-                import base64, cv2, numpy as np
-                b64data = image_b64.split(',')[-1] if ',' in image_b64 else image_b64
-                decoded = base64.b64decode(b64data)
-                arr = np.frombuffer(decoded, np.uint8)
-                img_cv2 = cv2.imdecode(arr, cv2.IMREAD_COLOR)
-        except Exception:
-            img_cv2 = None
 
-        if img_cv2 is None:
-            return jsonify({"success": False, "message": "Failed to decode image_base64 or image is empty"}), 400
+    if img_cv2 is None:
+        return jsonify({"success": False, "message": "Failed to decode image_base64 or image is empty"}), 400
 
-        # Import RealFaceAnalyzer robustly (package vs script execution)
-        RealFaceAnalyzer = None
+    analysis = None
+    try:
+        # Use existing selfie analysis as proxy for liveness/deepfake checks
+        # prefer passing the decoded image if analyzer supports it
         try:
-            from utils.real_face_analyzer import RealFaceAnalyzer as _RFA
-            RealFaceAnalyzer = _RFA
+            analysis = _offload(_face_analysis, 'analyze_selfie', image_b64)
+        except FuturesTimeoutError:
+            raise
         except Exception:
+            # if analyzer fails on base64, try passing cv2 image if supported
             try:
-                from ..utils.real_face_analyzer import RealFaceAnalyzer as _RFA
-                RealFaceAnalyzer = _RFA
-            except Exception:
-                RealFaceAnalyzer = None
-
-        analysis = None
-        if RealFaceAnalyzer is not None:
-            try:
-                analyzer = RealFaceAnalyzer()
-                # Use existing selfie analysis as proxy for liveness/deepfake checks
-                # prefer passing the decoded image if analyzer supports it
-                try:
-                    analysis = analyzer.analyze_selfie(image_b64)
-                except Exception:
-                    # if analyzer fails on base64, try passing cv2 image if supported
-                    try:
-                        analysis = analyzer.analyze_cv2(img_cv2)
-                    except Exception:
-                        analysis = None
+                analysis = _offload(_face_analysis, 'analyze_cv2', img_cv2)
+            except FuturesTimeoutError:
+                raise
             except Exception:
                 analysis = None
+    except FuturesTimeoutError:
+        raise
+    except Exception:
+        analysis = None
 
-        # If RealFaceAnalyzer not available or failed, fallback to deepfake model if present
-        if analysis is None:
-            try:
-                from models.deepfake_model import DeepfakeModel
-                dm = DeepfakeModel()
-                img = None
-                try:
-                    img = KYCVerificationService._b64_to_cv2(image_b64)
-                except Exception:
-                    img = None
-                if img is not None:
-                    out = dm.predict(img)
-                    # synthesize an analysis-like dict
-                    analysis = {
-                        'overall_score': 100 - (out.get('probability', 0.0) * 100),
-                        'deepfake_model': out
-                    }
-                else:
-                    analysis = {'overall_score': 100}
-            except Exception:
-                analysis = {'overall_score': 100}
-
-        # Derive a naive deepfake probability from analysis fields (placeholder)
-        overall = analysis.get('overall_score', 0) if analysis.get('overall_score') is not None else analysis.get('overall_score', 0)
-        # If overall low, increase probability of deepfake
-        deepfake_prob = round(max(0.0, min(1.0, (100 - overall) / 100)), 3)
+    # If RealFaceAnalyzer not available or failed, fallback to deepfake model if present
+    if analysis is None:
+        try:
+            dm = _get_model('deepfake', _new_deep_model)
+            # Reuse the image decoded above
+            out = _offload(dm.predict, img_cv2)
+            # synthesize an analysis-like dict
+            analysis = {
+                'overall_score': 100 - (out.get('probability', 0.0) * 100),
+                'deepfake_model': out
+            }
+        except FuturesTimeoutError:
+            raise
+        except Exception:
+            analysis = {'overall_score': 100}
 
-        response = {
-            "success": True,
-            "deepfake_probability": deepfake_prob,
-            "analysis": analysis
-        }
+    # Derive a naive deepfake probability from analysis fields (placeholder)
+    overall = analysis.get('overall_score', 0) if analysis.get('overall_score') is not None else analysis.get('overall_score', 0)
+    # If overall low, increase probability of deepfake
+    deepfake_prob = round(max(0.0, min(1.0, (100 - overall) / 100)), 3)
 
-        return jsonify(response), 200
+    response = {
+        "success": True,
+        "deepfake_probability": deepfake_prob,
+        "analysis": analysis
+    }
 
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        return jsonify({"success": False, "message": f"Error: {str(e)}"}), 500
+    return jsonify(response), 200
@@ -1,17 +1,33 @@
 from flask import Blueprint, request, jsonify, render_template
 from bson import ObjectId
 from datetime import datetime, timedelta
+import atexit
+import json
+import logging
 import secrets
 import os
-from pymongo import MongoClient
+import time
+from collections import Counter, defaultdict
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+import threading
+from pymongo import MongoClient, IndexModel, UpdateOne, ASCENDING, DESCENDING
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 import bcrypt
 import jwt
 
+from utils.background import ensure_thread
+from utils.encryption import EncryptionService
+from utils.redis_cache import cache_delete, publish, consent_requests_key, consent_events_channel
+from utils.video_store import video_data_uri
+
 org_bp = Blueprint('organization', __name__)
+logger = logging.getLogger(__name__)
 
 # MongoDB connection
 MONGO_URI = os.getenv("MONGO_URL") or os.getenv("MONGODB_URI") or "mongodb://localhost:27017"
-client = MongoClient(MONGO_URI)
+# Warm pool for dashboard bursts; fail fast (3s) instead of hanging when the DB is unreachable
+client = MongoClient(MONGO_URI, maxPoolSize=100, minPoolSize=10, serverSelectionTimeoutMS=3000, connect=False)
 db = client["aegis_kyc"]
 
 # Collections
@@ -22,9 +38,247 @@ users_collection = db["Users"]
 credentials_collection = db["KYCCredentials"]
 verifications_collection = db["KYCVerificationRequests"]
 
+
+def ensure_org_indexes():
+    """Indexes behind org login/signup, user search and the per-org request lists"""
+    indexes = {
+        organizations_collection: [
+            IndexModel([('admin_email', ASCENDING)], unique=True),
+            IndexModel([('registration_number', ASCENDING)], unique=True),
+            IndexModel([('api_keys.production', ASCENDING)], unique=True, sparse=True)
+        ],
+        org_kyc_requests_collection: [IndexModel([('organization_id', ASCENDING), ('created_at', DESCENDING)])],
+        consent_requests_collection: [IndexModel([('organization_id', ASCENDING), ('created_at', DESCENDING)])],
+        # credential_id / user_id on KYCCredentials are created by admin_routes
+        users_collection: [IndexModel([('email', ASCENDING)])]
+    }
+    for collection, models in indexes.items():
+        try:
+            collection.create_indexes(models)
+        except Exception as e:
+            # Existing duplicates or unreachable DB: queries still work, just unindexed
+            logger.warning("Could not create indexes on %s: %s", collection.name, e)
+
+
+# In the background so an unreachable DB does not stall app startup
+threading.Thread(target=ensure_org_indexes, daemon=True).start()
+
+# Organization request counters are added up in process and written by a background
+# thread (one per worker, started on first use), so request_kyc / request_consent make
+# one round trip instead of two
+STATS_FLUSH_INTERVAL = 2
+_STATS_PENDING = defaultdict(Counter)
+_STATS_LOCK = threading.Lock()
+
+
+def _count_new_request(org_id):
+    """Record one new pending request in the organization's stats"""
+    org_oid = ObjectId(org_id)
+    ensure_thread('org-stats-writer', _stats_writer)
+    with _STATS_LOCK:
+        _STATS_PENDING[org_oid].update(('total_requests', 'pending_count'))
+
+
+def _unflushed_stats(org_oid):
+    """Stats increments this process has not written yet"""
+    with _STATS_LOCK:
+        return dict(_STATS_PENDING.get(org_oid, {}))
+
+
+def _flush_stats():
+    with _STATS_LOCK:
+        pending = dict(_STATS_PENDING)
+        _STATS_PENDING.clear()
+    if not pending:
+        return
+    ops = [
+        UpdateOne({'_id': org_oid}, {'$inc': {f'stats.{field}': n for field, n in counts.items()}})
+        for org_oid, counts in pending.items()
+    ]
+    try:
+        organizations_collection.bulk_write(ops, ordered=False)
+    except BulkWriteError as e:
+        logger.warning("Could not apply organization stats updates: %s", e.details.get('writeErrors'))
+    except Exception as e:
+        # DB unreachable: keep the increments for the next flush
+        logger.warning("Organization stats flush failed: %s", e)
+        with _STATS_LOCK:
+            for org_oid, counts in pending.items():
+                _STATS_PENDING[org_oid].update(counts)
+
+
+def _stats_writer():
+    while True:
+        time.sleep(STATS_FLUSH_INTERVAL)
+        _flush_stats()
+
+
+atexit.register(_flush_stats)
+
 # JWT Secret
 JWT_SECRET = os.getenv("JWT_SECRET", "your-secret-key-change-in-production")
 
+# bcrypt releases the GIL, so hashing on a shared pool runs on every core while the
+# pool size bounds how many hashes a login spike can run at once
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKER_POOL_SIZE", (os.cpu_count() or 1) * 2))
+# Work factor for new org passwords (existing hashes keep theirs). Each step doubles
+# the hash time (~250ms at 12), so the pool handles about
+# BCRYPT_WORKERS / (0.25s * 2 ** (BCRYPT_COST - 12)) signups/logins per second
+BCRYPT_COST = int(os.getenv("BCRYPT_COST", "12"))
+# Signup/login answer 503 instead of queueing behind this many pending hashes
+BCRYPT_MAX_QUEUE = 500
+# ...or instead of waiting longer than this many seconds for one (queue time included)
+BCRYPT_TIMEOUT = float(os.getenv("BCRYPT_TIMEOUT", 10))
+_BCRYPT_POOL = ThreadPoolExecutor(max_workers=BCRYPT_WORKERS, thread_name_prefix="bcrypt")
+
+
+def _bcrypt(fn, *args):
+    """
+    Run a bcrypt call on the shared pool and wait for its result. Raises
+    FuturesTimeoutError after BCRYPT_TIMEOUT (a still-queued call is cancelled).
+    """
+    future = _BCRYPT_POOL.submit(fn, *args)
+    try:
+        return future.result(timeout=BCRYPT_TIMEOUT)
+    except FuturesTimeoutError:
+        future.cancel()
+        raise
+
+
+def _bcrypt_overloaded():
+    return _BCRYPT_POOL._work_queue.qsize() > BCRYPT_MAX_QUEUE
+
+
+@lru_cache(maxsize=4096)
+def _decode_org_token(token):
+    """
+    (org_id, exp) of a valid organization JWT. Dashboards poll with the same token,
+    so the HMAC check and parsing run once per token; invalid tokens raise and are
+    not cached, and expiry is re-checked by the caller on every use.
+    """
+    decoded = jwt.decode(token, JWT_SECRET, algorithms=['HS256'])
+    return decoded['org_id'], decoded.get('exp')
+
+
+def _require_org():
+    """(org_id, None) for the request's Bearer token, or (None, 401 response)"""
+    auth_header = request.headers.get('Authorization')
+    if not auth_header or not auth_header.startswith('Bearer '):
+        return None, (jsonify({'error': 'Unauthorized'}), 401)
+    try:
+        org_id, exp = _decode_org_token(auth_header.split(' ')[1])
+    except jwt.ExpiredSignatureError:
+        return None, (jsonify({'error': 'Token expired'}), 401)
+    except (jwt.InvalidTokenError, KeyError):
+        return None, (jsonify({'error': 'Invalid token'}), 401)
+    if exp is not None and exp <= time.time():
+        return None, (jsonify({'error': 'Token expired'}), 401)
+    return org_id, None
+
+
+def _busy_response():
+    response = jsonify({'error': 'Server busy, please retry'})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+
+# Request list paging (?page=0-based&page_size=)
+LIST_PAGE_SIZE = 50
+LIST_MAX_PAGE_SIZE = 500
+
+# Fields the org dashboard shows for each KYC / consent request
+VERIFICATION_LIST_FIELDS = {
+    'request_id': 1, 'user_email': 1, 'user_phone': 1, 'user_first_name': 1, 'user_last_name': 1,
+    'verification_type': 1, 'purpose': 1, 'callback_url': 1, 'status': 1,
+    'created_at': 1, 'updated_at': 1
+}
+CONSENT_LIST_FIELDS = {
+    'request_id': 1, 'user_id': 1, 'user_name': 1, 'user_email': 1, 'credential_id': 1,
+    'purpose': 1, 'consent_status': 1, 'created_at': 1, 'updated_at': 1
+}
+
+
+def _page_args():
+    """(page, page_size) from the query string; raises ValueError on non-integers"""
+    page = max(int(request.args.get('page', 0)), 0)
+    page_size = min(max(int(request.args.get('page_size', LIST_PAGE_SIZE)), 1), LIST_MAX_PAGE_SIZE)
+    return page, page_size
+
+
+def _fetch_org_page(collection, org_id, fields, page, page_size):
+    """
+    One page of an organization's requests, newest first, served by the
+    (organization_id, created_at) index. Reads one extra document to tell whether
+    more remain; the batch size lets the whole page arrive in one round trip.
+    """
+    cursor = (collection.find({'organization_id': org_id}, fields)
+              .sort('created_at', -1)
+              .skip(page * page_size)
+              .limit(page_size + 1)
+              .batch_size(page_size + 1))
+    docs = list(cursor)
+    return docs[:page_size], len(docs) > page_size
+
+
+# Only what the user search response needs
+SEARCH_USER_FIELDS = {
+    'email': 1, 'first_name': 1, 'last_name': 1, 'kyc_status': 1,
+    'encrypted_first_name': 1, 'encrypted_last_name': 1
+}
+SEARCH_CREDENTIAL_FIELDS = {'credential_id': 1, 'user_id': 1}
+
+# Independent lookups issued concurrently (user search)
+_QUERY_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="org-query")
+
+
+def _decrypt(encrypted):
+    """Plaintext of an encrypt_field() value; raises ValueError if it cannot be decrypted"""
+    if not isinstance(encrypted, dict):
+        raise ValueError("Unsupported encrypted value")
+    return EncryptionService.decrypt_field({'ciphertext': encrypted.get('ciphertext', ''),
+                                            'nonce': encrypted.get('nonce', '')})
+
+
+def _user_key(user_id):
+    """Users _id for a stored user_id (ObjectId, or its string form; else used as is)"""
+    if isinstance(user_id, ObjectId):
+        return user_id
+    try:
+        return ObjectId(user_id)
+    except Exception:
+        return user_id
+
+
+def _search_result(user, credential_id):
+    """search_user response for a matched user"""
+    # Get decrypted names
+    first_name = user.get('first_name', '')
+    last_name = user.get('last_name', '')
+    
+    # Try to decrypt if encrypted fields exist
+    if user.get('encrypted_first_name'):
+        try:
+            first_name = _decrypt(user['encrypted_first_name'])
+            last_name = _decrypt(user['encrypted_last_name'])
+        except Exception as e:
+            logger.warning("Decryption error: %s", e)
+    
+    # Extract KYC status - handle both object and string formats
+    kyc_status = user.get('kyc_status', 'pending')
+    if isinstance(kyc_status, dict):
+        kyc_status = kyc_status.get('current_state', 'pending')
+    
+    return {
+        'user_id': str(user['_id']),
+        'credential_id': credential_id,
+        'user': {
+            'first_name': first_name,
+            'last_name': last_name,
+            'email': user.get('email', ''),
+            'kyc_status': kyc_status
+        }
+    }
+
 @org_bp.route('/organization/signup', methods=['GET'])
 def org_signup_page():
     """Render organization signup page"""
@@ -69,7 +323,12 @@ def org_signup():
             return jsonify({'error': 'Organization already registered with this email or registration number'}), 400
         
         # Hash password
-        hashed_password = bcrypt.hashpw(data['password'].encode('utf-8'), bcrypt.gensalt())
+        if _bcrypt_overloaded():
+            return _busy_response()
+        try:
+            hashed_password = _bcrypt(bcrypt.hashpw, data['password'].encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_COST))
+        except FuturesTimeoutError:
+            return _busy_response()
         
         # Generate API keys
         prod_api_key = 'pk_live_' + secrets.token_hex(16)
@@ -108,7 +367,12 @@ def org_signup():
             }
         }
         
-        result = organizations_collection.insert_one(org_doc)
+        try:
+            result = organizations_collection.insert_one(org_doc)
+        except DuplicateKeyError:
+            # A concurrent signup with the same email/registration number won the race
+            # past the find_one above; the unique indexes reject the second insert
+            return jsonify({'error': 'Organization already registered with this email or registration number'}), 400
         
         return jsonify({
             'message': 'Organization registered successfully',
@@ -116,7 +380,7 @@ def org_signup():
         }), 201
         
     except Exception as e:
-        print(f"Error in org_signup: {str(e)}")
+        logger.exception("Error in org_signup: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 @org_bp.route('/api/organization/login', methods=['POST'])
@@ -135,7 +399,13 @@ def org_login():
             return jsonify({'error': 'Invalid credentials'}), 401
         
         # Verify password
-        if not bcrypt.checkpw(data['password'].encode('utf-8'), org['password']):
+        if _bcrypt_overloaded():
+            return _busy_response()
+        try:
+            password_ok = _bcrypt(bcrypt.checkpw, data['password'].encode('utf-8'), org['password'])
+        except FuturesTimeoutError:
+            return _busy_response()
+        if not password_ok:
             return jsonify({'error': 'Invalid credentials'}), 401
         
         # Check if organization is active
@@ -158,28 +428,16 @@ def org_login():
         }), 200
         
     except Exception as e:
-        print(f"Error in org_login: {str(e)}")
+        logger.exception("Error in org_login: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 @org_bp.route('/api/organization/dashboard-data', methods=['GET'])
 def get_org_dashboard_data():
     """Get organization dashboard data"""
     try:
-        # Extract token from Authorization header
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
-            return jsonify({'error': 'Unauthorized'}), 401
-        
-        token = auth_header.split(' ')[1]
-        
-        # Verify token
-        try:
-            decoded = jwt.decode(token, JWT_SECRET, algorithms=['HS256'])
-            org_id = decoded['org_id']
-        except jwt.ExpiredSignatureError:
-            return jsonify({'error': 'Token expired'}), 401
-        except jwt.InvalidTokenError:
-            return jsonify({'error': 'Invalid token'}), 401
+        org_id, auth_error = _require_org()
+        if auth_error:
+            return auth_error
         
         # Get organization
         org = organizations_collection.find_one({'_id': ObjectId(org_id)})
@@ -190,8 +448,11 @@ def get_org_dashboard_data():
         # Get KYC requests for this organization
         requests = list(org_kyc_requests_collection.find({'organization_id': org_id}))
         
-        # Calculate stats
-        stats = org.get('stats', {})
+        # Calculate stats, including this worker's increments not yet written (other
+        # workers' reach the DB within STATS_FLUSH_INTERVAL)
+        stats = dict(org.get('stats', {}))
+        for field, n in _unflushed_stats(org['_id']).items():
+            stats[field] = stats.get(field, 0) + n
         
         return jsonify({
             'organization_name': org['organization_name'],
@@ -210,25 +471,16 @@ def get_org_dashboard_data():
         }), 200
         
     except Exception as e:
-        print(f"Error in get_org_dashboard_data: {str(e)}")
+        logger.exception("Error in get_org_dashboard_data: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 @org_bp.route('/api/organization/request-kyc', methods=['POST'])
 def request_kyc():
     """Submit a KYC verification request"""
     try:
-        # Extract and verify token
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
-            return jsonify({'error': 'Unauthorized'}), 401
-        
-        token = auth_header.split(' ')[1]
-        
-        try:
-            decoded = jwt.decode(token, JWT_SECRET, algorithms=['HS256'])
-            org_id = decoded['org_id']
-        except:
-            return jsonify({'error': 'Invalid token'}), 401
+        org_id, auth_error = _require_org()
+        if auth_error:
+            return auth_error
         
         data = request.json
         
@@ -257,15 +509,7 @@ def request_kyc():
         result = org_kyc_requests_collection.insert_one(request_doc)
         
         # Update organization stats
-        organizations_collection.update_one(
-            {'_id': ObjectId(org_id)},
-            {
-                '$inc': {
-                    'stats.total_requests': 1,
-                    'stats.pending_count': 1
-                }
-            }
-        )
+        _count_new_request(org_id)
         
         return jsonify({
             'message': 'KYC request submitted successfully',
@@ -274,59 +518,53 @@ def request_kyc():
         }), 201
         
     except Exception as e:
-        print(f"Error in request_kyc: {str(e)}")
+        logger.exception("Error in request_kyc: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 @org_bp.route('/api/organization/verifications', methods=['GET'])
 def get_verifications():
-    """Get all KYC verification requests for organization"""
+    """
+    KYC verification requests for organization, newest first
+    Query params: page (0-based, default 0), page_size (default 50, max 500)
+    """
     try:
-        # Extract and verify token
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
-            return jsonify({'error': 'Unauthorized'}), 401
-        
-        token = auth_header.split(' ')[1]
-        
+        org_id, auth_error = _require_org()
+        if auth_error:
+            return auth_error
         try:
-            decoded = jwt.decode(token, JWT_SECRET, algorithms=['HS256'])
-            org_id = decoded['org_id']
-        except:
-            return jsonify({'error': 'Invalid token'}), 401
+            page, page_size = _page_args()
+        except ValueError:
+            return jsonify({'error': 'page and page_size must be integers'}), 400
         
-        # Get all requests for this organization
-        requests = list(org_kyc_requests_collection.find({'organization_id': org_id}))
+        requests, has_more = _fetch_org_page(
+            org_kyc_requests_collection, org_id, VERIFICATION_LIST_FIELDS, page, page_size)
         
         # Convert ObjectId to string
         for req in requests:
             req['_id'] = str(req['_id'])
             req['created_at'] = req['created_at'].isoformat() if req.get('created_at') else ''
+            if hasattr(req.get('updated_at'), 'isoformat'):
+                req['updated_at'] = req['updated_at'].isoformat()
         
         return jsonify({
             'verifications': requests,
-            'total': len(requests)
+            'total': org_kyc_requests_collection.count_documents({'organization_id': org_id}),
+            'page': page,
+            'page_size': page_size,
+            'has_more': has_more
         }), 200
         
     except Exception as e:
-        print(f"Error in get_verifications: {str(e)}")
+        logger.exception("Error in get_verifications: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 @org_bp.route('/api/organization/settings', methods=['PUT'])
 def update_settings():
     """Update organization settings"""
     try:
-        # Extract and verify token
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
-            return jsonify({'error': 'Unauthorized'}), 401
-        
-        token = auth_header.split(' ')[1]
-        
-        try:
-            decoded = jwt.decode(token, JWT_SECRET, algorithms=['HS256'])
-            org_id = decoded['org_id']
-        except:
-            return jsonify({'error': 'Invalid token'}), 401
+        org_id, auth_error = _require_org()
+        if auth_error:
+            return auth_error
         
         data = request.json
         
@@ -350,158 +588,74 @@ def update_settings():
         return jsonify({'message': 'Settings updated successfully'}), 200
         
     except Exception as e:
-        print(f"Error in update_settings: {str(e)}")
+        logger.exception("Error in update_settings: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 @org_bp.route('/api/organization/search-user', methods=['GET'])
 def search_user():
     """Search for a user by Credential ID or Email"""
     try:
-        # Extract and verify token
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
-            return jsonify({'error': 'Unauthorized'}), 401
-        
-        token = auth_header.split(' ')[1]
-        
-        try:
-            decoded = jwt.decode(token, JWT_SECRET, algorithms=['HS256'])
-            org_id = decoded['org_id']
-        except Exception as e:
-            print(f"Token decode error: {str(e)}")
-            return jsonify({'error': 'Invalid token'}), 401
+        org_id, auth_error = _require_org()
+        if auth_error:
+            return auth_error
         
         search_query = request.args.get('query', '').strip()
         
         if not search_query:
             return jsonify({'error': 'Search query required'}), 400
         
-        print(f"Searching for: {search_query}")
+        logger.debug("Searching for: %s", search_query)
         
-        # Search by credential ID first
-        credential = credentials_collection.find_one({'credential_id': search_query})
+        # The query is either a credential ID or an email: look both up at once
+        credential_future = _QUERY_POOL.submit(
+            credentials_collection.find_one, {'credential_id': search_query}, SEARCH_CREDENTIAL_FIELDS)
+        email_user_future = _QUERY_POOL.submit(
+            users_collection.find_one, {'email': search_query}, SEARCH_USER_FIELDS)
+        credential = credential_future.result()
+        email_user = email_user_future.result()
         
-        print(f"Credential found: {credential}")
+        logger.debug("Credential found: %s", credential)
         
         if credential:
             user_id = credential.get('user_id')
-            print(f"User ID: {user_id}")
+            logger.debug("User ID: %s", user_id)
             
             # Try to find user with ObjectId or string ID
             try:
-                user = users_collection.find_one({'_id': ObjectId(user_id)})
+                user = users_collection.find_one({'_id': ObjectId(user_id)}, SEARCH_USER_FIELDS)
             except:
                 # If ObjectId conversion fails, try as string
-                user = users_collection.find_one({'_id': user_id})
+                user = users_collection.find_one({'_id': user_id}, SEARCH_USER_FIELDS)
             
-            print(f"User found: {user.get('email') if user else 'None'}")
+            logger.debug("User found: %s", user.get('email') if user else None)
             
             if user:
-                # Get decrypted names
-                first_name = user.get('first_name', '')
-                last_name = user.get('last_name', '')
-                
-                # Try to decrypt if encrypted fields exist
-                if user.get('encrypted_first_name'):
-                    try:
-                        import sys
-                        sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-                        from services.encryption_service import EncryptionService
-                        encryption_service = EncryptionService()
-                        
-                        first_name = encryption_service.decrypt(user['encrypted_first_name'])
-                        last_name = encryption_service.decrypt(user['encrypted_last_name'])
-                    except Exception as e:
-                        print(f"Decryption error: {str(e)}")
-                        pass
-                
-                # Extract KYC status - handle both object and string formats
-                kyc_status = user.get('kyc_status', 'pending')
-                if isinstance(kyc_status, dict):
-                    kyc_status = kyc_status.get('current_state', 'pending')
-                
-                result = {
-                    'user_id': str(user['_id']),
-                    'credential_id': credential['credential_id'],
-                    'user': {
-                        'first_name': first_name,
-                        'last_name': last_name,
-                        'email': user.get('email', ''),
-                        'kyc_status': kyc_status
-                    }
-                }
-                
-                print(f"Returning result: {result}")
+                result = _search_result(user, credential['credential_id'])
+                logger.debug("Returning result: %s", result)
                 return jsonify(result), 200
         
         # If not found by credential, search by email
-        user = users_collection.find_one({'email': search_query})
-        
-        if user:
-            # Get decrypted names
-            first_name = user.get('first_name', '')
-            last_name = user.get('last_name', '')
-            
-            # Try to decrypt if encrypted fields exist
-            if user.get('encrypted_first_name'):
-                try:
-                    import sys
-                    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-                    from services.encryption_service import EncryptionService
-                    encryption_service = EncryptionService()
-                    
-                    first_name = encryption_service.decrypt(user['encrypted_first_name'])
-                    last_name = encryption_service.decrypt(user['encrypted_last_name'])
-                except Exception as e:
-                    print(f"Decryption error: {str(e)}")
-                    pass
-            
+        if email_user:
             # Find credential for this user
-            credential = credentials_collection.find_one({'user_id': str(user['_id'])})
-            
-            # Extract KYC status - handle both object and string formats
-            kyc_status = user.get('kyc_status', 'pending')
-            if isinstance(kyc_status, dict):
-                kyc_status = kyc_status.get('current_state', 'pending')
+            credential = credentials_collection.find_one({'user_id': str(email_user['_id'])}, SEARCH_CREDENTIAL_FIELDS)
             
-            result = {
-                'user_id': str(user['_id']),
-                'credential_id': credential['credential_id'] if credential else None,
-                'user': {
-                    'first_name': first_name,
-                    'last_name': last_name,
-                    'email': user.get('email', ''),
-                    'kyc_status': kyc_status
-                }
-            }
-            
-            print(f"Returning result: {result}")
+            result = _search_result(email_user, credential['credential_id'] if credential else None)
+            logger.debug("Returning result: %s", result)
             return jsonify(result), 200
         
         return jsonify({'error': 'User not found'}), 404
         
     except Exception as e:
-        print(f"Error in search_user: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in search_user: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 @org_bp.route('/api/organization/request-consent', methods=['POST'])
 def request_consent():
     """Send consent request to user"""
     try:
-        # Extract and verify token
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
-            return jsonify({'error': 'Unauthorized'}), 401
-        
-        token = auth_header.split(' ')[1]
-        
-        try:
-            decoded = jwt.decode(token, JWT_SECRET, algorithms=['HS256'])
-            org_id = decoded['org_id']
-        except:
-            return jsonify({'error': 'Invalid token'}), 401
+        org_id, auth_error = _require_org()
+        if auth_error:
+            return auth_error
         
         data = request.json
         
@@ -531,25 +685,19 @@ def request_consent():
         # Try to decrypt if encrypted fields exist
         if user.get('encrypted_first_name') or user.get('encrypted_last_name'):
             try:
-                import sys
-                import os
-                sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-                from services.encryption_service import EncryptionService
-                encryption_service = EncryptionService()
-                
                 if user.get('encrypted_first_name'):
-                    first_name = encryption_service.decrypt(user['encrypted_first_name'])
+                    first_name = _decrypt(user['encrypted_first_name'])
                 if user.get('encrypted_last_name'):
-                    last_name = encryption_service.decrypt(user['encrypted_last_name'])
+                    last_name = _decrypt(user['encrypted_last_name'])
             except Exception as e:
-                print(f"Decryption warning: {str(e)}")
+                logger.warning("Decryption warning: %s", e)
                 # Use whatever is available if decryption fails
                 first_name = first_name or 'User'
                 last_name = last_name or ''
         
         user_full_name = f"{first_name} {last_name}".strip() or "Unknown User"
         
-        print(f"User details - Name: {user_full_name}, Email: {user_email}")
+        logger.debug("User details - Name: %s, Email: %s", user_full_name, user_email)
         
         # Create consent request document - store user_id as ObjectId
         consent_doc = {
@@ -566,33 +714,27 @@ def request_consent():
             'updated_at': datetime.utcnow()
         }
         
-        print(f"Creating consent request for user_id: {user_obj_id}, type: {type(user_obj_id)}")
-        print(f"Organization ID: {org_id}, type: {type(org_id)}")
-        print(f"Organization name: {org.get('organization_name')}")
+        logger.debug("Creating consent request for user_id: %s (%s), organization: %s (%s) %s",
+                     user_obj_id, type(user_obj_id).__name__, org_id, type(org_id).__name__,
+                     org.get('organization_name'))
         
         result = consent_requests_collection.insert_one(consent_doc)
-        print(f"Consent request created with ID: {result.inserted_id}")
-        
-        # Verify it was inserted
-        verify = consent_requests_collection.find_one({'_id': result.inserted_id})
-        if verify:
-            print(f"✓ Verified consent request in database:")
-            print(f"  - organization_id: {verify.get('organization_id')}")
-            print(f"  - user_id: {verify.get('user_id')}")
-            print(f"  - consent_status: {verify.get('consent_status')}")
-        else:
-            print("✗ WARNING: Could not verify consent request in database!")
+        logger.debug("Consent request created with ID: %s", result.inserted_id)
+        cache_delete(consent_requests_key(user_obj_id))
+        publish(consent_events_channel(user_obj_id),
+                json.dumps({'request_id': consent_doc['request_id'], 'status': 'pending'}))
+        
+        # Read it back (extra query: debug only)
+        if logger.isEnabledFor(logging.DEBUG):
+            verify = consent_requests_collection.find_one({'_id': result.inserted_id})
+            if verify:
+                logger.debug("Verified consent request in database: organization_id=%s user_id=%s consent_status=%s",
+                             verify.get('organization_id'), verify.get('user_id'), verify.get('consent_status'))
+            else:
+                logger.debug("Could not verify consent request in database")
         
         # Update organization stats
-        organizations_collection.update_one(
-            {'_id': ObjectId(org_id)},
-            {
-                '$inc': {
-                    'stats.total_requests': 1,
-                    'stats.pending_count': 1
-                }
-            }
-        )
+        _count_new_request(org_id)
         
         return jsonify({
             'message': 'Consent request sent successfully',
@@ -601,45 +743,37 @@ def request_consent():
         }), 201
         
     except Exception as e:
-        print(f"Error in request_consent: {str(e)}")
+        logger.exception("Error in request_consent: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 @org_bp.route('/api/organization/consent-requests', methods=['GET'])
 def get_consent_requests():
-    """Get all consent requests for organization"""
+    """
+    Consent requests for organization, newest first
+    Query params: page (0-based, default 0), page_size (default 50, max 500)
+    """
     try:
-        # Extract and verify token
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
-            print("ERROR: No authorization header")
-            return jsonify({'error': 'Unauthorized'}), 401
-        
-        token = auth_header.split(' ')[1]
-        
+        org_id, auth_error = _require_org()
+        if auth_error:
+            return auth_error
         try:
-            decoded = jwt.decode(token, JWT_SECRET, algorithms=['HS256'])
-            org_id = decoded['org_id']
-        except Exception as e:
-            print(f"ERROR: Token decode failed: {str(e)}")
-            return jsonify({'error': 'Invalid token'}), 401
+            page, page_size = _page_args()
+        except ValueError:
+            return jsonify({'error': 'page and page_size must be integers'}), 400
         
-        print(f"\n=== GET CONSENT REQUESTS ===")
-        print(f"Organization ID from token: {org_id} (type: {type(org_id)})")
-        
-        # Count all documents in collection first
-        total_in_collection = consent_requests_collection.count_documents({})
-        print(f"Total documents in ConsentRequests collection: {total_in_collection}")
+        logger.debug("Consent requests for organization ID from token: %s (%s)", org_id, type(org_id).__name__)
         
         # Try to find with the org_id
-        requests = list(consent_requests_collection.find({'organization_id': org_id}).sort('created_at', -1))
-        print(f"Found {len(requests)} consent requests for organization_id: {org_id}")
+        requests, has_more = _fetch_org_page(
+            consent_requests_collection, org_id, CONSENT_LIST_FIELDS, page, page_size)
+        logger.debug("Found %d consent requests for organization_id: %s", len(requests), org_id)
         
-        # If none found, list all to see what org_ids exist
-        if len(requests) == 0 and total_in_collection > 0:
-            print("WARNING: No requests found for this org_id. Listing all org_ids in collection:")
-            all_requests = list(consent_requests_collection.find({}, {'organization_id': 1, 'organization_name': 1}))
-            for req in all_requests:
-                print(f"  - org_id: {req.get('organization_id')} (type: {type(req.get('organization_id'))}), name: {req.get('organization_name')}")
+        # If none found, list all to see what org_ids exist (full scan: debug only)
+        if logger.isEnabledFor(logging.DEBUG) and len(requests) == 0 and page == 0:
+            logger.debug("No requests found for this org_id. All org_ids in collection: %s", [
+                (req.get('organization_id'), type(req.get('organization_id')).__name__, req.get('organization_name'))
+                for req in consent_requests_collection.find({}, {'organization_id': 1, 'organization_name': 1})
+            ])
         
         # Convert ObjectId to string and handle all fields properly
         for req in requests:
@@ -654,18 +788,17 @@ def get_consent_requests():
                 req['created_at'] = req['created_at'].isoformat() if hasattr(req['created_at'], 'isoformat') else str(req['created_at'])
             if req.get('updated_at'):
                 req['updated_at'] = req['updated_at'].isoformat() if hasattr(req['updated_at'], 'isoformat') else str(req['updated_at'])
-            
-            print(f"  Request: {req.get('request_id')} | User: {req.get('user_name')} | Status: {req.get('consent_status')}")
-        
-        print(f"Returning {len(requests)} requests to frontend")
         
         return jsonify({
             'requests': requests,
-            'total': len(requests)
+            'total': consent_requests_collection.count_documents({'organization_id': org_id}),
+            'page': page,
+            'page_size': page_size,
+            'has_more': has_more
         }), 200
         
     except Exception as e:
-        print(f"Error in get_consent_requests: {str(e)}")
+        logger.exception("Error in get_consent_requests: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 
@@ -673,112 +806,79 @@ def get_consent_requests():
 def fix_consent_names():
     """Fix missing user names in existing consent requests"""
     try:
-        # Extract and verify token
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
-            return jsonify({'error': 'Unauthorized'}), 401
-        
-        token = auth_header.split(' ')[1]
-        
-        try:
-            decoded = jwt.decode(token, JWT_SECRET, algorithms=['HS256'])
-            org_id = decoded['org_id']
-        except:
-            return jsonify({'error': 'Invalid token'}), 401
+        org_id, auth_error = _require_org()
+        if auth_error:
+            return auth_error
         
-        print(f"\n=== FIXING CONSENT REQUEST NAMES ===")
-        print(f"Organization ID: {org_id}")
+        logger.debug("Fixing consent request names for organization ID: %s", org_id)
         
         # Get all consent requests for this organization
-        requests = list(consent_requests_collection.find({'organization_id': org_id}))
-        print(f"Total requests for this org: {len(requests)}")
-        
-        # Also check total users in database
-        total_users = users_collection.count_documents({})
-        print(f"Total users in database: {total_users}")
+        requests = list(consent_requests_collection.find(
+            {'organization_id': org_id}, {'user_id': 1, 'user_name': 1, 'request_id': 1}))
+        logger.debug("Total requests for this org: %d", len(requests))
+        
+        # Fix if name is missing, empty, or "Unknown User"
+        to_fix = [req for req in requests
+                  if (req.get('user_name') or '').strip() in ('', 'Unknown User')]
+        
+        # Fetch every user needing a fix in one query
+        keys = {_user_key(req.get('user_id')) for req in to_fix}
+        users_by_id = {
+            user['_id']: user for user in users_collection.find(
+                {'_id': {'$in': list(keys)}},
+                {'email': 1, 'first_name': 1, 'last_name': 1, 'encrypted_first_name': 1, 'encrypted_last_name': 1})
+        }
         
-        fixed_count = 0
-        for req in requests:
+        ops = []
+        fixed_user_ids = []
+        for req in to_fix:
             user_id = req.get('user_id')
-            current_name = req.get('user_name', '')
+            logger.debug("Fixing request %s (current: %r), user ID: %s (%s)",
+                         req.get('request_id'), req.get('user_name', ''), user_id, type(user_id).__name__)
             
-            # Fix if name is missing, empty, or "Unknown User"
-            if not current_name or current_name.strip() == '' or current_name.strip() == 'Unknown User':
-                print(f"Fixing request {req.get('request_id')} (current: '{current_name}')...")
-                print(f"  User ID: {user_id} (type: {type(user_id)})")
-                
-                # Get user - try both ObjectId and string formats
-                user = None
-                if isinstance(user_id, ObjectId):
-                    user = users_collection.find_one({'_id': user_id})
-                else:
-                    # Try as ObjectId first
-                    try:
-                        user = users_collection.find_one({'_id': ObjectId(user_id)})
-                    except:
-                        # If that fails, try as string
-                        user = users_collection.find_one({'_id': user_id})
-                
-                if user:
-                    print(f"  User found in database")
-                    print(f"  All user fields: {list(user.keys())}")
-                    
-                    # Get user details
-                    first_name = user.get('first_name', '')
-                    last_name = user.get('last_name', '')
-                    email = user.get('email', '')
-                    
-                    print(f"  Raw fields - first: '{first_name}', last: '{last_name}', email: '{email}'")
-                    print(f"  Encrypted fields - first: {bool(user.get('encrypted_first_name'))}, last: {bool(user.get('encrypted_last_name'))}")
-                    
-                    # Show all encrypted field values (hashed, not full value)
+            user = users_by_id.get(_user_key(user_id))
+            if not user:
+                logger.debug("User %s not found in database", user_id)
+                continue
+            
+            # Get user details
+            first_name = user.get('first_name', '')
+            last_name = user.get('last_name', '')
+            email = user.get('email', '')
+            
+            # Try to decrypt if encrypted
+            if user.get('encrypted_first_name') or user.get('encrypted_last_name'):
+                try:
                     if user.get('encrypted_first_name'):
-                        print(f"  encrypted_first_name exists (length: {len(user.get('encrypted_first_name'))})")
+                        first_name = _decrypt(user['encrypted_first_name'])
                     if user.get('encrypted_last_name'):
-                        print(f"  encrypted_last_name exists (length: {len(user.get('encrypted_last_name'))})")
-                    
-                    # Try to decrypt if encrypted
-                    if user.get('encrypted_first_name') or user.get('encrypted_last_name'):
-                        try:
-                            import sys
-                            sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-                            from services.encryption_service import EncryptionService
-                            encryption_service = EncryptionService()
-                            
-                            if user.get('encrypted_first_name'):
-                                first_name = encryption_service.decrypt(user['encrypted_first_name'])
-                                print(f"  Decrypted first name: '{first_name}'")
-                            if user.get('encrypted_last_name'):
-                                last_name = encryption_service.decrypt(user['encrypted_last_name'])
-                                print(f"  Decrypted last name: '{last_name}'")
-                        except Exception as e:
-                            print(f"  Decryption error: {str(e)}")
-                            first_name = first_name or 'User'
-                            last_name = last_name or ''
-                    
-                    user_full_name = f"{first_name} {last_name}".strip() or "Unknown User"
-                    print(f"  Final name: '{user_full_name}', email: '{email}'")
-                    
-                    # Update the consent request
-                    result = consent_requests_collection.update_one(
-                        {'_id': req['_id']},
-                        {
-                            '$set': {
-                                'user_name': user_full_name,
-                                'user_email': email
-                            }
-                        }
-                    )
-                    
-                    if result.modified_count > 0:
-                        print(f"  ✓ Updated successfully")
-                        fixed_count += 1
-                    else:
-                        print(f"  ✗ No changes made (values might be the same)")
-                else:
-                    print(f"  ✗ User not found in database!")
-        
-        print(f"Fixed {fixed_count} consent requests")
+                        last_name = _decrypt(user['encrypted_last_name'])
+                except Exception as e:
+                    logger.warning("Decryption error for user %s: %s", user_id, e)
+                    first_name = first_name or 'User'
+                    last_name = last_name or ''
+            
+            user_full_name = f"{first_name} {last_name}".strip() or "Unknown User"
+            logger.debug("Final name: %r, email: %r", user_full_name, email)
+            
+            ops.append(UpdateOne(
+                {'_id': req['_id']},
+                {
+                    '$set': {
+                        'user_name': user_full_name,
+                        'user_email': email
+                    }
+                }
+            ))
+            fixed_user_ids.append(user_id)
+        
+        # Apply all fixes in one unordered round trip
+        fixed_count = 0
+        if ops:
+            fixed_count = consent_requests_collection.bulk_write(ops, ordered=False).modified_count
+            cache_delete(*{consent_requests_key(user_id) for user_id in fixed_user_ids})
+        
+        logger.debug("Fixed %d consent requests", fixed_count)
         
         return jsonify({
             'message': f'Fixed {fixed_count} consent requests',
@@ -786,9 +886,7 @@ def fix_consent_names():
         }), 200
         
     except Exception as e:
-        print(f"Error in fix_consent_names: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in fix_consent_names: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 
@@ -844,9 +942,7 @@ def test_populate_verification_data(user_id):
         }), 200
         
     except Exception as e:
-        print(f"Error populating test data: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error populating test data: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -854,18 +950,9 @@ def test_populate_verification_data(user_id):
 def get_kyc_details(request_id):
     """Get KYC details for a consent request (only if approved)"""
     try:
-        # Extract and verify token
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
-            return jsonify({'error': 'Unauthorized'}), 401
-        
-        token = auth_header.split(' ')[1]
-        
-        try:
-            decoded = jwt.decode(token, JWT_SECRET, algorithms=['HS256'])
-            org_id = decoded['org_id']
-        except:
-            return jsonify({'error': 'Invalid token'}), 401
+        org_id, auth_error = _require_org()
+        if auth_error:
+            return auth_error
         
         # Find consent request
         consent_req = consent_requests_collection.find_one({
@@ -899,8 +986,8 @@ def get_kyc_details(request_id):
                 sort=[('created_at', -1)]
             )
         
-        print(f"Found verification: {verification.get('_id') if verification else 'None'}")
-        print(f"Searched with user_id ObjectId: {user_id_obj} and string: {user_id_str}")
+        logger.debug("Found verification: %s (searched user_id %r and %r)",
+                     verification.get('_id') if verification else None, user_id_obj, user_id_str)
         
         # Get credential
         credential = credentials_collection.find_one({'credential_id': consent_req.get('credential_id')})
@@ -927,7 +1014,7 @@ def get_kyc_details(request_id):
                     'user_id': user_id_str
                 }).sort('uploaded_at', -1))
                 
-            print(f"Found {len(documents)} documents for verification/user")
+            logger.debug("Found %d documents for verification/user", len(documents))
         else:
             # No verification found, try user_id directly (both formats)
             documents = list(documents_collection.find({
@@ -939,19 +1026,18 @@ def get_kyc_details(request_id):
                     'user_id': user_id_str
                 }).sort('uploaded_at', -1))
             
-            print(f"Found {len(documents)} documents for user (no verification found)")
+            logger.debug("Found %d documents for user (no verification found)", len(documents))
         
         # Get face verification data for the most recent verification
         face_verification_collection = db['FaceVerification']
         face_verification = None
         
-        # Debug: Check what's in the collection
-        total_face_records = face_verification_collection.count_documents({})
-        print(f"Total FaceVerification records in DB: {total_face_records}")
-        if total_face_records > 0:
-            sample_face = face_verification_collection.find_one()
-            print(f"Sample FaceVerification record user_id type: {type(sample_face.get('user_id'))}")
-            print(f"Sample FaceVerification record user_id value: {sample_face.get('user_id')}")
+        # Debug: sample the collection's user_id format (full-collection probes: debug only)
+        if logger.isEnabledFor(logging.DEBUG):
+            sample_face = face_verification_collection.find_one({}, {'user_id': 1})
+            logger.debug("FaceVerification: %d records, sample user_id %r",
+                         face_verification_collection.estimated_document_count(),
+                         sample_face.get('user_id') if sample_face else None)
         
         if verification:
             # Try with verification_id as string
@@ -959,7 +1045,7 @@ def get_kyc_details(request_id):
                 {'verification_id': str(verification['_id'])},
                 sort=[('timestamp', -1)]
             )
-            print(f"Tried verification_id: {str(verification['_id'])}, found: {face_verification is not None}")
+            logger.debug("Tried verification_id %s, found: %s", verification['_id'], face_verification is not None)
         
         if not face_verification:
             # Try with user_id as ObjectId
@@ -967,7 +1053,7 @@ def get_kyc_details(request_id):
                 {'user_id': user_id_obj},
                 sort=[('timestamp', -1)]
             )
-            print(f"Tried user_id (ObjectId): {user_id_obj}, found: {face_verification is not None}")
+            logger.debug("Tried user_id (ObjectId) %s, found: %s", user_id_obj, face_verification is not None)
         
         if not face_verification:
             # Try with user_id as string
@@ -975,19 +1061,18 @@ def get_kyc_details(request_id):
                 {'user_id': user_id_str},
                 sort=[('timestamp', -1)]
             )
-            print(f"Tried user_id (string): {user_id_str}, found: {face_verification is not None}")
+            logger.debug("Tried user_id (string) %s, found: %s", user_id_str, face_verification is not None)
         
         # Get video verification data for the most recent verification
         video_verification_collection = db['VideoVerification']
         video_verification = None
         
-        # Debug: Check what's in the collection
-        total_video_records = video_verification_collection.count_documents({})
-        print(f"Total VideoVerification records in DB: {total_video_records}")
-        if total_video_records > 0:
-            sample_video = video_verification_collection.find_one()
-            print(f"Sample VideoVerification record user_id type: {type(sample_video.get('user_id'))}")
-            print(f"Sample VideoVerification record user_id value: {sample_video.get('user_id')}")
+        # Debug: sample the collection's user_id format (full-collection probes: debug only)
+        if logger.isEnabledFor(logging.DEBUG):
+            sample_video = video_verification_collection.find_one({}, {'user_id': 1})
+            logger.debug("VideoVerification: %d records, sample user_id %r",
+                         video_verification_collection.estimated_document_count(),
+                         sample_video.get('user_id') if sample_video else None)
         
         if verification:
             # Try with verification_id as string
@@ -995,7 +1080,7 @@ def get_kyc_details(request_id):
                 {'verification_id': str(verification['_id'])},
                 sort=[('timestamp', -1)]
             )
-            print(f"Tried verification_id: {str(verification['_id'])}, found: {video_verification is not None}")
+            logger.debug("Tried verification_id %s, found: %s", verification['_id'], video_verification is not None)
         
         if not video_verification:
             # Try with user_id as ObjectId
@@ -1003,7 +1088,7 @@ def get_kyc_details(request_id):
                 {'user_id': user_id_obj},
                 sort=[('timestamp', -1)]
             )
-            print(f"Tried user_id (ObjectId): {user_id_obj}, found: {video_verification is not None}")
+            logger.debug("Tried user_id (ObjectId) %s, found: %s", user_id_obj, video_verification is not None)
         
         if not video_verification:
             # Try with user_id as string
@@ -1011,23 +1096,17 @@ def get_kyc_details(request_id):
                 {'user_id': user_id_str},
                 sort=[('timestamp', -1)]
             )
-            print(f"Tried user_id (string): {user_id_str}, found: {video_verification is not None}")
+            logger.debug("Tried user_id (string) %s, found: %s", user_id_str, video_verification is not None)
         
-        print(f"FINAL - Face verification: {face_verification is not None}")
-        print(f"FINAL - Video verification: {video_verification is not None}")
+        logger.debug("Face verification found: %s, video verification found: %s",
+                     face_verification is not None, video_verification is not None)
         
         # Prepare response - decrypt sensitive data if needed
         try:
-            # Try to import and use encryption service
-            import sys
-            sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            from services.encryption_service import EncryptionService
-            encryption_service = EncryptionService()
-            
-            first_name = encryption_service.decrypt(user['encrypted_first_name']) if user.get('encrypted_first_name') else user.get('first_name', '')
-            last_name = encryption_service.decrypt(user['encrypted_last_name']) if user.get('encrypted_last_name') else user.get('last_name', '')
-        except:
-            # Fallback to plain text if encryption service not available
+            first_name = _decrypt(user['encrypted_first_name']) if user.get('encrypted_first_name') else user.get('first_name', '')
+            last_name = _decrypt(user['encrypted_last_name']) if user.get('encrypted_last_name') else user.get('last_name', '')
+        except Exception:
+            # Fallback to plain text if the names cannot be decrypted
             first_name = user.get('first_name', '')
             last_name = user.get('last_name', '')
         
@@ -1055,10 +1134,9 @@ def get_kyc_details(request_id):
         # Prepare verification details with all scores
         verification_data = {}
         if verification:
-            print(f"Building verification data from verification record:")
-            print(f"  - Status: {verification.get('status')}")
-            print(f"  - Steps completed: {len(verification.get('steps_completed', []))}/10")
-            print(f"  - Identity integrity score: {verification.get('identity_integrity_score', 0)}")
+            logger.debug("Building verification data: status=%s steps=%d/10 integrity=%s",
+                         verification.get('status'), len(verification.get('steps_completed', [])),
+                         verification.get('identity_integrity_score', 0))
             
             verification_data = {
                 'verification_id': str(verification.get('_id', '')),
@@ -1073,7 +1151,7 @@ def get_kyc_details(request_id):
                 'steps_completed': verification.get('steps_completed', [])
             }
         elif credential:
-            print(f"No active verification found, using credential data")
+            logger.debug("No active verification found, using credential data")
             # Fallback to credential data
             verification_summary = credential.get('verification_summary', {})
             verification_data = {
@@ -1083,7 +1161,7 @@ def get_kyc_details(request_id):
                 'completion_percentage': 100
             }
         else:
-            print(f"WARNING: No verification or credential data found!")
+            logger.warning("No verification or credential data found for consent request %s", request_id)
             verification_data = {
                 'verification_id': 'N/A',
                 'status': 'not_started',
@@ -1107,7 +1185,10 @@ def get_kyc_details(request_id):
         video_data = {}
         if video_verification:
             video_data = {
-                'video_data': video_verification.get('video_data', ''),
+                # Newer records keep the video in GridFS; older ones embed base64
+                'video_data': (video_data_uri(db, video_verification['video_file_id'])
+                               if video_verification.get('video_file_id')
+                               else video_verification.get('video_data', '')),
                 'lipsync_score': video_verification.get('lipsync_score', 0),
                 'deepfake_score': video_verification.get('deepfake_score', 0),
                 'quality_score': video_verification.get('quality_score', 0),
@@ -1131,7 +1212,5 @@ def get_kyc_details(request_id):
         return jsonify(response_data), 200
         
     except Exception as e:
-        print(f"Error in get_kyc_details: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in get_kyc_details: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
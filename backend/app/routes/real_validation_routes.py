@@ -9,19 +9,31 @@ import os
 from datetime import datetime, timedelta
 import secrets
 import hashlib
+from functools import lru_cache
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.real_ocr_validator import RealOCRValidator
-from utils.real_face_analyzer import RealFaceAnalyzer, RealLivenessDetector
-
 real_validation_bp = Blueprint('real_validation', __name__, url_prefix='/api/validation')
 
-# Initialize validators
-ocr_validator = RealOCRValidator()
-face_analyzer = RealFaceAnalyzer()
-liveness_detector = RealLivenessDetector()
+
+# Validators pull in OpenCV/MediaPipe, so they are built on first use rather than at import
+@lru_cache(maxsize=None)
+def get_ocr_validator():
+    from utils.real_ocr_validator import RealOCRValidator
+    return RealOCRValidator()
+
+
+@lru_cache(maxsize=None)
+def get_face_analyzer():
+    from utils.real_face_analyzer import RealFaceAnalyzer
+    return RealFaceAnalyzer()
+
+
+@lru_cache(maxsize=None)
+def get_liveness_detector():
+    from utils.real_face_analyzer import RealLivenessDetector
+    return RealLivenessDetector()
 
 
 def get_db_connection():
@@ -190,7 +202,7 @@ def validate_document():
             }), 400
         
         # Validate document using real OCR
-        result = ocr_validator.validate_document(document_image, document_type)
+        result = get_ocr_validator().validate_document(document_image, document_type)
         
         # Update verification status if validation successful
         if result.get('success') and verification_id:
@@ -220,7 +232,7 @@ def extract_pan():
         if not document_image:
             return jsonify({"success": False, "message": "document_image required"}), 400
         
-        result = ocr_validator.extract_pan_details(document_image)
+        result = get_ocr_validator().extract_pan_details(document_image)
         return jsonify(result), 200
         
     except Exception as e:
@@ -237,7 +249,7 @@ def extract_aadhaar():
         if not document_image:
             return jsonify({"success": False, "message": "document_image required"}), 400
         
-        result = ocr_validator.extract_aadhaar_details(document_image)
+        result = get_ocr_validator().extract_aadhaar_details(document_image)
         return jsonify(result), 200
         
     except Exception as e:
@@ -254,7 +266,7 @@ def extract_passport():
         if not document_image:
             return jsonify({"success": False, "message": "document_image required"}), 400
         
-        result = ocr_validator.extract_passport_details(document_image)
+        result = get_ocr_validator().extract_passport_details(document_image)
         return jsonify(result), 200
         
     except Exception as e:
@@ -271,7 +283,7 @@ def extract_dl():
         if not document_image:
             return jsonify({"success": False, "message": "document_image required"}), 400
         
-        result = ocr_validator.extract_driving_license_details(document_image)
+        result = get_ocr_validator().extract_driving_license_details(document_image)
         return jsonify(result), 200
         
     except Exception as e:
@@ -299,7 +311,7 @@ def verify_selfie():
             }), 400
         
         # Analyze selfie with real face detection
-        result = face_analyzer.analyze_selfie(selfie_image, document_photo)
+        result = get_face_analyzer().analyze_selfie(selfie_image, document_photo)
         
         # Update verification status if successful
         if result.get('success') and verification_id:
@@ -340,7 +352,7 @@ def verify_liveness():
             }), 400
         
         # Analyze video with real eye tracking
-        result = liveness_detector.analyze_video_frames(video_frames, expected_gestures)
+        result = get_liveness_detector().analyze_video_frames(video_frames, expected_gestures)
         
         # Update verification status if successful
         if result.get('success') and verification_id:
@@ -381,7 +393,7 @@ def cross_verify_name():
         comparisons = []
         for i in range(len(names)):
             for j in range(i+1, len(names)):
-                comparison = ocr_validator.cross_verify_name(names[i], names[j])
+                comparison = get_ocr_validator().cross_verify_name(names[i], names[j])
                 comparisons.append(comparison)
         
         # Determine if all match
@@ -422,11 +434,11 @@ def cross_verify_dob():
             }), 400
         
         # Verify DOB consistency
-        result = ocr_validator.cross_verify_dob(dobs)
+        result = get_ocr_validator().cross_verify_dob(dobs)
         
         # Add age calculation if DOB verified
         if result.get('consistent') and result.get('verified_dob'):
-            age_info = ocr_validator.validate_date_of_birth(result['verified_dob'])
+            age_info = get_ocr_validator().validate_date_of_birth(result['verified_dob'])
             result['age'] = age_info.get('age')
             result['is_adult'] = age_info.get('is_adult')
         
@@ -452,8 +464,8 @@ def detect_blur():
         if not image_base64:
             return jsonify({"success": False, "message": "image required"}), 400
         
-        image = ocr_validator.base64_to_cv2(image_base64)
-        result = ocr_validator.detect_blur(image)
+        image = get_ocr_validator().base64_to_cv2(image_base64)
+        result = get_ocr_validator().detect_blur(image)
         
         return jsonify({
             "success": True,
@@ -7,6 +7,9 @@ Handles user registration with enterprise-grade security
 - Audit trail logging
 """
 import os
+import hashlib
+import hmac
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pymongo import MongoClient
 from bson.objectid import ObjectId
@@ -16,8 +19,9 @@ import sys
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.encryption import EncryptionService
+from utils.encryption import EncryptionService, MASTER_KEY
 from utils.validators import Validators
+from utils.redis_cache import cache_get, cache_setex
 
 # Load .env from project root
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -28,6 +32,38 @@ MONGO_URI = os.getenv("MONGO_URL") or os.getenv("MONGODB_URI")
 client = MongoClient(MONGO_URI)
 db = client["aegis_kyc"]
 
+# Seconds a successful password verification is remembered, so repeat logins skip PBKDF2
+PASSWORD_CACHE_TTL = 300
+
+# PBKDF2 runs on a thread pool: the OpenSSL derivation releases the GIL, so concurrent
+# signups/logins use every core without forking helper processes out of the
+# (threaded, preloaded) gunicorn workers
+KDF_WORKERS = int(os.getenv('KDF_WORKERS', os.cpu_count() or 1))
+_KDF_POOL = ThreadPoolExecutor(max_workers=KDF_WORKERS, thread_name_prefix="kdf")
+
+
+def _run_kdf(fn, *args):
+    """Run a password hashing function on the KDF pool and wait for its result"""
+    return _KDF_POOL.submit(fn, *args).result()
+
+
+def _verify_password_cached(password: str, stored_hash: str, stored_salt: str) -> bool:
+    """
+    PBKDF2 verification with a short-lived Redis record of recent successes.
+    The key is an HMAC (server master key) over the stored hash, salt and candidate
+    password: Redis never holds credentials, and a password change invalidates it.
+    Failures are never cached, so lockout counting is unchanged.
+    """
+    key = "pwok:" + hmac.new(
+        MASTER_KEY, f"{stored_salt}:{stored_hash}:{password}".encode(), hashlib.sha256
+    ).hexdigest()
+    if cache_get(key) is not None:
+        return True
+    valid = _run_kdf(EncryptionService.verify_password, password, stored_hash, stored_salt)
+    if valid:
+        cache_setex(key, PASSWORD_CACHE_TTL, "1")
+    return valid
+
 
 class AuthService:
     """
@@ -95,7 +131,7 @@ class AuthService:
                 }
             
             # Step 4: Hash password using PBKDF2
-            password_data = EncryptionService.hash_password(signup_data["password"])
+            password_data = _run_kdf(EncryptionService.hash_password, signup_data["password"])
             
             # Step 5: Prepare user document structure
             now = datetime.utcnow()
@@ -296,7 +332,7 @@ class AuthService:
                 }
             
             # Verify password
-            password_valid = EncryptionService.verify_password(
+            password_valid = _verify_password_cached(
                 password,
                 user["account_credentials"]["password_hash"],
                 user["account_credentials"]["salt"]
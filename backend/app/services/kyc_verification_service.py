@@ -17,6 +17,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.encryption import EncryptionService
 from utils.document_validator import DocumentValidator
+from utils.image_codec import decode_b64_image
 from config.document_requirements import DOCUMENT_CATEGORIES, MICRO_GESTURE_PROMPTS
 
 # Load .env from project root
@@ -53,6 +54,22 @@ try:
 except Exception:
     face_matcher = None
 
+# Primary category for each document type (built once, not per lookup)
+DOCUMENT_TYPE_CATEGORY = {
+    "aadhaar": "identity_proof",
+    "pan_card": "identity_proof",
+    "passport": "identity_proof",
+    "driving_license": "identity_proof",
+    "voter_id": "identity_proof",
+    "utility_bill_electricity": "address_proof",
+    "utility_bill_water": "address_proof",
+    "bank_statement": "address_proof",
+    "salary_slip": "income_employment",
+    "form_16": "income_employment",
+    "ssc_marksheet": "educational",
+    "graduation_degree": "educational"
+}
+
 
 class KYCVerificationService:
     """
@@ -593,21 +610,7 @@ class KYCVerificationService:
     @staticmethod
     def _get_document_category(doc_type: str) -> str:
         """Map document type to category"""
-        category_mapping = {
-            "aadhaar": "identity_proof",
-            "pan_card": "identity_proof",
-            "passport": "identity_proof",
-            "driving_license": "identity_proof",
-            "voter_id": "identity_proof",
-            "utility_bill_electricity": "address_proof",
-            "utility_bill_water": "address_proof",
-            "bank_statement": "address_proof",
-            "salary_slip": "income_employment",
-            "form_16": "income_employment",
-            "ssc_marksheet": "educational",
-            "graduation_degree": "educational"
-        }
-        return category_mapping.get(doc_type, "supporting")
+        return DOCUMENT_TYPE_CATEGORY.get(doc_type, "supporting")
     
     @staticmethod
     def validate_category_requirements(verification_id: str) -> dict:
@@ -926,20 +929,9 @@ class KYCVerificationService:
     def _b64_to_cv2(b64str: str):
         """Convert a base64 image (data URI or plain) to OpenCV BGR image. Returns None on failure."""
         try:
-            import base64
-            import cv2
-            import numpy as np
             if not b64str:
                 return None
-            # strip data uri
-            if ',' in b64str:
-                b64data = b64str.split(',')[-1]
-            else:
-                b64data = b64str
-            decoded = base64.b64decode(b64data)
-            arr = np.frombuffer(decoded, np.uint8)
-            img = cv2.imdecode(arr, cv2.IMREAD_COLOR)
-            return img
+            return decode_b64_image(b64str)
         except Exception:
             return None
     
@@ -0,0 +1,31 @@
+"""
+Per-process background threads
+Gunicorn preloads the app (preload_app = True) and then forks its workers, and a
+thread started at import only exists in the master. Threads that serve the
+workers are therefore started lazily, on first use, once in every process.
+"""
+import os
+import threading
+
+# thread name -> pid of the process that started it
+_started = {}
+_lock = threading.Lock()
+
+
+def _reset_after_fork():
+    global _lock
+    _lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def ensure_thread(name, target):
+    """Start a daemon thread running target() unless this process already has one"""
+    pid = os.getpid()
+    if _started.get(name) == pid:
+        return
+    with _lock:
+        if _started.get(name) != pid:
+            threading.Thread(target=target, name=name, daemon=True).start()
+            _started[name] = pid
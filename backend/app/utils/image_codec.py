@@ -0,0 +1,22 @@
+"""
+Base64 image decoding shared by the API routes and analyzers
+binascii.a2b_base64 decodes in C without base64.b64decode's wrapper overhead, and
+str.partition strips a data URI header without building a list of the pieces.
+"""
+import binascii
+
+import cv2
+import numpy as np
+
+
+def decode_b64_image(b64str):
+    """
+    Decode a base64 image (data URI or bare base64) to an OpenCV BGR array.
+    Returns None when the payload is empty or not an image; raises binascii.Error
+    on malformed base64.
+    """
+    head, sep, tail = b64str.partition(',')
+    raw = binascii.a2b_base64(tail if sep else b64str)
+    if not raw:
+        return None
+    return cv2.imdecode(np.frombuffer(raw, np.uint8), cv2.IMREAD_COLOR)
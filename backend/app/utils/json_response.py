@@ -0,0 +1,68 @@
+"""
+Fast JSON responses for large API payloads
+Uses orjson when installed (native datetime/numpy support, several times faster
+than the stdlib encoder); falls back to Flask's JSON provider otherwise
+"""
+from flask import Response, current_app
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    _ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+except Exception:
+    ORJSON_AVAILABLE = False
+
+
+def json_dumps(obj):
+    """
+    Serialize obj to JSON. ObjectIds and other unknown types are converted
+    with str(), so documents can be returned without stringifying _id
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=str, option=_ORJSON_OPTIONS)
+    provider = current_app.json
+
+    def default(o):
+        try:
+            return provider.default(o)
+        except TypeError:
+            return str(o)
+
+    return provider.dumps(obj, default=default)
+
+
+def json_response(obj, status=200):
+    """Serialize obj (see json_dumps) to a JSON Response"""
+    return Response(json_dumps(obj), status=status, mimetype='application/json')
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson, so jsonify() and request.get_json() parse
+    and serialize in C (large base64 image/video payloads included). Types orjson
+    does not know go through Flask's default hook. Install with app.json = ORJSONProvider(app)
+    """
+    # Key order is not part of the API; sorting every response costs time
+    sort_keys = False
+
+    def _options(self, indent=False):
+        option = _ORJSON_OPTIONS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return option
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=kwargs.get('default', self.default),
+                            option=self._options(kwargs.get('indent'))).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=self.default, option=self._options(indent))
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
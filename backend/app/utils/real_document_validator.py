@@ -5,12 +5,14 @@ Uses PaddleOCR, OpenCV, and Computer Vision for actual validation
 import cv2
 import numpy as np
 from PIL import Image
-import base64
 import io
 import re
 from datetime import datetime
 import easyocr
 
+from config.document_requirements import THRESHOLDS
+from utils.image_codec import decode_b64_image
+
 class RealDocumentValidator:
     """Production-grade document validation with real AI models"""
     
@@ -21,14 +23,7 @@ class RealDocumentValidator:
     @staticmethod
     def base64_to_cv2(base64_string):
         """Convert base64 to OpenCV image"""
-        # Remove data URL prefix if present
-        if ',' in base64_string:
-            base64_string = base64_string.split(',')[1]
-        
-        img_data = base64.b64decode(base64_string)
-        nparr = np.frombuffer(img_data, np.uint8)
-        img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        return img
+        return decode_b64_image(base64_string)
     
     @staticmethod
     def detect_blur(image):
@@ -36,12 +31,12 @@ class RealDocumentValidator:
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
         laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
         
-        # Threshold: < 100 is blurry
-        is_clear = laplacian_var > 100
+        # Threshold: below blur_min is blurry
+        is_clear = laplacian_var > THRESHOLDS.blur_min
         
         return {
             "laplacian_variance": float(laplacian_var),
-            "quality": "high" if laplacian_var > 200 else "medium" if laplacian_var > 100 else "low",
+            "quality": "high" if laplacian_var > 200 else "medium" if laplacian_var > THRESHOLDS.blur_min else "low",
             "passed": is_clear,
             "score": min(100, int((laplacian_var / 300) * 100))
         }
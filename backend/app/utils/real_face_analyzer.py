@@ -6,7 +6,8 @@ Note: If MediaPipe not available (Python 3.13+), uses fallback with OpenCV
 import cv2
 import numpy as np
 from datetime import datetime
-import base64
+
+from utils.image_codec import decode_b64_image
 
 # Try to import MediaPipe (may not work on Python 3.13+)
 try:
@@ -45,13 +46,7 @@ class RealFaceAnalyzer:
     @staticmethod
     def base64_to_cv2(base64_string):
         """Convert base64 to OpenCV image"""
-        if ',' in base64_string:
-            base64_string = base64_string.split(',')[1]
-        
-        img_data = base64.b64decode(base64_string)
-        nparr = np.frombuffer(img_data, np.uint8)
-        img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        return img
+        return decode_b64_image(base64_string)
     
     def detect_face(self, image):
         """Detect face in image using MediaPipe or OpenCV fallback"""
@@ -263,13 +258,7 @@ class RealLivenessDetector:
     @staticmethod
     def base64_to_cv2(base64_string):
         """Convert base64 to OpenCV image"""
-        if ',' in base64_string:
-            base64_string = base64_string.split(',')[1]
-        
-        img_data = base64.b64decode(base64_string)
-        nparr = np.frombuffer(img_data, np.uint8)
-        img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        return img
+        return decode_b64_image(base64_string)
     
     def detect_eye_blink(self, landmarks):
         """Detect eye blink using Eye Aspect Ratio (EAR)"""
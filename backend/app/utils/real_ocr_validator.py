@@ -7,10 +7,12 @@ import numpy as np
 import re
 from datetime import datetime
 from PIL import Image
-import base64
 import io
 from difflib import SequenceMatcher
 
+from config.document_requirements import THRESHOLDS
+from utils.image_codec import decode_b64_image
+
 # Optional: PaddleOCR (uncomment if installed)
 # from paddleocr import PaddleOCR
 
@@ -32,13 +34,7 @@ class RealOCRValidator:
     @staticmethod
     def base64_to_cv2(base64_string):
         """Convert base64 to OpenCV image"""
-        if ',' in base64_string:
-            base64_string = base64_string.split(',')[1]
-        
-        img_data = base64.b64decode(base64_string)
-        nparr = np.frombuffer(img_data, np.uint8)
-        img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        return img
+        return decode_b64_image(base64_string)
     
     def preprocess_for_ocr(self, image):
         """Preprocess image for better OCR accuracy"""
@@ -364,7 +360,7 @@ class RealOCRValidator:
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
         laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
         
-        is_blurry = bool(laplacian_var < 100)
+        is_blurry = bool(laplacian_var < THRESHOLDS.blur_min)
         quality_score = int(min(100, int((laplacian_var / 300) * 100)))
         
         return {
@@ -0,0 +1,157 @@
+"""
+Optional Redis cache shared by the API routes
+Enabled when the redis package is installed and REDIS_URL is set. Otherwise
+(or when Redis is unreachable) the helpers are no-ops that return None, and
+callers fall through to MongoDB.
+"""
+import logging
+import os
+import threading
+import time
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except Exception:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Seconds a user's consent request list may be served from cache
+CONSENT_REQUESTS_TTL = 30
+# Lifetime of a login session token
+SESSION_TTL = 3600
+# Seconds between keep-alives on an idle event stream
+EVENTS_KEEPALIVE = 15
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_redis():
+    """Return the process-wide Redis client, or None when caching is disabled"""
+    global _client
+    if _client is None and REDIS_AVAILABLE and os.getenv("REDIS_URL"):
+        with _client_lock:
+            if _client is None:
+                _client = redis.Redis.from_url(
+                    os.getenv("REDIS_URL"),
+                    decode_responses=True,
+                    socket_timeout=0.5,
+                    socket_connect_timeout=0.5
+                )
+    return _client
+
+
+def sessions_enabled():
+    """Login sessions live in Redis, so they exist only when Redis is configured"""
+    return get_redis() is not None
+
+
+def cache_get(key):
+    r = get_redis()
+    if r is None:
+        return None
+    try:
+        return r.get(key)
+    except redis.RedisError as e:
+        logger.warning("Redis GET %s failed: %s", key, e)
+        return None
+
+
+def cache_setex(key, ttl, value):
+    """Store value with a TTL; returns True if it was written"""
+    r = get_redis()
+    if r is None:
+        return False
+    try:
+        r.setex(key, ttl, value)
+        return True
+    except redis.RedisError as e:
+        logger.warning("Redis SETEX %s failed: %s", key, e)
+        return False
+
+
+def cache_delete(*keys):
+    r = get_redis()
+    if r is None or not keys:
+        return
+    try:
+        r.delete(*keys)
+    except redis.RedisError as e:
+        logger.warning("Redis DEL %s failed: %s", keys, e)
+
+
+def allow_request(bucket, limit, window):
+    """
+    Fixed-window rate limit: at most `limit` calls per `window` seconds for bucket
+    (atomic INCR + EXPIRE). Fails open when Redis is disabled or unreachable.
+    """
+    r = get_redis()
+    if r is None:
+        return True
+    key = f"rl:{bucket}:{int(time.time() // window)}"
+    try:
+        pipe = r.pipeline()
+        pipe.incr(key)
+        pipe.expire(key, window)
+        count, _ = pipe.execute()
+        return count <= limit
+    except redis.RedisError as e:
+        logger.warning("Redis rate limit %s failed: %s", key, e)
+        return True
+
+
+def publish(channel, message):
+    """Publish message on channel; returns the number of subscribers reached"""
+    r = get_redis()
+    if r is None:
+        return 0
+    try:
+        return r.publish(channel, message)
+    except redis.RedisError as e:
+        logger.warning("Redis PUBLISH %s failed: %s", channel, e)
+        return 0
+
+
+def subscribe(channel):
+    """PubSub subscribed to channel, or None when Redis is disabled or unreachable"""
+    r = get_redis()
+    if r is None:
+        return None
+    try:
+        pubsub = r.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(channel)
+        return pubsub
+    except redis.RedisError as e:
+        logger.warning("Redis SUBSCRIBE %s failed: %s", channel, e)
+        return None
+
+
+def iter_messages(pubsub, timeout=EVENTS_KEEPALIVE):
+    """
+    Yield message payloads from pubsub, or None after `timeout` idle seconds so the
+    caller can send a keep-alive. Stops (and closes pubsub) on a Redis error.
+    """
+    try:
+        while True:
+            message = pubsub.get_message(timeout=timeout)
+            yield message['data'] if message else None
+    except redis.RedisError as e:
+        logger.warning("Redis pub/sub read failed: %s", e)
+    finally:
+        pubsub.close()
+
+
+def consent_requests_key(user_id):
+    """Cache key for a user's consent request list (ObjectId or string id)"""
+    return f"consent_reqs:{user_id}"
+
+
+def consent_events_channel(user_id):
+    """Pub/sub channel announcing changes to a user's consent requests"""
+    return f"consent:{user_id}"
+
+
+def session_key(token):
+    return f"session:{token}"
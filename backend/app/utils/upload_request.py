@@ -0,0 +1,23 @@
+"""
+Request class for large multipart uploads
+Werkzeug spools file parts above 500KB to an anonymous temp file. Here parts go to
+a *named* temp file once the request body exceeds UPLOAD_SPOOL_SIZE, so handlers
+can open an upload by path (cv2.VideoCapture) instead of copying it out again.
+The file is deleted when Flask closes the request.
+"""
+import os
+import tempfile
+from io import BytesIO
+
+from flask import Request
+
+# Request bodies up to this size keep their file parts in memory
+UPLOAD_SPOOL_SIZE = 1 << 20
+
+
+class UploadRequest(Request):
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if total_content_length is not None and total_content_length <= UPLOAD_SPOOL_SIZE:
+            return BytesIO()
+        suffix = os.path.splitext(filename or '')[1]
+        return tempfile.NamedTemporaryFile(mode='rb+', prefix='upload-', suffix=suffix)
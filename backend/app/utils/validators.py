@@ -5,23 +5,32 @@ Ensures data integrity and prevents injection attacks
 import re
 from datetime import datetime
 
+# Compiled once at import; signup validation runs on every request
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_PHONE_STRIP_RE = re.compile(r'[\s-]')
+_PHONE_RE = re.compile(r'^\+?[1-9]\d{9,14}$')
+_UPPER_RE = re.compile(r'[A-Z]')
+_LOWER_RE = re.compile(r'[a-z]')
+_DIGIT_RE = re.compile(r'\d')
+_SPECIAL_RE = re.compile(r'[!@#$%^&*(),.?":{}|<>]')
+_PINCODE_RE = re.compile(r'^[A-Za-z0-9\s-]{4,10}$')
+_UNSAFE_CHARS_RE = re.compile(r'[<>{}\\$]')
+
 
 class Validators:
     
     @staticmethod
     def validate_email(email: str) -> bool:
         """Validate email format"""
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, email))
+        return bool(_EMAIL_RE.match(email))
     
     @staticmethod
     def validate_phone(phone: str) -> bool:
         """Validate phone number (international format)"""
         # Remove spaces and dashes
-        phone = re.sub(r'[\s-]', '', phone)
+        phone = _PHONE_STRIP_RE.sub('', phone)
         # Accept + followed by 10-15 digits
-        pattern = r'^\+?[1-9]\d{9,14}$'
-        return bool(re.match(pattern, phone))
+        return bool(_PHONE_RE.match(phone))
     
     @staticmethod
     def validate_dob(dob_str: str) -> bool:
@@ -58,13 +67,13 @@ class Validators:
         
         if len(password) < 8:
             errors.append("Password must be at least 8 characters long")
-        if not re.search(r'[A-Z]', password):
+        if not _UPPER_RE.search(password):
             errors.append("Password must contain at least one uppercase letter")
-        if not re.search(r'[a-z]', password):
+        if not _LOWER_RE.search(password):
             errors.append("Password must contain at least one lowercase letter")
-        if not re.search(r'\d', password):
+        if not _DIGIT_RE.search(password):
             errors.append("Password must contain at least one digit")
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+        if not _SPECIAL_RE.search(password):
             errors.append("Password must contain at least one special character")
         
         return {
@@ -75,8 +84,7 @@ class Validators:
     @staticmethod
     def validate_pincode(pincode: str) -> bool:
         """Validate pincode/ZIP code (4-10 alphanumeric)"""
-        pattern = r'^[A-Za-z0-9\s-]{4,10}$'
-        return bool(re.match(pattern, pincode))
+        return bool(_PINCODE_RE.match(pincode))
     
     @staticmethod
     def sanitize_string(text: str, max_length: int = 255) -> str:
@@ -84,7 +92,7 @@ class Validators:
         if not text:
             return ""
         # Remove potential SQL/NoSQL injection patterns
-        text = re.sub(r'[<>{}\\$]', '', text)
+        text = _UNSAFE_CHARS_RE.sub('', text)
         return text[:max_length].strip()
     
     @staticmethod
@@ -0,0 +1,48 @@
+"""
+Liveness video storage in GridFS
+Uploads are streamed into GridFS chunks, so VideoVerification records only keep a
+file id (and stay far below MongoDB's 16MB document limit).
+"""
+import base64
+import binascii
+
+import gridfs
+from bson import ObjectId
+from bson.errors import InvalidId
+
+VIDEO_BUCKET = 'VideoFiles'
+
+
+def _fs(db):
+    return gridfs.GridFS(db, collection=VIDEO_BUCKET)
+
+
+def put_video(db, fileobj, content_type, filename=None):
+    """Store a video (any file-like object, read in chunks) and return its GridFS id"""
+    return _fs(db).put(fileobj, content_type=content_type, filename=filename)
+
+
+def put_data_uri(db, data_uri):
+    """
+    Store a base64 payload (data URI or bare base64) from a legacy JSON upload.
+    Returns (file_id, content_type), or (None, None) when it is not valid base64.
+    """
+    head, sep, tail = data_uri.partition(',')
+    content_type = 'application/octet-stream'
+    if sep and head.startswith('data:'):
+        content_type = head[5:].split(';', 1)[0] or content_type
+    try:
+        raw = binascii.a2b_base64(tail if sep else data_uri)
+    except (binascii.Error, ValueError):
+        return None, None
+    return _fs(db).put(raw, content_type=content_type), content_type
+
+
+def video_data_uri(db, file_id):
+    """The stored video as a data URI (what the org dashboard renders), or '' if missing"""
+    try:
+        grid_out = _fs(db).get(ObjectId(file_id))
+    except (gridfs.errors.NoFile, InvalidId, TypeError):
+        return ''
+    content_type = grid_out.content_type or 'application/octet-stream'
+    return f"data:{content_type};base64,{base64.b64encode(grid_out.read()).decode()}"
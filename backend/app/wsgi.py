@@ -0,0 +1,11 @@
+"""
+WSGI entry point for production servers
+gunicorn -c gunicorn_config.py app.wsgi:app   (run from backend/)
+"""
+import os
+import sys
+
+# Ensure app directory is in path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from main import app
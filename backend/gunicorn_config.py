@@ -1,6 +1,7 @@
 """
 Production WSGI Configuration with TLS 1.3
-Gunicorn + Gevent for high-performance async handling
+Gunicorn + gthread workers: OpenCV releases the GIL inside its C++ calls, so
+threads overlap CV work on multiple cores (gevent would block its hub instead)
 """
 import multiprocessing
 import os
@@ -10,8 +11,9 @@ bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
 backlog = 2048
 
 # Worker processes
-workers = multiprocessing.cpu_count() * 2 + 1
-worker_class = 'gevent'
+workers = int(os.getenv('WORKERS', multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
 worker_connections = 1000
 max_requests = 1000
 max_requests_jitter = 50
@@ -29,6 +29,9 @@ export PORT=8443
 export WORKERS=4
 export SSL_KEY_FILE=/etc/ssl/private/aegiskyc.key
 export SSL_CERT_FILE=/etc/ssl/certs/aegiskyc.crt
+# Gunicorn terminates TLS itself (no reverse proxy), so forwarded headers are not trusted.
+# Behind a proxy, set PROXY_HOPS to the number of proxies in front of the app.
+export PROXY_HOPS=0
 
 # Start production server with Gunicorn
 echo "🌐 Starting Gunicorn with TLS 1.3..."
@@ -39,9 +42,10 @@ gunicorn \
     --keyfile=/etc/ssl/private/aegiskyc.key \
     --ssl-version=5 \
     --workers=4 \
-    --worker-class=gevent \
+    --worker-class=gthread \
+    --threads=8 \
     --access-logfile=- \
     --error-logfile=- \
-    app:app
+    app.wsgi:app
 
 echo "✅ AegisKYC Production Server running on https://0.0.0.0:8443"
@@ -0,0 +1,65 @@
+"""
+Consent response body test
+Checks the body shapes /api/auth/user/consent-response accepts: a bare JSON array
+goes through the bulk path, and other non-object bodies get a 400 (MongoDB is stubbed)
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend', 'app'))
+
+from types import SimpleNamespace
+from unittest import mock
+
+from flask import Flask
+from routes import auth_routes
+
+
+def _client(collection):
+    app = Flask(__name__)
+    app.register_blueprint(auth_routes.auth_bp)
+    patches = [
+        mock.patch.object(auth_routes, 'mongo_db', {'ConsentRequests': collection}),
+        mock.patch.object(auth_routes, 'sessions_enabled', lambda: False),
+    ]
+    for p in patches:
+        p.start()
+    return app.test_client(), patches
+
+
+def test_bare_array_uses_bulk_path():
+    collection = mock.MagicMock()
+    collection.bulk_write.return_value = SimpleNamespace(matched_count=2, modified_count=2)
+    collection.find.return_value = []
+    client, patches = _client(collection)
+    try:
+        response = client.post('/api/auth/user/consent-response', json=[
+            {"request_id": "CONSENT-1", "status": "approved"},
+            {"request_id": "CONSENT-2", "status": "rejected"},
+        ])
+    finally:
+        for p in patches:
+            p.stop()
+    assert response.status_code == 200
+    assert response.get_json() == {"success": True, "matched": 2, "modified": 2}
+    ops = collection.bulk_write.call_args[0][0]
+    assert len(ops) == 2
+
+
+def test_non_object_body_is_rejected():
+    collection = mock.MagicMock()
+    client, patches = _client(collection)
+    try:
+        for body in ("approved", 42, None):
+            response = client.post('/api/auth/user/consent-response', json=body)
+            assert response.status_code == 400
+        assert client.post('/api/auth/user/consent-response', json=[]).status_code == 400
+    finally:
+        for p in patches:
+            p.stop()
+    collection.bulk_write.assert_not_called()
+
+
+if __name__ == "__main__":
+    test_bare_array_uses_bulk_path()
+    test_non_object_body_is_rejected()
+    print("✓ Consent response accepts bare arrays and rejects other non-object bodies")
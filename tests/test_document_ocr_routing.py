@@ -0,0 +1,68 @@
+"""
+Document OCR routing test
+Checks that /api/kyc/extract-document-text sends each document type id to the
+matching RealOCRValidator extractor (no MongoDB or OCR models needed)
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend', 'app'))
+
+from flask import Flask
+from routes import kyc_routes
+
+
+class FakeOCR:
+    """Records which extractor the route called"""
+
+    def __init__(self):
+        self.called = None
+
+    def _extract(self, name):
+        def extract(image_b64):
+            self.called = name
+            return {"success": True}
+        return extract
+
+    def __getattr__(self, name):
+        if name.startswith('extract_') and name.endswith('_details'):
+            return self._extract(name)
+        raise AttributeError(name)
+
+    def base64_to_cv2(self, image_b64):
+        self.called = 'generic'
+        return None
+
+    def extract_text_regions(self, img):
+        return []
+
+
+def _extractor_for(document_type):
+    ocr = FakeOCR()
+    original = kyc_routes._get_model
+    kyc_routes._get_model = lambda name, factory: ocr
+    try:
+        app = Flask(__name__)
+        app.register_blueprint(kyc_routes.kyc_bp)
+        response = app.test_client().post('/api/kyc/extract-document-text', json={
+            "image_base64": "data:image/jpeg;base64,AAAA",
+            "document_type": document_type
+        })
+        assert response.status_code == 200
+    finally:
+        kyc_routes._get_model = original
+    return ocr.called
+
+
+def test_document_type_routing():
+    assert _extractor_for('pan') == 'extract_pan_details'
+    assert _extractor_for('pan_card') == 'extract_pan_details'
+    assert _extractor_for('aadhaar') == 'extract_aadhaar_details'
+    assert _extractor_for('aadhar') == 'extract_aadhaar_details'
+    assert _extractor_for('passport') == 'extract_passport_details'
+    assert _extractor_for('driving_license') == 'generic'
+    assert _extractor_for('auto') == 'generic'
+
+
+if __name__ == "__main__":
+    test_document_type_routing()
+    print("✓ Document types reach the matching OCR extractor")